@@ -1,5 +1,8 @@
+import importlib
+import os
 import streamlit as st
-from pages import home, analysis, company, news, donate
+from utils.instrumentation import span, DIAGNOSTICS_ENABLED
+from utils.warmup import start_cache_warmup
 
 # Set page configuration
 st.set_page_config(
@@ -9,54 +12,80 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Prefetch popular tickers in the background on the first run of this process
+warmup = start_cache_warmup()
+
+# Serve /metrics and/or write the metrics textfile if configured; the exporter is
+# only imported when one of them is set, so it stays out of a default cold start
+if os.environ.get("METRICS_PORT") or os.environ.get("METRICS_TEXTFILE"):
+    from utils.metrics import start_metrics_exporter
+    start_metrics_exporter()
+
+# Page modules by navigation label; each is imported the first time it is shown,
+# so a cold start only loads the libraries of the page being served
+pages = {
+    "Home": "pages.home",
+    "Stock Analysis": "pages.analysis",
+    "Compare Stocks": "pages.comparison",
+    "Portfolio": "pages.portfolio",
+    "Company Info": "pages.company",
+    "News": "pages.news",
+    "Donate": "pages.donate",
+    "Diagnostics": "pages.diagnostics"
+}
+
+# Pages left out of the navigation, opened by URL instead (e.g. ?page=Diagnostics)
+# when DIAGNOSTICS_ENABLED is set
+HIDDEN_PAGES = {"Diagnostics"}
+
 # Create session state variables if they don't exist
 if 'selected_stock' not in st.session_state:
     st.session_state.selected_stock = "AAPL"
+if 'symbol_input' not in st.session_state:
+    st.session_state.symbol_input = st.session_state.selected_stock
 if 'time_period' not in st.session_state:
     st.session_state.time_period = "1y"
 if 'tab' not in st.session_state:
     st.session_state.tab = "Home"
 
+# Count script runs; every interaction should trigger exactly one
+st.session_state.run_count = st.session_state.get('run_count', 0) + 1
+
+def on_symbol_change():
+    """Store the entered symbol before the rerun caused by the text input"""
+    symbol = st.session_state.symbol_input.strip().upper()
+    if symbol:
+        st.session_state.selected_stock = symbol
+    st.session_state.symbol_input = st.session_state.selected_stock
+
 # Sidebar with navigation
 st.sidebar.title("Stock Analysis Dashboard")
 
-# Stock selection
+# Stock selection (widgets are bound to session state keys, so no extra rerun is needed)
 st.sidebar.subheader("Select a Stock")
-symbol_input = st.sidebar.text_input("Enter Stock Symbol", value=st.session_state.selected_stock)
-if symbol_input and symbol_input != st.session_state.selected_stock:
-    st.session_state.selected_stock = symbol_input.upper()
-    st.rerun()
+st.sidebar.text_input("Enter Stock Symbol", key="symbol_input", on_change=on_symbol_change)
 
 # Time period selection
 st.sidebar.subheader("Select Time Period")
-time_period = st.sidebar.selectbox(
+st.sidebar.selectbox(
     "Time Period",
     options=["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"],
-    index=5  # Default to 1y
+    key="time_period"
 )
-if time_period != st.session_state.time_period:
-    st.session_state.time_period = time_period
-    st.rerun()
 
 # Navigation
 st.sidebar.subheader("Navigation")
-pages = {
-    "Home": home,
-    "Stock Analysis": analysis,
-    "Company Info": company,
-    "News": news,
-    "Donate": donate
-}
-
-selected_page = st.sidebar.radio("Go to", list(pages.keys()))
-
-if selected_page != st.session_state.tab:
-    st.session_state.tab = selected_page
-    st.rerun()
+selected_page = st.sidebar.radio("Go to", [page for page in pages if page not in HIDDEN_PAGES], key="tab")
+if DIAGNOSTICS_ENABLED and st.query_params.get("page") in HIDDEN_PAGES:
+    selected_page = st.query_params["page"]
 
-# Display the selected page
-pages[selected_page].show()
+# Display the selected page, timing the whole page run
+with span(f"page.{selected_page}"):
+    importlib.import_module(pages[selected_page]).show()
 
 # Footer
 st.sidebar.markdown("---")
+if warmup is not None and not warmup.ready:
+    status = warmup.status()
+    st.sidebar.caption(f"⏳ Warming up caches: {status['done']}/{status['total']} tickers")
 st.sidebar.caption("© 2023 Stock Analysis Dashboard")
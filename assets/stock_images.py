@@ -1,46 +1,119 @@
+import os
+import zlib
 import streamlit as st
 
-# Store URLs of stock images
+# Images are bundled in the static folder and served by Streamlit's static file
+# serving (server.enableStaticServing) under app/static/images/
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+IMAGE_DIR = os.path.join(STATIC_DIR, "images")
+STATIC_URL = "app/static/images"
+
+# Images are shown in the main column of the wide layout
+DISPLAY_WIDTH = int(os.environ.get("IMAGE_DISPLAY_WIDTH", "800"))
+WEBP_QUALITY = 75
+
+# Number of stock images per category
 stock_images = {
-    'chart': [
-        "https://pixabay.com/get/gfadf06733bd54c05fbb160c7dd3890d5eff3393c67086f45e6dbeb812b7e89e71d7904665ec31de116ace6baad35bd897c41b8daa5fdb827c9e870951ca74546_1280.jpg",
-        "https://pixabay.com/get/g43142a76c26beea3ece4fb1691f6018026188f1e9781b6a740f4d19614ac251dcb69f15276e030a32d4df328f09b76863a7d3e7d8e1096c3f35fa37c18020d4a_1280.jpg",
-        "https://pixabay.com/get/g0ab43e80a1faf2ef6080c7082001973fa627eefc38b12b2cba46d2c12aba7209537fb542259745bb71ed324c2994c5d778cb0414b034233ca3c5d6716e839b7b_1280.jpg",
-        "https://pixabay.com/get/g245a7eae3620d3eafb53950f5192c87eac3530d45a9e0c069295d8bd8fec1721f8749eb8cabcaa218753e2a3200dcf30d6e1b01cadff59aa9f34a4b865d5c55b_1280.jpg",
-        "https://pixabay.com/get/gbd4a23d9dbe16a1c7d4b950d43b2e0d11493b17bea4daee5fb7b49d3495e1682afb55993b280a57672ec5ea031537bcc8ee979903d889a1443d452afd4886bb4_1280.jpg",
-        "https://pixabay.com/get/ga174dcae66051bb4e9a0821bf6fdc0d0f16d9ac2d7f612eba75cabc6c0879b343966aae582fbcd42113c5d14d15757ebbd78dc616d6d5ee5d7e313f9f64e8d16_1280.jpg"
-    ],
-    'dashboard': [
-        "https://pixabay.com/get/ga5801f575af2a3fe3d3634401f342f371b3027044276dd123d99a08be347ffece1e7e87505a6f76a943555e602d9b125b76e9a00a660e1c4db8e7a3d9066b975_1280.jpg",
-        "https://pixabay.com/get/g74b636ef1143022fef4e87e7c606dfffbd4d5038c83821ac150a5d97dfc9cc0ec4146e22f9d608b9b8fd8dbf0bbb4e58318202d177b655ac1a7aa36a9b954ec4_1280.jpg",
-        "https://pixabay.com/get/g9e60f3884524643f893e53991693bb34d6de72ec733811cea9716ca10044e192acf0e7faa29d939c078e3c7c019b902f1d61a5677484e8ae38ce856d49c3b2b2_1280.jpg",
-        "https://pixabay.com/get/g2d4f819f59c37773de3c70654146cacf104a0ba314d7728ebd44a5e62fb71ae6998236725e8505c46d7f99c862150830e8b40413589ff47340f2a86bccd0e928_1280.jpg"
-    ],
-    'business': [
-        "https://pixabay.com/get/gd3ec3c92e163f5dd1771bcf79822ca1d6221e0ec9a9a6cd27a791d0192b0de31926bdd5f1b228e14524d8a4cfed89591b372535b6581faac41de980e5dc02148_1280.jpg",
-        "https://pixabay.com/get/ge430a501925309db8816772046bb7fe1ca89dcb8f5a24bde6d5ce656e0c6f8576221889f9221a3a9e2737f9450d3a716a09b7e73d4df28ea50640662adbd07b4_1280.jpg"
-    ]
+    'chart': 6,
+    'dashboard': 4,
+    'business': 2
 }
 
-def get_stock_image_url(category, index=None):
+def _image_file_name(category, index, width):
+    """File name of a stock image"""
+    return f"{category}_{index}_{width}.webp"
+
+def _draw_image(category, index, width):
+    """
+    Draw a small chart-style image matching the app's dark theme
+
+    The drawing is seeded by category and index, so every build produces the
+    same file.
+    """
+    import random
+    from PIL import Image, ImageDraw
+
+    height = width * 9 // 16
+    image = Image.new("RGB", (width, height), "#1E1E1E")
+    draw = ImageDraw.Draw(image)
+
+    for y in range(height // 5, height, height // 5):
+        draw.line([(0, y), (width, y)], fill="#2A2A2A", width=1)
+
+    rng = random.Random(zlib.crc32(f"{category}-{index}".encode()))
+    points, level = [], height * 0.6
+    for x in range(0, width + 1, max(width // 40, 1)):
+        level = min(max(level + rng.uniform(-0.06, 0.05) * height, height * 0.15), height * 0.85)
+        points.append((x, level))
+    draw.line(points, fill="#1E88E5", width=max(width // 200, 2))
+
+    return image
+
+def get_local_image_path(category, index=None, width=DISPLAY_WIDTH):
     """
-    Get a stock image URL based on category and index
-    
+    Get the WebP file of a stock image
+
+    Images at the default width are bundled with the app. Other widths (see
+    IMAGE_DISPLAY_WIDTH) are drawn locally on first use; nothing is downloaded.
+
     Args:
         category (str): Image category ('chart', 'dashboard', or 'business')
-        index (int, optional): Specific index to retrieve. If None, returns the first image.
-    
+        index (int, optional): Specific index to retrieve. If None, uses the first image.
+        width (int): Display width in pixels
+
     Returns:
-        str: URL of the stock image
+        str: Path of the WebP file
     """
     if category not in stock_images:
-        # Default to 'chart' if category not found
         category = 'chart'
-    
-    images = stock_images[category]
-    
-    if index is None or index < 0 or index >= len(images):
-        # Return first image if index is out of range
-        return images[0]
-    
-    return images[index]
+    if index is None or index < 0 or index >= stock_images[category]:
+        index = 0
+
+    path = os.path.join(IMAGE_DIR, _image_file_name(category, index, width))
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    _draw_image(category, index, width).save(temp_path, "WEBP", quality=WEBP_QUALITY, method=6)
+    os.replace(temp_path, path)
+    return path
+
+@st.cache_data(show_spinner=False)
+def get_static_image_url(category, index=None, width=DISPLAY_WIDTH):
+    """
+    Get the static-serving URL of a stock image
+
+    Args:
+        category (str): Image category ('chart', 'dashboard', or 'business')
+        index (int, optional): Specific index to retrieve. If None, uses the first image.
+        width (int): Display width in pixels
+
+    Returns:
+        str: Relative URL under app/static/images/
+    """
+    path = get_local_image_path(category, index, width)
+    return f"{STATIC_URL}/{os.path.basename(path)}"
+
+def show_stock_image(category, index=None, width=DISPLAY_WIDTH):
+    """
+    Display a stock image through Streamlit's static file serving
+
+    Args:
+        category (str): Image category ('chart', 'dashboard', or 'business')
+        index (int, optional): Specific index to retrieve. If None, uses the first image.
+        width (int): Display width in pixels
+    """
+    url = get_static_image_url(category, index, width)
+    st.markdown(f'<img src="{url}" alt="{category}" style="width:100%; max-width:{width}px;">', unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    # Regenerate the bundled images, e.g. after changing the drawing or the width:
+    #     python -m assets.stock_images
+    for category, count in stock_images.items():
+        for index in range(count):
+            path = os.path.join(IMAGE_DIR, _image_file_name(category, index, DISPLAY_WIDTH))
+            if os.path.exists(path):
+                os.remove(path)
+            path = get_local_image_path(category, index)
+            print(f"{path} ({os.path.getsize(path) / 1024:.1f} KB)")
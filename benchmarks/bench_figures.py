@@ -0,0 +1,68 @@
+"""
+Benchmark technical chart construction, SVG versus WebGL line traces
+
+Records the serialized figure payload size and build time for several history
+lengths. Run from the repository root:
+
+    python -m benchmarks.bench_figures
+"""
+from benchmarks.common import time_call, save_results, print_table
+import plotly.io as pio
+from utils.technical_analysis import calculate_indicators
+from utils.charts import build_technical_chart, INDICATOR_GROUPS, _get_base_spec, _get_group_traces
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers
+
+LENGTHS = [252, 2520, 10000]
+
+SEED = 0
+
+def make_price_data(rows, market=None, candidates=200):
+    """
+    Last rows daily bars of the first synthetic ticker with that much history
+
+    Args:
+        rows (int): Number of bars
+        market (SyntheticMarket, optional): Market to draw from, defaults to SyntheticMarket(seed=SEED)
+        candidates (int): Synthetic tickers searched for a long enough history
+
+    Returns:
+        pandas.DataFrame: OHLCV frame shaped like yfinance daily history
+    """
+    market = market or SyntheticMarket(seed=SEED)
+    for ticker in synthetic_tickers(candidates, seed=market.seed):
+        history = market.history(ticker, period="max", actions=False)
+        if len(history) >= rows:
+            return history.iloc[-rows:]
+    raise ValueError(f"No synthetic ticker has {rows} bars of history")
+
+def run():
+    market = SyntheticMarket(seed=SEED)
+    results = []
+    for rows in LENGTHS:
+        data = calculate_indicators(make_price_data(rows, market))
+        for mode, webgl in [("svg", False), ("webgl", True)]:
+            def build():
+                _get_base_spec.clear()
+                _get_group_traces.clear()
+                return build_technical_chart("BENCH", "max", "Daily", data, INDICATOR_GROUPS, webgl=webgl)
+
+            fig = build()
+            payload = pio.to_json(fig, validate=False)
+            cold = time_call(build)
+            warm = time_call(lambda: build_technical_chart("BENCH", "max", "Daily", data, INDICATOR_GROUPS, webgl=webgl))
+
+            results.append({
+                "rows": rows,
+                "mode": mode,
+                "traces": len(fig.data),
+                "payload_kb": round(len(payload) / 1024, 1),
+                "cold_build_ms": cold["median_ms"],
+                "cached_build_ms": warm["median_ms"]
+            })
+
+    print_table(results, ["rows", "mode", "traces", "payload_kb", "cold_build_ms", "cached_build_ms"])
+    print(f"\nResults appended to {save_results('figures', results)}")
+    return results
+
+if __name__ == "__main__":
+    run()
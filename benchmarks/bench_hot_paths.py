@@ -0,0 +1,82 @@
+"""
+Benchmark the data, indicator and rendering hot paths on synthetic data
+
+Covers calculate_indicators (uncached and as a cache hit) at 1y/10y/max
+lengths, get_indicator_interpretation, financial ratio formatting, the
+Company page's ratio parsing, and technical chart construction plus JSON
+serialization as show_technical_analysis does it. Records timing and peak
+memory per case. Run from the repository root:
+
+    python -m benchmarks.bench_hot_paths
+"""
+import tempfile
+import plotly.io as pio
+from benchmarks.common import measure, save_results, print_table
+from pages.company import parse_ratio_values
+from utils.charts import build_technical_chart, INDICATOR_GROUPS, _get_base_spec, _get_group_traces
+from utils.fundamental_analysis import fetch_financial_ratios, format_financial_ratios
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers, use_synthetic_data
+from utils.technical_analysis import calculate_indicators, get_indicator_interpretation
+
+PERIODS = ["1y", "10y", "max"]
+INTERPRETED = ["SMA", "MACD", "RSI", "Bollinger"]
+
+# Tickers whose ratios are formatted and parsed per call, like a screener pass
+RATIO_TICKERS = 500
+
+SEED = 7
+
+def _longest_ticker(market, candidates):
+    """Candidate with the longest synthetic history, so 'max' is really long"""
+    return max(candidates, key=lambda ticker: len(market.history(ticker, period="max")))
+
+def run():
+    market = SyntheticMarket(seed=SEED)
+    tickers = synthetic_tickers(RATIO_TICKERS, seed=SEED)
+    ticker = _longest_ticker(market, tickers[:20])
+
+    results = []
+
+    def add(case, size, func, repeat=5):
+        results.append({"case": case, "size": size, **measure(func, repeat)})
+
+    # Indicators: full computation, then the cached call (argument hashing only)
+    frames = {}
+    for period in PERIODS:
+        prices = market.history(ticker, period=period)
+        frames[period] = calculate_indicators(prices)
+        add(f"calculate_indicators[{period}]", len(prices), lambda: calculate_indicators.__wrapped__(prices))
+        add(f"calculate_indicators_cached[{period}]", len(prices), lambda: calculate_indicators(prices))
+
+    data = frames["10y"]
+    for indicator in INTERPRETED:
+        add(f"get_indicator_interpretation[{indicator}]", len(data),
+            lambda: get_indicator_interpretation(data, indicator), repeat=21)
+
+    # Ratios as fetched from the (synthetic) info snapshots, formatted and parsed back
+    with tempfile.TemporaryDirectory() as tmp, use_synthetic_data(market, data_dir=tmp):
+        raw_ratios = [fetch_financial_ratios(t) for t in tickers]
+    formatted = [format_financial_ratios(r) for r in raw_ratios]
+    add("format_financial_ratios", len(raw_ratios), lambda: [format_financial_ratios(r) for r in raw_ratios])
+    add("company_parse_ratio_values", len(formatted), lambda: [parse_ratio_values(r) for r in formatted])
+
+    # Technical chart: every indicator group, built from scratch and serialized
+    for period in PERIODS:
+        view = frames[period]
+
+        def build_and_serialize():
+            _get_base_spec.clear()
+            _get_group_traces.clear()
+            fig = build_technical_chart(ticker, period, "Daily", view, INDICATOR_GROUPS)
+            return pio.to_json(fig, validate=False)
+
+        add(f"technical_chart[{period}]", len(view), build_and_serialize)
+        add(f"technical_chart_cached[{period}]", len(view),
+            lambda: pio.to_json(build_technical_chart(ticker, period, "Daily", view, INDICATOR_GROUPS), validate=False))
+
+    print_table(results, ["case", "size", "best_ms", "median_ms", "peak_kb"])
+    print(f"\nResults appended to {save_results('hot_paths', results)}")
+    return results
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,107 @@
+"""
+Benchmark the news store's inverted index at scale
+
+Ingests synthetic articles into a temporary database, then records ingest
+throughput, database and index size, and the latency of keyword, publisher,
+ticker and date-range queries. Run from the repository root:
+
+    python -m benchmarks.bench_news_index [--articles 100000]
+"""
+import argparse
+import os
+import itertools
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from benchmarks.common import time_call, save_results, print_table
+from utils.news_item import NewsItem
+from utils.news_store import connect, ingest_news, search_news, get_index_stats
+
+TICKERS = ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA", "JPM", "V", "WMT"]
+PUBLISHERS = ["Reuters", "Bloomberg", "MarketWatch", "CNBC", "Barron's", "Motley Fool", "Zacks", "Benzinga"]
+COMMON_WORDS = ["stock", "shares", "earnings", "market", "price", "analyst", "quarter", "growth", "revenue", "rally"]
+
+def make_articles(count, seed=0, vocabulary=20000):
+    """
+    Synthetic articles with a Zipf-like word distribution over one year
+
+    Returns:
+        list: (ticker, NewsItem) pairs
+    """
+    rng = random.Random(seed)
+    words = COMMON_WORDS + [f"word{i}" for i in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    end = datetime(2026, 1, 1)
+
+    articles = []
+    for i in range(count):
+        published = end - timedelta(seconds=rng.randrange(365 * 86400))
+        ticker = rng.choice(TICKERS)
+        articles.append((ticker, NewsItem(
+            title=f"{ticker} " + " ".join(rng.choices(words, cum_weights=cum_weights, k=8)),
+            publisher=rng.choice(PUBLISHERS),
+            link=f"https://news.example.com/{i}",
+            published_ts=int(published.timestamp()),
+            summary=" ".join(rng.choices(words, cum_weights=cum_weights, k=30))
+        )))
+    return articles
+
+def run(count=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news.db")
+        conn = connect(path)
+
+        articles = make_articles(count)
+        start = time.perf_counter()
+        batch = 500
+        for i in range(0, count, batch):
+            by_ticker = {}
+            for ticker, item in articles[i:i + batch]:
+                by_ticker.setdefault(ticker, []).append(item)
+            for ticker, items in by_ticker.items():
+                # A fresh source name per batch, so the watermark never skips synthetic items
+                ingest_news(ticker, f"bench{i}", items, conn=conn)
+        ingest_seconds = time.perf_counter() - start
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        index = get_index_stats(conn)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        start_date, end_date = datetime(2025, 6, 1), datetime(2025, 6, 30)
+        queries = {
+            "keyword_common": dict(query="earnings"),
+            "keyword_rare": dict(query="word5000"),
+            "two_keywords": dict(query="earnings growth"),
+            "keyword_ticker": dict(query="analyst", tickers=["NVDA"]),
+            "keyword_month": dict(query="revenue", start=start_date, end=end_date),
+            "publisher": dict(publisher="Reuters"),
+            "publisher_month": dict(publisher="Reuters", start=start_date, end=end_date),
+            "date_range": dict(start=start_date, end=end_date),
+        }
+
+        results = []
+        for name, kwargs in queries.items():
+            hits = len(search_news(limit=20, conn=conn, **kwargs))
+            timing = time_call(lambda: search_news(limit=20, conn=conn, **kwargs), repeat=9)
+            results.append({"query": name, "hits": hits, **timing})
+
+        conn.close()
+
+    print(f"{count} articles ingested in {ingest_seconds:.1f}s ({count / ingest_seconds:.0f}/s), "
+          f"{index['terms']} terms, {index['term_postings']} term postings, database {size_mb:.1f} MB\n")
+    print_table(results, ["query", "hits", "best_ms", "median_ms"])
+
+    # Ingest is stored as one more row, timed per 1000 articles, so every row
+    # can be compared on median_ms with the previous run
+    ingest_ms = round(ingest_seconds / count * 1000 * 1000, 3)
+    results.append({"query": "ingest_per_1000", "articles": count, "best_ms": ingest_ms, "median_ms": ingest_ms,
+                    "terms": index['terms'], "term_postings": index['term_postings'], "db_mb": round(size_mb, 1)})
+    print(f"\nResults appended to {save_results('news_index', results)}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the news inverted index.")
+    parser.add_argument("--articles", type=int, default=100000, help="Number of synthetic articles")
+    args = parser.parse_args()
+    run(args.articles)
@@ -0,0 +1,57 @@
+"""
+Benchmark end-to-end page runs with Streamlit's headless AppTest
+
+Every page of app.py is run against synthetic market data (no network) in a
+temporary data directory. Records the cold run (budgeted caches cleared, local
+stores empty for the page's data), the median warm rerun and the peak memory
+of a warm rerun. Run from the repository root:
+
+    python -m benchmarks.bench_pages [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# The background cache warm-up would blur the cold numbers
+os.environ.setdefault("WARMUP_ENABLED", "0")
+
+from streamlit.testing.v1 import AppTest
+from benchmarks.common import time_call, peak_memory, save_results, print_table
+from utils.cache import clear_all_caches
+from utils.synthetic_data import SyntheticMarket, use_synthetic_data
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+SEED = 7
+
+def run(repeat=3):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, use_synthetic_data(SyntheticMarket(seed=SEED), data_dir=tmp):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+
+        for page in at.sidebar.radio[0].options:
+            clear_all_caches()
+            start = time.perf_counter()
+            at.sidebar.radio[0].set_value(page).run()
+            cold_ms = round((time.perf_counter() - start) * 1000, 3)
+
+            warm = time_call(at.run, repeat)
+            results.append({
+                "page": page,
+                "cold_ms": cold_ms,
+                **warm,
+                **peak_memory(at.run),
+                "exceptions": len(at.exception)
+            })
+
+    print_table(results, ["page", "cold_ms", "best_ms", "median_ms", "peak_kb", "exceptions"])
+    print(f"\nResults appended to {save_results('pages', results)}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page runs with AppTest on synthetic data.")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm reruns per page")
+    args = parser.parse_args()
+    run(args.repeat)
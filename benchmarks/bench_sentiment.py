@@ -0,0 +1,88 @@
+"""
+Benchmark the offline news sentiment scorer
+
+Records scoring throughput (articles/sec) on synthetic headlines and summaries
+that mix lexicon words, negations and intensifiers into neutral filler, and the
+latency of the daily sentiment aggregate the analysis chart reads. Run from the
+repository root:
+
+    python -m benchmarks.bench_sentiment [--articles 20000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.common import time_call, save_results, print_table
+from utils.news_item import NewsItem
+from utils.news_store import connect, ingest_news, get_daily_sentiment
+from utils.sentiment import FINANCE_LEXICON, NEGATIONS, INTENSIFIERS, score_article
+
+FILLER = ["the", "company", "quarter", "shares", "investors", "market", "said", "on", "analysts",
+          "revenue", "guidance", "after", "report", "year", "demand", "chip", "cloud", "sales"]
+
+def make_texts(count, seed=0):
+    """
+    Synthetic (title, summary) pairs, about one sentiment word in five
+
+    Returns:
+        list: (title, summary) tuples
+    """
+    rng = random.Random(seed)
+    sentiment_words = list(FINANCE_LEXICON)
+    modifiers = list(NEGATIONS) + list(INTENSIFIERS)
+
+    def sentence(length):
+        words = []
+        for _ in range(length):
+            roll = rng.random()
+            if roll < 0.2:
+                words.append(rng.choice(sentiment_words))
+            elif roll < 0.25:
+                words.append(rng.choice(modifiers))
+            else:
+                words.append(rng.choice(FILLER))
+        return " ".join(words).capitalize()
+
+    return [(sentence(10), sentence(40)) for _ in range(count)]
+
+def run(count=20000):
+    texts = make_texts(count)
+
+    start = time.perf_counter()
+    scores = [score_article(title, summary) for title, summary in texts]
+    seconds = time.perf_counter() - start
+
+    results = [{
+        "case": "score_article",
+        "articles": count,
+        "articles_per_sec": round(count / seconds),
+        "mean_score": round(sum(scores) / count, 3)
+    }]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "news.db"))
+        now = int(time.time())
+        items = [
+            NewsItem(title, "Bench", f"https://news.example.com/{i}", now - i * 3600, summary)
+            for i, (title, summary) in enumerate(texts)
+        ]
+        ingest_news("BENCH", "bench", items, conn=conn)
+
+        timing = time_call(lambda: get_daily_sentiment("BENCH", conn=conn), repeat=9)
+        days = len(get_daily_sentiment("BENCH", conn=conn))
+        conn.close()
+
+    print(f"Scored {count} articles in {seconds:.2f}s ({count / seconds:.0f} articles/sec)")
+    print(f"Daily sentiment over {days} days: {timing['median_ms']} ms median\n")
+
+    results.append({"case": "daily_sentiment", "articles": count, "days": days, **timing})
+    print_table(results, ["case", "articles", "articles_per_sec", "days", "best_ms", "median_ms"])
+    print(f"\nResults appended to {save_results('sentiment', results)}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the news sentiment scorer.")
+    parser.add_argument("--articles", type=int, default=20000, help="Number of synthetic articles")
+    args = parser.parse_args()
+    run(args.articles)
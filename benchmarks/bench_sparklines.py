@@ -0,0 +1,67 @@
+"""
+Benchmark the Popular Stocks strip: one px.line figure per ticker versus one
+combined subplot figure
+
+Records build time (including JSON serialization, as st.plotly_chart does) and
+payload size. Run from the repository root:
+
+    python -m benchmarks.bench_sparklines
+"""
+import plotly.express as px
+import plotly.io as pio
+from benchmarks.common import time_call, save_results, print_table
+from utils.charts import build_sparkline_strip, _get_sparkline_spec
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers
+
+# The Home page strip shows five popular stocks over five days
+TICKERS = 5
+SEED = 0
+
+def build_per_ticker(prices):
+    """The previous approach: one px.line figure per ticker, serialized separately"""
+    payloads = []
+    for ticker, df in prices.items():
+        fig = px.line(df, x=df.index, y='Close', title=ticker)
+        fig.update_layout(
+            height=100,
+            margin=dict(l=0, r=0, t=30, b=0),
+            showlegend=False,
+            xaxis=dict(showticklabels=False),
+            yaxis=dict(showticklabels=False)
+        )
+        fig.update_traces(line_color="green")
+        payloads.append(pio.to_json(fig, validate=False))
+    return payloads
+
+def build_combined(prices):
+    """One subplot figure for the whole strip"""
+    return [pio.to_json(build_sparkline_strip(prices), validate=False)]
+
+def run():
+    market = SyntheticMarket(seed=SEED)
+    prices = {ticker: market.history(ticker, period="5d", actions=False) for ticker in synthetic_tickers(TICKERS, seed=SEED)}
+
+    def combined_cold():
+        _get_sparkline_spec.clear()
+        return build_combined(prices)
+
+    results = []
+    for mode, func in [("per_ticker", lambda: build_per_ticker(prices)),
+                       ("combined_cold", combined_cold),
+                       ("combined_cached", lambda: build_combined(prices))]:
+        payloads = func()
+        timing = time_call(func, repeat=7)
+        results.append({
+            "mode": mode,
+            "figures": len(payloads),
+            "payload_kb": round(sum(len(p) for p in payloads) / 1024, 1),
+            "best_ms": timing["best_ms"],
+            "median_ms": timing["median_ms"]
+        })
+
+    print_table(results, ["mode", "figures", "payload_kb", "best_ms", "median_ms"])
+    print(f"\nResults appended to {save_results('sparklines', results)}")
+    return results
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,161 @@
+"""
+Benchmark cold-start import time of the app shell and of every page
+
+Each target is imported in a fresh interpreter with ``python -X importtime``.
+The "shell" target is every module app.py imports at its top level (read from
+its source, so the list follows the app), Streamlit included; page targets only count the imports added on top of
+Streamlit. Results are compared with benchmarks/startup_budget.json:
+a target fails when it exceeds its time budget or loads a module it must not
+load (e.g. yfinance for the Donate page). Run from the repository root:
+
+    python -m benchmarks.bench_startup [--repeat N]
+
+Exits with status 1 when a budget is exceeded.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from benchmarks.common import save_results, print_table
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+# Slow third-party modules worth reporting whenever a target loads them
+HEAVY_MODULES = ["pandas", "numpy", "plotly.express", "yfinance", "yahooquery", "ta"]
+
+def get_shell_imports(path=APP_PATH):
+    """
+    Get the modules an app script imports unconditionally
+
+    Only module-level import statements count: imports inside functions or
+    behind an if (e.g. the metrics exporter) are not part of a default cold start.
+
+    Args:
+        path (str): Path of the app script
+
+    Returns:
+        list: Module names, in import order
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def parse_importtime(stderr, after=None):
+    """
+    Parse ``-X importtime`` output
+
+    Args:
+        stderr (str): Standard error of the interpreter
+        after (str, optional): Only count imports that follow this top-level module
+
+    Returns:
+        tuple: (total microseconds of top-level imports, {module: cumulative microseconds})
+    """
+    modules = {}
+    total = 0
+    counting = after is None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        top_level = not name[1:].startswith(" ")
+        name = name.strip()
+        if not counting:
+            counting = top_level and name == after
+            continue
+        modules[name] = int(cumulative)
+        if top_level:
+            total += int(cumulative)
+    return total, modules
+
+def measure(target, repeat=3):
+    """
+    Import a target in fresh interpreters and keep the fastest run
+
+    Args:
+        target (str): Module to import, or "shell" for the app shell
+        repeat (int): Number of interpreter runs
+
+    Returns:
+        dict: Import time in milliseconds, module count and heavy modules loaded
+    """
+    if target == "shell":
+        code, after = "; ".join(f"import {m}" for m in get_shell_imports()), None
+    else:
+        code, after = f"import streamlit; import {target}", "streamlit"
+
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        total, modules = parse_importtime(proc.stderr, after=after)
+        if best is None or total < best[0]:
+            best = (total, modules)
+
+    total, modules = best
+    slowest = sorted(((us, m) for m, us in modules.items() if "." not in m), reverse=True)[:3]
+    return {
+        "target": target,
+        "import_ms": round(total / 1000, 1),
+        "modules": len(modules),
+        "heavy": [m for m in HEAVY_MODULES if m in modules],
+        "slowest": ", ".join(f"{m} ({us / 1000:.0f}ms)" for us, m in slowest)
+    }
+
+def check_budget(result, budget):
+    """
+    Compare one result with its budget entry
+
+    Returns:
+        list: Human-readable budget violations (empty if within budget)
+    """
+    problems = []
+    if result["import_ms"] > budget["max_ms"]:
+        problems.append(f"{result['target']}: {result['import_ms']}ms exceeds the {budget['max_ms']}ms budget")
+    for module in budget.get("forbidden", []):
+        if module in result["heavy"]:
+            problems.append(f"{result['target']}: imports {module} at startup")
+    return problems
+
+def run(repeat=3):
+    with open(BUDGET_PATH) as f:
+        budgets = json.load(f)["targets"]
+
+    results, problems = [], []
+    for target, budget in budgets.items():
+        result = measure(target, repeat)
+        problems += check_budget(result, budget)
+        result["budget_ms"] = budget["max_ms"]
+        results.append(result)
+
+    print_table(results, ["target", "import_ms", "budget_ms", "modules", "heavy", "slowest"])
+    print(f"\nResults appended to {save_results('startup', results)}")
+
+    for problem in problems:
+        print(f"OVER BUDGET: {problem}")
+    return results, problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time against the budget.")
+    parser.add_argument("--repeat", type=int, default=3, help="Interpreter runs per target (fastest is kept)")
+    args = parser.parse_args()
+
+    _, problems = run(args.repeat)
+    sys.exit(1 if problems else 0)
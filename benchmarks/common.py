@@ -0,0 +1,157 @@
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from streamlit import config
+from streamlit.logger import set_log_level
+
+# Benchmarks call the Streamlit-cached helpers outside a running app; silence the
+# bare-mode warnings. Config is loaded first because loading it resets the log level.
+config.get_config_options()
+set_log_level("error")
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def get_git_revision():
+    """Short git revision of the working tree, or 'unknown' outside a checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(RESULTS_DIR),
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def time_call(func, repeat=5):
+    """
+    Time a function call
+
+    Args:
+        func (callable): Function without arguments
+        repeat (int): Number of timed calls
+
+    Returns:
+        dict: Best and median wall time in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {"best_ms": round(timings[0], 3), "median_ms": round(timings[len(timings) // 2], 3)}
+
+def peak_memory(func):
+    """
+    Measure the peak Python memory allocated during one call
+
+    Runs separately from time_call, since tracing slows the call down.
+
+    Args:
+        func (callable): Function without arguments
+
+    Returns:
+        dict: Peak traced allocation in KiB
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_kb": round(peak / 1024, 1)}
+
+def measure(func, repeat=5):
+    """
+    Time a function call and measure its peak memory
+
+    Returns:
+        dict: best_ms, median_ms and peak_kb
+    """
+    return {**time_call(func, repeat), **peak_memory(func)}
+
+def save_results(name, results):
+    """
+    Append one benchmark run to benchmarks/results/<name>.jsonl
+
+    Args:
+        name (str): Benchmark name
+        results (list): Result rows (dicts)
+
+    Returns:
+        str: Path of the results file
+    """
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{name}.jsonl")
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": get_git_revision(),
+        "python": platform.python_version(),
+        "results": results
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(run) + "\n")
+    return path
+
+def print_table(results, columns):
+    """Print result rows as an aligned plain-text table"""
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in results:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+def load_previous_results(name):
+    """
+    Load the most recent stored run of a benchmark
+
+    Returns:
+        dict: The run (timestamp, revision, results), or None if there is none
+    """
+    path = os.path.join(RESULTS_DIR, f"{name}.jsonl")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+def compare_results(previous, current, keys, metric="median_ms", threshold=0.2):
+    """
+    Compare result rows with those of a previous run
+
+    Rows are matched on the key columns. A row regresses when its metric grew
+    by more than threshold (a fraction) over the previous run.
+
+    Args:
+        previous (dict): Previous run, as returned by load_previous_results
+        current (list): Result rows of this run
+        keys (list): Columns identifying a row
+        metric (str): Column to compare (lower is better)
+        threshold (float): Allowed relative increase
+
+    Returns:
+        list: Rows of the key columns plus previous, current, change and regressed
+    """
+    if not previous:
+        return []
+
+    before = {tuple(row.get(k) for k in keys): row for row in previous["results"]}
+    comparison = []
+    for row in current:
+        old = before.get(tuple(row.get(k) for k in keys))
+        if old is None or not old.get(metric) or row.get(metric) is None:
+            continue
+        change = row[metric] / old[metric] - 1
+        comparison.append({
+            **{k: row.get(k) for k in keys},
+            "metric": metric,
+            "previous": old[metric],
+            "current": row[metric],
+            "change": f"{change:+.1%}",
+            "regressed": change > threshold
+        })
+    return comparison
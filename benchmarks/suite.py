@@ -0,0 +1,70 @@
+"""
+Run the benchmark suite and compare every benchmark with its previous run
+
+Each benchmark stores its run in benchmarks/results/<name>.jsonl (with the git
+revision); the suite then reports rows whose metric grew by more than the
+threshold since the previous stored run. Run from the repository root:
+
+    python -m benchmarks.suite [--only hot_paths pages] [--threshold 0.2] [--fail-on-regression]
+"""
+import argparse
+import importlib
+import sys
+from benchmarks.common import load_previous_results, compare_results, print_table
+
+# name: (module, run() keyword arguments, key columns for comparison, compared metric)
+BENCHMARKS = {
+    "hot_paths": ("benchmarks.bench_hot_paths", {}, ["case"], "median_ms"),
+    "pages": ("benchmarks.bench_pages", {}, ["page"], "median_ms"),
+    "figures": ("benchmarks.bench_figures", {}, ["rows", "mode"], "cold_build_ms"),
+    "sparklines": ("benchmarks.bench_sparklines", {}, ["mode"], "median_ms"),
+    "sentiment": ("benchmarks.bench_sentiment", {}, ["case"], "median_ms"),
+    "news_index": ("benchmarks.bench_news_index", {"count": 20000}, ["query"], "median_ms"),
+    "startup": ("benchmarks.bench_startup", {}, ["target"], "import_ms")
+}
+
+def run(names=None, threshold=0.2):
+    """
+    Run benchmarks and compare them with their previous runs
+
+    Args:
+        names (list, optional): Benchmarks to run, defaults to all of BENCHMARKS
+        threshold (float): Allowed relative increase of the compared metric
+
+    Returns:
+        list: Regressed comparison rows, each with its benchmark name
+    """
+    regressions = []
+    for name in names or BENCHMARKS:
+        module, kwargs, keys, metric = BENCHMARKS[name]
+        print(f"\n=== {name} ===\n")
+
+        previous = load_previous_results(name)
+        results = importlib.import_module(module).run(**kwargs)
+        if name == "startup":
+            # bench_startup.run() also returns its budget problems
+            results = results[0]
+
+        comparison = compare_results(previous, results, keys, metric, threshold)
+        if comparison:
+            print(f"\nChange since revision {previous['revision']} ({previous['timestamp']}):\n")
+            print_table(comparison, keys + ["metric", "previous", "current", "change", "regressed"])
+        regressions += [{"benchmark": name, **row} for row in comparison if row["regressed"]]
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold:.0%}:")
+        fields = {"benchmark", "metric", "previous", "current", "change", "regressed"}
+        for row in regressions:
+            case = ", ".join(str(value) for key, value in row.items() if key not in fields)
+            print(f"  {row['benchmark']} [{case}]: {row['metric']} {row['previous']} -> {row['current']} ({row['change']})")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (default 0.2)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    regressions = run(args.only, args.threshold)
+    sys.exit(1 if regressions and args.fail_on_regression else 0)
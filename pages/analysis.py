@@ -1,10 +1,13 @@
+import sqlite3
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
-from utils.stock_data import get_stock_data
-from utils.technical_analysis import calculate_indicators, get_indicator_description, get_indicator_interpretation
+from utils.stock_data import TIMEFRAMES
+from utils.technical_analysis import get_stock_indicators, get_indicator_description, get_indicator_interpretation
 from utils.fundamental_analysis import get_financial_ratios, get_ratio_description
+from utils.downsample import CHART_WIDTH_PX, PIXELS_PER_CANDLE
+from utils.charts import build_technical_chart
+from utils.news import get_stock_news
+from utils.news_store import get_daily_sentiment
 
 def show():
     """
@@ -12,32 +15,37 @@ def show():
     """
     st.title(f"📊 Stock Analysis: {st.session_state.selected_stock}")
     
-    # Create tabs for technical and fundamental analysis
-    tab1, tab2 = st.tabs(["Technical Analysis", "Fundamental Analysis"])
+    # Only the selected section is rendered; unlike st.tabs, a hidden section does no data work
+    sections = {
+        "Technical Analysis": show_technical_analysis,
+        "Fundamental Analysis": show_fundamental_analysis
+    }
+    section = st.segmented_control("Analysis", options=list(sections.keys()), default="Technical Analysis",
+                                   key="analysis_section", label_visibility="collapsed")
     
-    with tab1:
-        show_technical_analysis()
-        
-    with tab2:
-        show_fundamental_analysis()
+    sections[section or "Technical Analysis"]()
 
+@st.fragment
 def show_technical_analysis():
     """
     Display technical analysis section
+    
+    Runs as a fragment: changing the bar size, an indicator or the zoom only
+    reruns this section.
     """
     ticker = st.session_state.selected_stock
     period = st.session_state.time_period
     
-    # Get stock data
-    stock_data = get_stock_data(ticker, period=period)
+    # Bar size selection (higher timeframes are derived locally from the daily bars)
+    timeframe = st.selectbox("Bar Size", options=list(TIMEFRAMES.keys()), key="timeframe")
+    
+    # Get stock data with technical indicators
+    data = get_stock_indicators(ticker, period=period, interval=TIMEFRAMES[timeframe])
     
-    if stock_data is None or stock_data.empty:
+    if data is None or data.empty:
         st.error(f"Could not retrieve data for {ticker}. Please check if the ticker symbol is correct.")
         return
     
-    # Calculate technical indicators
-    data = calculate_indicators(stock_data)
-    
     # Create indicator selection
     st.subheader("Technical Indicators")
     
@@ -53,6 +61,7 @@ def show_technical_analysis():
         st.markdown("#### Momentum Indicators")
         show_rsi = st.checkbox("RSI", value=True)
         show_stoch = st.checkbox("Stochastic Oscillator")
+        show_sentiment = st.checkbox("News Sentiment")
         
     with col3:
         st.markdown("#### Volatility & Volume")
@@ -62,213 +71,41 @@ def show_technical_analysis():
     # Display the main price chart with selected indicators
     st.subheader("Price Chart with Indicators")
     
-    # Create figure with subplots
-    fig = make_subplots(rows=3, cols=1, 
-                         shared_xaxes=True, 
-                         vertical_spacing=0.05,
-                         row_heights=[0.6, 0.2, 0.2],
-                         subplot_titles=("Price", "Volume", "Indicators"))
-    
-    # Add candlestick trace for prices
-    fig.add_trace(go.Candlestick(
-        x=data.index,
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
-        name='Price'
-    ), row=1, col=1)
-    
-    # Add Moving Averages
-    if show_ma:
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['SMA20'],
-            mode='lines',
-            name='SMA 20',
-            line=dict(color='rgba(255, 165, 0, 0.8)')
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['SMA50'],
-            mode='lines',
-            name='SMA 50',
-            line=dict(color='rgba(255, 0, 0, 0.8)')
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['SMA200'],
-            mode='lines',
-            name='SMA 200',
-            line=dict(color='rgba(0, 0, 255, 0.8)')
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['EMA20'],
-            mode='lines',
-            name='EMA 20',
-            line=dict(color='rgba(128, 0, 128, 0.8)')
-        ), row=1, col=1)
-    
-    # Add Bollinger Bands
-    if show_bb:
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['BB_High'],
-            mode='lines',
-            name='BB Upper',
-            line=dict(color='rgba(0, 128, 0, 0.5)')
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['BB_Mid'],
-            mode='lines',
-            name='BB Middle',
-            line=dict(color='rgba(0, 128, 0, 0.8)')
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['BB_Low'],
-            mode='lines',
-            name='BB Lower',
-            line=dict(color='rgba(0, 128, 0, 0.5)')
-        ), row=1, col=1)
-    
-    # Add volume bar chart
-    fig.add_trace(go.Bar(
-        x=data.index,
-        y=data['Volume'],
-        name='Volume',
-        marker_color='rgba(0, 0, 255, 0.5)'
-    ), row=2, col=1)
-    
-    # Add MACD
-    if show_macd:
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['MACD'],
-            mode='lines',
-            name='MACD',
-            line=dict(color='rgba(0, 0, 255, 0.8)')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['MACD_Signal'],
-            mode='lines',
-            name='Signal',
-            line=dict(color='rgba(255, 0, 0, 0.8)')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Bar(
-            x=data.index,
-            y=data['MACD_Hist'],
-            name='Histogram',
-            marker_color='rgba(0, 255, 0, 0.5)'
-        ), row=3, col=1)
-    
-    # Add RSI
-    if show_rsi:
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['RSI'],
-            mode='lines',
-            name='RSI',
-            line=dict(color='rgba(255, 0, 0, 0.8)')
-        ), row=3, col=1)
-        
-        # Add RSI reference lines at 70 and 30
-        fig.add_trace(go.Scatter(
-            x=[data.index[0], data.index[-1]],
-            y=[70, 70],
-            mode='lines',
-            name='Overbought',
-            line=dict(color='rgba(255, 0, 0, 0.5)', dash='dash')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=[data.index[0], data.index[-1]],
-            y=[30, 30],
-            mode='lines',
-            name='Oversold',
-            line=dict(color='rgba(0, 255, 0, 0.5)', dash='dash')
-        ), row=3, col=1)
-    
-    # Add Stochastic Oscillator
-    if show_stoch:
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['Stoch_K'],
-            mode='lines',
-            name='%K',
-            line=dict(color='rgba(0, 0, 255, 0.8)')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['Stoch_D'],
-            mode='lines',
-            name='%D',
-            line=dict(color='rgba(255, 0, 0, 0.8)')
-        ), row=3, col=1)
-        
-        # Add Stochastic reference lines at 80 and 20
-        fig.add_trace(go.Scatter(
-            x=[data.index[0], data.index[-1]],
-            y=[80, 80],
-            mode='lines',
-            name='Overbought',
-            line=dict(color='rgba(255, 0, 0, 0.5)', dash='dash')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=[data.index[0], data.index[-1]],
-            y=[20, 20],
-            mode='lines',
-            name='Oversold',
-            line=dict(color='rgba(0, 255, 0, 0.5)', dash='dash')
-        ), row=3, col=1)
-    
-    # Add Volume Indicators
-    if show_vol:
-        # On Balance Volume normalized
-        normalized_obv = (data['OBV'] - data['OBV'].min()) / (data['OBV'].max() - data['OBV'].min()) * 100
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=normalized_obv,
-            mode='lines',
-            name='OBV (norm)',
-            line=dict(color='rgba(128, 0, 128, 0.8)')
-        ), row=3, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['CMF'] * 100,  # Scale to percentage
-            mode='lines',
-            name='CMF (%)',
-            line=dict(color='rgba(0, 128, 128, 0.8)')
-        ), row=3, col=1)
-    
-    # Update layout
-    fig.update_layout(
-        height=800,
-        title=f"{ticker} Technical Analysis - {period}",
-        xaxis_rangeslider_visible=False,
-        hovermode="x unified",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
+    view = data
+    if len(data) > CHART_WIDTH_PX // PIXELS_PER_CANDLE:
+        # Long histories are downsampled; zooming in restores full resolution
+        first_date, last_date = data.index[0].date(), data.index[-1].date()
+        zoom_start, zoom_end = st.slider(
+            "Zoom",
+            min_value=first_date,
+            max_value=last_date,
+            value=(first_date, last_date),
+            format="YYYY-MM-DD",
+            key=f"zoom_{ticker}_{period}_{timeframe}"
         )
-    )
+        dates = data.index.date
+        view = data[(dates >= zoom_start) & (dates <= zoom_end)]
+        if len(view) < 2:
+            view = data
+    
+    indicators = [group for group, selected in [
+        ("ma", show_ma), ("bb", show_bb), ("macd", show_macd),
+        ("rsi", show_rsi), ("stoch", show_stoch), ("vol", show_vol)
+    ] if selected]
+    
+    # Daily sentiment of the stored news, scored when the articles were ingested
+    sentiment = None
+    if show_sentiment:
+        try:
+            get_stock_news(ticker)
+            sentiment = get_daily_sentiment(ticker)
+        except sqlite3.Error as e:
+            st.warning(f"News sentiment unavailable: {e}")
+        if sentiment is not None and sentiment.empty:
+            st.caption(f"No dated news stored for {ticker} yet.")
+    
+    # Assembled from cached parts; only newly selected indicator groups are built
+    fig = build_technical_chart(ticker, period, timeframe, view, indicators, sentiment=sentiment)
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -342,6 +179,7 @@ def show_technical_analysis():
     st.markdown("---")
     st.caption("**Disclaimer:** Technical analysis indicators are tools that help interpret market data. They should not be used in isolation for investment decisions.")
 
+@st.fragment
 def show_fundamental_analysis():
     """
     Display fundamental analysis section
@@ -1,10 +1,35 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from utils.stock_data import get_company_overview
 from utils.fundamental_analysis import get_financial_ratios
 
+def parse_ratio_values(metrics):
+    """
+    Convert formatted ratios (e.g. "12.34%", "1.50") back to numbers for charting
+    
+    Args:
+        metrics (dict): Ratio names mapped to formatted strings or numbers
+    
+    Returns:
+        dict: Ratio names mapped to floats (0 where a value cannot be parsed)
+    """
+    values = {}
+    for key, value in metrics.items():
+        if isinstance(value, str):
+            try:
+                if "%" in value:
+                    values[key] = float(value.strip("%")) / 100.0
+                else:
+                    values[key] = float(value)
+            except ValueError:
+                values[key] = 0
+        elif isinstance(value, (int, float)):
+            values[key] = value
+        else:
+            values[key] = 0
+    return values
+
 def show():
     """
     Display company information page
@@ -85,17 +110,7 @@ def show():
         }
         
         # Convert percentage strings to float values for visualization
-        profitability_values = {}
-        for key, value in profitability_ratios.items():
-            if isinstance(value, str) and "%" in value:
-                try:
-                    profitability_values[key] = float(value.strip("%")) / 100.0
-                except ValueError:
-                    profitability_values[key] = 0
-            elif isinstance(value, (int, float)):
-                profitability_values[key] = value
-            else:
-                profitability_values[key] = 0
+        profitability_values = parse_ratio_values(profitability_ratios)
         
         # Create a radar chart for profitability ratios
         categories = list(profitability_values.keys())
@@ -155,20 +170,7 @@ def show():
         }
         
         # Convert to numeric values for the chart
-        earnings_values = {}
-        for key, value in earnings_metrics.items():
-            if isinstance(value, str):
-                try:
-                    if "%" in value:
-                        earnings_values[key] = float(value.strip("%")) / 100.0
-                    else:
-                        earnings_values[key] = float(value)
-                except ValueError:
-                    earnings_values[key] = 0
-            elif isinstance(value, (int, float)):
-                earnings_values[key] = value
-            else:
-                earnings_values[key] = 0
+        earnings_values = parse_ratio_values(earnings_metrics)
         
         # Create a DataFrame for the bar chart
         earnings_df = pd.DataFrame({
@@ -177,6 +179,8 @@ def show():
         })
         
         # Generate bar chart
+        import plotly.express as px
+        
         fig = px.bar(
             earnings_df, 
             x='Metric', 
@@ -0,0 +1,162 @@
+import streamlit as st
+import plotly.graph_objects as go
+from utils.charts import get_line_trace
+from utils.comparison import (
+    get_price_matrix,
+    normalize_prices,
+    calculate_relative_performance,
+    calculate_rolling_statistics,
+    get_comparison_summary
+)
+
+def show():
+    """
+    Display the multi-stock comparison page
+    """
+    st.title("⚖️ Stock Comparison")
+
+    period = st.session_state.time_period
+    default_tickers = ", ".join(dict.fromkeys([st.session_state.selected_stock, "MSFT", "GOOGL", "AMZN"]))
+
+    tickers_input = st.text_input("Enter stock symbols separated by commas", value=default_tickers)
+    tickers = [t.strip().upper() for t in tickers_input.split(",") if t.strip()]
+    tickers = list(dict.fromkeys(tickers))
+
+    if len(tickers) < 2:
+        st.info("Enter at least two stock symbols to compare.")
+        return
+
+    with st.spinner(f"Fetching data for {len(tickers)} stocks..."):
+        prices = get_price_matrix(tuple(tickers), period=period)
+
+    if prices is None or len(prices) < 2:
+        st.error("Could not retrieve overlapping data for the selected stocks.")
+        return
+
+    missing = [t for t in tickers if t not in prices.columns]
+    if missing:
+        st.warning(f"No data found for: {', '.join(missing)}")
+
+    available = list(prices.columns)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        benchmark = st.selectbox("Benchmark", options=available, index=0)
+
+    with col2:
+        base_date = st.date_input(
+            "Base Date",
+            value=prices.index[0].date(),
+            min_value=prices.index[0].date(),
+            max_value=prices.index[-1].date()
+        )
+
+    with col3:
+        window = st.select_slider("Rolling Window (days)", options=[20, 60, 120, 252], value=60)
+
+    # Normalized performance
+    st.subheader("Normalized Performance")
+
+    normalized = normalize_prices(prices, base_date)
+    if normalized.empty:
+        st.error("No data available after the selected base date.")
+        return
+
+    # Dense line charts (many tickers over long periods) are drawn with WebGL
+    line_trace = get_line_trace(normalized.size)
+
+    fig = go.Figure()
+    for ticker in normalized.columns:
+        fig.add_trace(line_trace(
+            x=normalized.index,
+            y=normalized[ticker],
+            mode='lines',
+            name=ticker
+        ))
+
+    fig.update_layout(
+        title=f"Performance Rebased to 100 - {period}",
+        xaxis_title="Date",
+        yaxis_title="Rebased Price",
+        hovermode="x unified",
+        height=500,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Relative performance versus the benchmark
+    st.subheader(f"Relative Performance vs {benchmark}")
+
+    relative = calculate_relative_performance(prices, benchmark, base_date)
+
+    fig = go.Figure()
+    for ticker in relative.columns.drop(benchmark):
+        fig.add_trace(line_trace(
+            x=relative.index,
+            y=relative[ticker],
+            mode='lines',
+            name=ticker
+        ))
+
+    fig.update_layout(
+        yaxis_title="Out/Underperformance (%)",
+        hovermode="x unified",
+        height=400,
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Rolling beta and correlation
+    beta, correlation = calculate_rolling_statistics(prices, benchmark, window=window)
+
+    if beta is None:
+        st.info(f"Not enough data for a {window}-day rolling window. Choose a longer time period.")
+    else:
+        col1, col2 = st.columns(2)
+        others = beta.columns.drop(benchmark)
+
+        with col1:
+            st.subheader(f"Rolling Beta ({window}d)")
+            fig = go.Figure()
+            for ticker in others:
+                fig.add_trace(line_trace(x=beta.index, y=beta[ticker], mode='lines', name=ticker))
+            fig.update_layout(height=350, hovermode="x unified", margin=dict(l=0, r=0, t=30, b=0))
+            st.plotly_chart(fig, use_container_width=True)
+
+        with col2:
+            st.subheader(f"Rolling Correlation ({window}d)")
+            fig = go.Figure()
+            for ticker in others:
+                fig.add_trace(line_trace(x=correlation.index, y=correlation[ticker], mode='lines', name=ticker))
+            fig.update_layout(height=350, hovermode="x unified", yaxis=dict(range=[-1, 1]), margin=dict(l=0, r=0, t=30, b=0))
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Correlation matrix of daily returns
+    st.subheader("Return Correlation Matrix")
+
+    corr_matrix = prices.pct_change().iloc[1:].corr()
+
+    fig = go.Figure(go.Heatmap(
+        z=corr_matrix.to_numpy(),
+        x=corr_matrix.columns,
+        y=corr_matrix.index,
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        text=corr_matrix.round(2).to_numpy(),
+        texttemplate="%{text}"
+    ))
+    fig.update_layout(height=max(300, 30 * len(corr_matrix)), margin=dict(l=0, r=0, t=30, b=0))
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Summary table
+    st.subheader("Summary")
+    st.dataframe(get_comparison_summary(prices, benchmark), use_container_width=True)
+
+    # Add a disclaimer
+    st.markdown("---")
+    st.caption("**Disclaimer:** Past performance does not guarantee future results. This comparison is for informational purposes only.")
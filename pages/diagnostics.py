@@ -0,0 +1,78 @@
+import pandas as pd
+import streamlit as st
+from utils.cache import get_cache_stats, clear_all_caches
+from utils.instrumentation import INSTRUMENTATION_ENABLED, DIAGNOSTICS_ENABLED, get_span_stats, reset_spans
+from utils.warmup import start_cache_warmup
+
+def show():
+    """
+    Display hot-path timings, cache statistics and the cache warm-up status
+
+    Not listed in the navigation; open it with ?page=Diagnostics when the
+    DIAGNOSTICS_ENABLED environment variable is set.
+    """
+    st.title("🩺 Diagnostics")
+    if not DIAGNOSTICS_ENABLED:
+        st.error("The diagnostics page is disabled (set DIAGNOSTICS_ENABLED=1).")
+        return
+
+    show_spans()
+    show_cache_stats()
+    show_warmup_status()
+
+def show_spans():
+    """
+    Display the latency percentiles of every timing span
+    """
+    st.subheader("Timing Spans")
+    if not INSTRUMENTATION_ENABLED:
+        st.info("Instrumentation is disabled (INSTRUMENTATION_ENABLED=0).")
+        return
+
+    spans = get_span_stats()
+    if not spans:
+        st.info("No spans recorded yet in this process.")
+    else:
+        st.caption("Percentiles over each span's most recent calls. fetch spans time upstream requests; "
+                   "load and compute spans time cache misses end to end.")
+        st.dataframe(pd.DataFrame(spans).set_index("name"), use_container_width=True)
+
+    # Callbacks run before the rerun the click causes, so the tables are already fresh
+    st.button("Reset spans", on_click=reset_spans)
+
+def show_cache_stats():
+    """
+    Display the footprint and hit rate of every budgeted cache
+    """
+    st.subheader("Caches")
+    stats = get_cache_stats()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Used", f"{stats['used_bytes'] / 1024 ** 2:.1f} MB")
+    col2.metric("Budget", f"{stats['budget_bytes'] / 1024 ** 2:.0f} MB")
+    col3.metric("Entries", sum(c["entries"] for c in stats["caches"]))
+
+    caches = pd.DataFrame(stats["caches"])
+    if not caches.empty:
+        lookups = caches["hits"] + caches["misses"]
+        caches["hit_rate"] = (caches["hits"] / lookups.where(lookups > 0)).round(3)
+        caches["kb"] = (caches.pop("bytes") / 1024).round(1)
+        st.dataframe(caches.set_index("name"), use_container_width=True)
+
+    st.button("Clear all caches", on_click=clear_all_caches, help="Drops the cached data of every session of this process")
+
+def show_warmup_status():
+    """
+    Display the progress of the background cache warm-up
+    """
+    st.subheader("Cache Warm-up")
+    warmup = start_cache_warmup()
+    if warmup is None:
+        st.info("Cache warm-up is disabled (WARMUP_ENABLED=0).")
+        return
+
+    status = warmup.status()
+    state = "done" if status["ready"] else "running"
+    st.write(f"{state.capitalize()}: {status['done']}/{status['total']} tickers in {status['elapsed']}s")
+    if status["failed"]:
+        st.warning(f"Failed tickers: {', '.join(status['failed'])}")
@@ -1,9 +1,14 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-from utils.stock_data import get_stock_data, get_stock_info, get_available_tickers
-from utils.technical_analysis import calculate_indicators
-from assets.stock_images import get_stock_image_url
+from utils.stock_data import get_stock_data_batch, get_stock_info, get_available_tickers
+from utils.technical_analysis import get_stock_indicators
+from utils.downsample import downsample_ohlc, downsample_lines
+from utils.charts import get_line_trace, get_price_change, build_sparkline_strip
+from assets.stock_images import show_stock_image
+
+def go_to_page(page):
+    """Switch the sidebar navigation before the rerun caused by a button click"""
+    st.session_state.tab = page
 
 def show():
     """
@@ -18,47 +23,51 @@ def show():
     col1, col2 = st.columns([7, 3])
     
     with col1:
-        # Display main stock chart
-        stock_data = get_stock_data(ticker, period=period)
+        # Display main stock chart with indicators
+        data_with_indicators = get_stock_indicators(ticker, period=period)
         
-        if stock_data is not None and not stock_data.empty:
-            # Calculate indicators
-            data_with_indicators = calculate_indicators(stock_data)
+        if data_with_indicators is not None and not data_with_indicators.empty:
+            # Reduce the points sent to the browser to roughly one per pixel
+            candles = downsample_ohlc(data_with_indicators)
+            lines = downsample_lines(data_with_indicators, ['SMA20', 'SMA50'])
+            
+            # Dense line overlays are drawn with WebGL
+            line_trace = get_line_trace(len(data_with_indicators))
             
             # Create price chart with volume
             fig = go.Figure()
             
             # Add candlestick chart
             fig.add_trace(go.Candlestick(
-                x=data_with_indicators.index,
-                open=data_with_indicators['Open'],
-                high=data_with_indicators['High'],
-                low=data_with_indicators['Low'],
-                close=data_with_indicators['Close'],
+                x=candles.index,
+                open=candles['Open'],
+                high=candles['High'],
+                low=candles['Low'],
+                close=candles['Close'],
                 name='Price'
             ))
             
             # Add volume chart as a separate subplot
             fig.add_trace(go.Bar(
-                x=data_with_indicators.index,
-                y=data_with_indicators['Volume'],
+                x=candles.index,
+                y=candles['Volume'],
                 name='Volume',
                 marker_color='rgba(0, 0, 255, 0.3)',
                 yaxis='y2'
             ))
             
             # Add SMA lines
-            fig.add_trace(go.Scatter(
-                x=data_with_indicators.index,
-                y=data_with_indicators['SMA20'],
+            fig.add_trace(line_trace(
+                x=lines['SMA20'].index,
+                y=lines['SMA20'],
                 mode='lines',
                 name='SMA 20',
                 line=dict(color='rgba(255, 165, 0, 0.8)')
             ))
             
-            fig.add_trace(go.Scatter(
-                x=data_with_indicators.index,
-                y=data_with_indicators['SMA50'],
+            fig.add_trace(line_trace(
+                x=lines['SMA50'].index,
+                y=lines['SMA50'],
                 mode='lines',
                 name='SMA 50',
                 line=dict(color='rgba(255, 0, 0, 0.8)')
@@ -102,8 +111,8 @@ def show():
             
         else:
             st.error(f"Could not retrieve data for {ticker}. Please check if the ticker symbol is correct.")
-            # Display a stock market image
-            st.image(get_stock_image_url('chart', 0), use_column_width=True)
+            # Display a stock market image (resized local copy, served as a static file)
+            show_stock_image('chart', 0)
     
     with col2:
         # Display stock information
@@ -155,56 +164,47 @@ def show():
             # Show "View More" buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button("Analysis", key="home_analysis"):
-                    st.session_state.tab = "Stock Analysis"
-                    st.rerun()
+                st.button("Analysis", key="home_analysis", on_click=go_to_page, args=("Stock Analysis",))
             with col2:
-                if st.button("Company Info", key="home_company"):
-                    st.session_state.tab = "Company Info"
-                    st.rerun()
+                st.button("Company Info", key="home_company", on_click=go_to_page, args=("Company Info",))
         else:
             st.error(f"Could not retrieve information for {ticker}.")
             
     # Display popular stocks section
+    show_popular_stocks()
+    
+    # Display a disclaimer
+    st.markdown("---")
+    st.caption("Disclaimer: This information is for educational purposes only and not financial advice.")
+
+@st.fragment
+def show_popular_stocks():
+    """
+    Display the popular stocks strip
+    """
     st.markdown("---")
     st.subheader("Popular Stocks")
     
     # Get list of popular tickers
     popular_tickers = get_available_tickers()[:5]
     
-    # Create columns for popular stocks
+    # One batched fetch and one figure for the whole strip
+    prices = get_stock_data_batch(popular_tickers, period="5d")
+    
+    st.plotly_chart(build_sparkline_strip(prices), use_container_width=True)
+    
+    # Create columns for the price labels under each sparkline
     cols = st.columns(len(popular_tickers))
     
     for i, pop_ticker in enumerate(popular_tickers):
         with cols[i]:
-            pop_data = get_stock_data(pop_ticker, period="5d")
+            pop_data = prices[pop_ticker]
             if pop_data is not None and not pop_data.empty:
-                # Calculate price change
-                last_price = pop_data['Close'].iloc[-1]
-                prev_price = pop_data['Close'].iloc[-2] if len(pop_data) > 1 else last_price
-                price_change_pct = ((last_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
+                last_price, price_change_pct = get_price_change(pop_data)
                 
                 color = "green" if price_change_pct >= 0 else "red"
                 change_prefix = "+" if price_change_pct >= 0 else ""
                 
-                # Create a simple line chart
-                fig = px.line(pop_data, x=pop_data.index, y='Close', title=pop_ticker)
-                fig.update_layout(
-                    height=100,
-                    margin=dict(l=0, r=0, t=30, b=0),
-                    showlegend=False,
-                    xaxis=dict(showticklabels=False),
-                    yaxis=dict(showticklabels=False)
-                )
-                
-                # Color the line based on trend
-                fig.update_traces(line_color=color)
-                
-                st.plotly_chart(fig, use_container_width=True)
                 st.markdown(f"**{pop_ticker}**: ${last_price:.2f} <span style='color:{color};'>({change_prefix}{price_change_pct:.2f}%)</span>", unsafe_allow_html=True)
             else:
                 st.write(f"{pop_ticker}: No data")
-                
-    # Display a disclaimer
-    st.markdown("---")
-    st.caption("Disclaimer: This information is for educational purposes only and not financial advice.")
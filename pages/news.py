@@ -1,6 +1,18 @@
+import sqlite3
 import streamlit as st
-from utils.generate_sample_news import get_sample_news
-import time
+from utils.news import get_stock_news
+from utils.news_item import format_relative_times
+from utils.sentiment import get_sentiment_label
+from datetime import datetime, time
+from utils.news_store import get_news_page, search_news, get_publishers
+
+# Articles per page; older pages are read from the local news store
+PAGE_SIZE = 10
+
+def load_older_news(ticker):
+    """Show one more page of stored news for the ticker"""
+    key = f"news_pages_{ticker}"
+    st.session_state[key] = st.session_state.get(key, 1) + 1
 
 def show():
     """
@@ -10,31 +22,97 @@ def show():
     
     st.title(f"📰 Latest News: {ticker}")
     
-    # Add a refresh button
+    show_news_search(ticker)
+    
+    show_news_list(ticker)
+
+@st.fragment
+def show_news_search(ticker):
+    """
+    Search all stored news by keyword, publisher and date range
+    
+    Answered from the local inverted index, so no source is queried.
+    """
+    with st.expander("🔍 Search stored news"):
+        try:
+            publishers = get_publishers()
+        except sqlite3.Error as e:
+            st.warning(f"News search is unavailable: {e}")
+            return
+        
+        col1, col2, col3 = st.columns([3, 2, 2])
+        
+        with col1:
+            query = st.text_input("Keywords", key="news_search_query")
+        with col2:
+            publisher = st.selectbox("Publisher", options=["All"] + publishers, key="news_search_publisher")
+        with col3:
+            dates = st.date_input("Published between", value=(), key="news_search_dates")
+        
+        all_tickers = st.checkbox("Search all tickers", value=True, key="news_search_all")
+        
+        if not (query or publisher != "All" or len(dates) == 2):
+            return
+        
+        results = search_news(
+            query=query or None,
+            tickers=None if all_tickers else [ticker],
+            publisher=None if publisher == "All" else publisher,
+            start=datetime.combine(dates[0], time.min) if len(dates) == 2 else None,
+            end=datetime.combine(dates[1], time.max) if len(dates) == 2 else None,
+            limit=50
+        )
+        
+        if not results:
+            st.info("No stored articles match the search.")
+        for news, published in zip(results, format_relative_times(results)):
+            st.markdown(f"**[{news.title}]({news.link})**" if news.has_link else f"**{news.title}**")
+            st.caption(f"{news.publisher} - {published}")
+
+@st.fragment
+def show_news_list(ticker):
+    """
+    Display the news articles for a ticker
+    
+    Runs as a fragment, so Refresh only reloads the list.
+    """
+    # Add a refresh button that bypasses the news cache
     if st.button("🔄 Refresh News"):
-        st.rerun()
+        get_stock_news.clear()
     
     # Show a loading spinner while fetching news
     with st.spinner(f"Fetching latest news for {ticker}..."):
-        # Get sample news directly since APIs are having issues
-        news_items = get_sample_news(ticker, limit=10)
+        news_items = get_stock_news(ticker, limit=PAGE_SIZE)
+    
+    # Older pages never go upstream
+    pages = st.session_state.get(f"news_pages_{ticker}", 1)
+    if pages > 1 and any(news.source for news in news_items):
+        news_items = news_items + get_news_page(ticker, limit=PAGE_SIZE * (pages - 1), offset=PAGE_SIZE)
     
     if not news_items:
         st.info(f"No news articles found for {ticker}. Try another stock symbol or check back later.")
         return
+    if not any(news.source for news in news_items):
+        st.warning("Unable to fetch real-time news. Showing sample headlines.")
     
     # Display news articles
-    for i, news in enumerate(news_items):
+    for i, (news, published) in enumerate(zip(news_items, format_relative_times(news_items))):
         with st.container():
             col1, col2 = st.columns([4, 1])
             
             with col1:
-                st.subheader(news['title'])
-                st.caption(f"Published by {news['publisher']} - {news['published']}")
-                st.write(news['summary'])
+                st.subheader(news.title)
+                caption = f"Published by {news.publisher} - {published}"
+                if news.sentiment is not None:
+                    caption += f" - Sentiment: {get_sentiment_label(news.sentiment)} ({news.sentiment:+.2f})"
+                st.caption(caption)
+                st.write(news.summary)
                 
-                # Create a button to read the full article (disabled for sample news)
-                st.button(f"Read full article", key=f"read_{i}", disabled=True)
+                # Link to the full article (disabled for sample news)
+                if news.has_link:
+                    st.link_button("Read full article", news.link)
+                else:
+                    st.button(f"Read full article", key=f"read_{i}", disabled=True)
             
             with col2:
                 # Since we can't display actual images, show a placeholder or icon
@@ -42,5 +120,10 @@ def show():
             
             st.markdown("---")
     
-    # Add a disclaimer
-    st.caption("**Note:** Sample news headlines are shown. Real-time news integration is under maintenance.")
+    # Offer older stored articles while the last page was full
+    if len(news_items) == PAGE_SIZE * pages and any(news.source for news in news_items):
+        st.button("Load older news", on_click=load_older_news, args=(ticker,))
+    
+    # Add a disclaimer when the sources were unavailable
+    if not any(news.source for news in news_items):
+        st.caption("**Note:** Sample news headlines are shown because no news source responded in time.")
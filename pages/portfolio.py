@@ -0,0 +1,161 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from utils.portfolio import (
+    load_watchlist,
+    save_watchlist,
+    normalize_weights,
+    get_portfolio_prices,
+    get_portfolio_fundamentals,
+    calculate_weighted_fundamentals,
+    PortfolioRiskModel
+)
+from utils.news import get_stock_news_many
+from utils.news_item import format_relative_times
+
+# Articles shown in the merged watchlist news feed
+WATCHLIST_NEWS_LIMIT = 20
+
+def show():
+    """
+    Display the portfolio / watchlist analytics page
+    """
+    st.title("💼 Portfolio Analytics")
+
+    period = st.session_state.time_period
+
+    if 'watchlist' not in st.session_state:
+        st.session_state.watchlist = load_watchlist()
+
+    # Watchlist editor
+    st.subheader("Watchlist")
+
+    watchlist_df = pd.DataFrame({
+        "Ticker": list(st.session_state.watchlist.keys()),
+        "Weight": list(st.session_state.watchlist.values())
+    })
+
+    edited_df = st.data_editor(
+        watchlist_df,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Ticker": st.column_config.TextColumn("Ticker", required=True),
+            "Weight": st.column_config.NumberColumn("Weight", min_value=0.0, step=0.01, default=0.0)
+        },
+        key="watchlist_editor"
+    )
+
+    watchlist = {}
+    for _, row in edited_df.dropna(subset=["Ticker"]).iterrows():
+        ticker = str(row["Ticker"]).strip().upper()
+        if ticker:
+            watchlist[ticker] = float(row["Weight"]) if pd.notna(row["Weight"]) else 0.0
+    st.session_state.watchlist = watchlist
+
+    if st.button("💾 Save Watchlist"):
+        save_watchlist(watchlist)
+        st.success("Watchlist saved.")
+
+    if not watchlist:
+        st.info("Add at least one position to the watchlist.")
+        return
+
+    weights = normalize_weights(watchlist)
+
+    with st.spinner(f"Fetching data for {len(weights)} positions..."):
+        prices = get_portfolio_prices(list(weights.keys()), period=period)
+
+    if prices is None or len(prices) < 3:
+        st.error("Could not retrieve enough overlapping price data for the watchlist.")
+        return
+
+    missing = [t for t in weights if t not in prices.columns]
+    if missing:
+        st.warning(f"No data found for: {', '.join(missing)}")
+        weights = normalize_weights({t: w for t, w in watchlist.items() if t in prices.columns})
+
+    # Reuse the risk model across reruns so only the changed parts are recomputed
+    model = st.session_state.get('portfolio_risk_model')
+    if model is None:
+        model = PortfolioRiskModel(prices, weights)
+    else:
+        model.update(prices, weights)
+    st.session_state.portfolio_risk_model = model
+
+    # Risk metrics
+    st.subheader("Risk Metrics")
+
+    metrics = model.get_metrics()
+    cols = st.columns(len(metrics))
+    for col, (name, value) in zip(cols, metrics.items()):
+        col.metric(name, f"{value:.2%}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### Drawdown")
+        drawdown = model.get_drawdown_series()
+        fig = go.Figure(go.Scatter(
+            x=drawdown.index,
+            y=drawdown * 100,
+            fill='tozeroy',
+            mode='lines',
+            name='Drawdown',
+            line=dict(color='rgba(255, 0, 0, 0.8)')
+        ))
+        fig.update_layout(height=350, yaxis_title="Drawdown (%)", margin=dict(l=0, r=0, t=30, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("#### Risk Contribution")
+        contributions = model.get_risk_contributions()
+        fig = go.Figure(go.Bar(
+            x=contributions.index,
+            y=contributions * 100,
+            marker_color='rgba(0, 0, 255, 0.6)'
+        ))
+        fig.update_layout(height=350, yaxis_title="Share of Variance (%)", margin=dict(l=0, r=0, t=30, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Covariance matrix
+    st.subheader("Annualized Covariance Matrix")
+    covariance = model.get_covariance()
+    fig = go.Figure(go.Heatmap(
+        z=covariance.to_numpy(),
+        x=covariance.columns,
+        y=covariance.index,
+        colorscale='Blues',
+        text=covariance.round(4).to_numpy(),
+        texttemplate="%{text}"
+    ))
+    fig.update_layout(height=max(300, 30 * len(covariance)), margin=dict(l=0, r=0, t=30, b=0))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Weighted fundamentals
+    st.subheader("Weighted Fundamentals")
+
+    fundamentals = get_portfolio_fundamentals(model.tickers)
+    weighted = calculate_weighted_fundamentals(fundamentals, weights)
+
+    table = fundamentals.copy()
+    table.loc["Portfolio"] = weighted
+    st.dataframe(table.round(4), use_container_width=True)
+
+    # Merged news feed, fetched for all positions in one batched request
+    st.subheader("Watchlist News")
+
+    with st.spinner(f"Fetching news for {len(model.tickers)} positions..."):
+        news_items = get_stock_news_many(model.tickers)
+
+    if not news_items:
+        st.info("No news found for the watchlist.")
+    news_items = news_items[:WATCHLIST_NEWS_LIMIT]
+    for news, published in zip(news_items, format_relative_times(news_items)):
+        title = f"[{news.title}]({news.link})" if news.has_link else news.title
+        st.markdown(f"**{title}**  \n{' '.join(f'`{t}`' for t in news.tickers)} {news.publisher} - {published}")
+
+    # Add a disclaimer
+    st.markdown("---")
+    st.caption("**Disclaimer:** Risk metrics are estimated from historical prices and do not predict future losses.")
@@ -0,0 +1,71 @@
+import threading
+import pandas as pd
+import pytest
+from utils.cache import BudgetedCache, MemoryBudget, memory_cache
+from utils.comparison import get_price_matrix
+from utils.stock_data import get_stock_data
+
+@pytest.fixture
+def primed_stock_data():
+    """Prime get_stock_data with two small frames, dropping them (and what was derived from them) afterwards"""
+    index = pd.date_range("2024-01-02 16:00", periods=5, freq="D")
+    frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0, 5.0]}, index=index)
+    get_stock_data.prime(frame, "AAA", period="test")
+    get_stock_data.prime(frame.copy(), "BBB", period="test")
+    yield frame
+    get_stock_data.clear()
+    get_price_matrix.clear()
+
+def test_concurrent_hits_and_evictions():
+    # A budget that only fits a few entries, so hits race with evictions
+    budget = MemoryBudget(4096)
+    cache = BudgetedCache("test", budget=budget)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2000):
+                key = (offset + i) % 50
+                hit, _ = cache.get(key)
+                if not hit:
+                    cache.set(key, b"x" * 512)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.bytes == sum(entry[1] for entry in cache.entries.values())
+
+def test_price_matrix_leaves_cached_frames_unchanged(primed_stock_data):
+    get_price_matrix(("AAA", "BBB"), period="test")
+
+    _, cached = get_stock_data.lookup("AAA", period="test")
+    assert cached["Close"].index.equals(primed_stock_data.index)
+
+def test_mutating_a_returned_frame_leaves_the_cache_unchanged(primed_stock_data):
+    expected = primed_stock_data.copy()
+    data = get_stock_data("AAA", period="test")
+    data["Close"] *= 2
+    data.iloc[0, 0] = -1.0
+    data["SMA"] = data["Close"]
+
+    pd.testing.assert_frame_equal(get_stock_data("AAA", period="test"), expected)
+
+def test_failures_are_reported_on_every_call_and_not_cached():
+    errors, calls = [], []
+
+    @memory_cache(on_error=errors.append)
+    def flaky(x):
+        calls.append(x)
+        raise RuntimeError("upstream down")
+
+    assert flaky(1) is None
+    assert flaky(1) is None
+
+    assert len(calls) == 2
+    assert [str(e) for e in errors] == ["upstream down"] * 2
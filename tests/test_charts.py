@@ -0,0 +1,18 @@
+from utils.charts import get_data_version
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers
+
+def test_data_version_changes_on_back_adjustment():
+    prices = SyntheticMarket(seed=1).history(synthetic_tickers(1, seed=1)[0], period="1y")
+    adjusted = prices.copy()
+    # A dividend adjustment scales every bar before the ex-date; the last close is unchanged
+    adjusted.iloc[:100, adjusted.columns.get_loc("Close")] *= 0.99
+
+    assert get_data_version(prices) == get_data_version(prices.copy())
+    assert get_data_version(adjusted) != get_data_version(prices)
+
+def test_data_version_changes_on_any_column():
+    prices = SyntheticMarket(seed=1).history(synthetic_tickers(1, seed=1)[0], period="1y")
+    revised = prices.copy()
+    revised.iloc[-1, revised.columns.get_loc("High")] += 1
+
+    assert get_data_version(revised) != get_data_version(prices)
@@ -0,0 +1,22 @@
+from utils.cache import clear_all_caches
+from utils.instrumentation import get_span_histograms, reset_spans
+from utils.metrics import render_metrics
+from utils.stock_data import get_stock_data
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers, use_synthetic_data
+
+def test_one_upstream_request_is_exported_once(tmp_path):
+    ticker = synthetic_tickers(1)[0]
+    with use_synthetic_data(SyntheticMarket(), data_dir=str(tmp_path)):
+        clear_all_caches()
+        reset_spans()
+        get_stock_data(ticker, period="1y")
+
+    counts = {hist["name"]: hist["count"] for hist in get_span_histograms()}
+    assert [name for name in counts if name.startswith("fetch.")] == ["fetch.download_history"]
+    assert counts["fetch.download_history"] == 1
+    assert counts["load.get_stock_data"] == counts["load.get_stored_history"] == 1
+
+    metrics = render_metrics()
+    assert 'stock_app_upstream_fetch_seconds_count{function="download_history"} 1' in metrics
+    assert 'function="get_stock_data"' not in metrics
+    assert 'stock_app_upstream_in_flight{function="download_history"} 0' in metrics
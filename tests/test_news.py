@@ -0,0 +1,41 @@
+import time
+import utils.news
+from utils.news import fetch_news_concurrently
+from utils.news_item import NewsItem
+
+def make_source(title, delay):
+    def source(ticker, limit):
+        time.sleep(delay)
+        return [NewsItem(title, "Wire", f"https://news.example.com/{title}", int(time.time()), "")]
+    return source
+
+def test_slow_source_is_dropped_after_the_timeout(monkeypatch):
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "fast", make_source("fast", 0.0))
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "slow", make_source("slow", 1.0))
+
+    start = time.monotonic()
+    items = fetch_news_concurrently("AAPL", limit=10, sources=["slow", "fast"], timeout=0.2)
+
+    assert time.monotonic() - start < 0.5
+    assert [(item.title, item.source) for item in items] == [("fast", "fast")]
+
+def test_answers_are_taken_in_completion_order(monkeypatch):
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "fast", make_source("fast", 0.0))
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "slow", make_source("slow", 1.0))
+
+    # The slow source has priority, but the fast one already fills the limit
+    start = time.monotonic()
+    items = fetch_news_concurrently("AAPL", limit=1, sources=["slow", "fast"], timeout=5, deadline=5)
+
+    assert time.monotonic() - start < 0.5
+    assert [item.title for item in items] == ["fast"]
+
+def test_deadline_caps_the_source_timeouts(monkeypatch):
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "fast", make_source("fast", 0.0))
+    monkeypatch.setitem(utils.news.NEWS_SOURCE_FUNCTIONS, "slow", make_source("slow", 1.0))
+
+    start = time.monotonic()
+    items = fetch_news_concurrently("AAPL", limit=10, sources=["fast", "slow"], timeout=5, deadline=0.2)
+
+    assert time.monotonic() - start < 0.5
+    assert [item.title for item in items] == ["fast"]
@@ -0,0 +1,49 @@
+import time
+import pytest
+from utils.news_item import NewsItem
+from utils.news_store import connect, ingest_news, search_news
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "news.db"))
+    yield conn
+    conn.close()
+
+def make_item(n, title, published_ts):
+    return NewsItem(title, "Wire", f"https://news.example.com/{n}", published_ts, "")
+
+def test_search_by_tickers_returns_shared_articles_once(conn):
+    now = int(time.time())
+    shared = make_item(1, "Chip alliance announced", now - 60)
+    ingest_news("AAPL", "test", [shared, make_item(2, "Apple earnings", now - 120)], conn=conn)
+    # The same article from another source, with a slightly different publish time
+    ingest_news("MSFT", "other", [make_item(1, "Chip alliance announced", now - 50)], conn=conn)
+
+    results = search_news(tickers=["AAPL", "MSFT"], conn=conn)
+
+    assert [item.title for item in results] == ["Chip alliance announced", "Apple earnings"]
+    assert [item.title for item in search_news("chip", tickers=["AAPL", "MSFT"], conn=conn)] == ["Chip alliance announced"]
+
+def test_filters_match_articles_posted_later_by_another_source(conn):
+    now = int(time.time())
+    ingest_news("AAPL", "test", [make_item(1, "Chip alliance announced", now - 60)], conn=conn)
+    ingest_news("MSFT", "other", [make_item(1, "Chip alliance announced", now - 50)], conn=conn)
+
+    # Keyword scan probing the ticker, and publisher scan probing the ticker
+    assert [item.title for item in search_news("chip", tickers=["MSFT"], conn=conn)] == ["Chip alliance announced"]
+    assert [item.title for item in search_news(tickers=["MSFT"], publisher="wire", conn=conn)] == ["Chip alliance announced"]
+    assert [item.title for item in search_news("alliance chip", tickers=["MSFT"], conn=conn)] == ["Chip alliance announced"]
+
+def test_reingest_does_not_rescore(conn, monkeypatch):
+    import utils.news_store
+    now = int(time.time())
+    items = [make_item(n, f"Headline {n} beats estimates", now - n * 60) for n in range(5)]
+    ingest_news("AAPL", "test", items, conn=conn)
+
+    scored = []
+    monkeypatch.setattr(utils.news_store, "score_article", lambda *args: scored.append(args) or 0.0)
+    assert ingest_news("AAPL", "test", items, conn=conn) == 0
+    assert ingest_news("MSFT", "test", items, conn=conn) == 0
+
+    assert scored == []
+    assert all(item.sentiment > 0 for item in search_news(tickers=["MSFT"], conn=conn))
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.portfolio import PortfolioRiskModel
+
+WEIGHTS = {"AAA": 0.5, "BBB": 0.3, "CCC": 0.2}
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.01, size=(120, len(WEIGHTS)))
+    dates = pd.bdate_range("2024-01-01", periods=len(returns))
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=dates, columns=list(WEIGHTS))
+
+def assert_matches_fresh_model(model, prices, weights):
+    fresh = PortfolioRiskModel(prices, weights)
+    for name, value in fresh.get_metrics().items():
+        assert model.get_metrics()[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+    pd.testing.assert_frame_equal(model.get_covariance(), fresh.get_covariance())
+    pd.testing.assert_series_equal(model.get_drawdown_series(), fresh.get_drawdown_series(), check_freq=False)
+
+def test_changed_last_bar(prices):
+    model = PortfolioRiskModel(prices, WEIGHTS)
+    revised = prices.copy()
+    revised.iloc[-1] *= 1.05
+
+    model.update(revised, WEIGHTS)
+
+    assert_matches_fresh_model(model, revised, WEIGHTS)
+
+def test_changed_last_bar_then_appended_days(prices):
+    model = PortfolioRiskModel(prices.iloc[:100], WEIGHTS)
+    revised = prices.copy()
+    revised.iloc[99] *= 0.97
+
+    model.update(revised, WEIGHTS)
+
+    assert_matches_fresh_model(model, revised, WEIGHTS)
+
+def test_readjusted_history_rebuilds(prices):
+    model = PortfolioRiskModel(prices, WEIGHTS)
+    # A dividend back-adjustment rewrites every close before the ex-date but not the last one
+    adjusted = prices.copy()
+    adjusted.iloc[:60, 0] *= 0.98
+
+    model.update(adjusted, WEIGHTS)
+
+    assert_matches_fresh_model(model, adjusted, WEIGHTS)
+
+def test_appended_days_and_positions(prices):
+    model = PortfolioRiskModel(prices.iloc[:100, :2], {"AAA": 0.6, "BBB": 0.4})
+    model.update(prices.iloc[:110], WEIGHTS)
+    model.update(prices.iloc[:115, [0, 2]], {"AAA": 0.5, "CCC": 0.5})
+
+    assert_matches_fresh_model(model, prices.iloc[:115, [0, 2]], {"AAA": 0.5, "CCC": 0.5})
+
+def test_rolling_window_updates_without_rebuild(prices, monkeypatch):
+    model = PortfolioRiskModel(prices.iloc[:100], WEIGHTS)
+
+    def rebuild(*args):
+        raise AssertionError("full rebuild")
+
+    monkeypatch.setattr(model, "_rebuild", rebuild)
+    # The window moves forward by one day, then by five
+    model.update(prices.iloc[1:101], WEIGHTS)
+    assert_matches_fresh_model(model, prices.iloc[1:101], WEIGHTS)
+    model.update(prices.iloc[6:106], WEIGHTS)
+
+    assert_matches_fresh_model(model, prices.iloc[6:106], WEIGHTS)
@@ -0,0 +1,68 @@
+import pytest
+import utils.precompute
+from utils.precompute import precompute_ticker, run_precompute, format_report
+from utils.precomputed_store import load_precomputed_indicators
+from utils.synthetic_data import SyntheticMarket, synthetic_tickers, use_synthetic_data
+
+@pytest.fixture
+def market(tmp_path):
+    with use_synthetic_data(SyntheticMarket(seed=3), data_dir=str(tmp_path)):
+        yield
+
+def fail(*args, **kwargs):
+    raise RuntimeError("upstream down")
+
+def test_failed_ratios_keep_indicators(market, monkeypatch):
+    ticker = synthetic_tickers(1, seed=3)[0]
+    monkeypatch.setattr(utils.precompute, "fetch_financial_ratios", fail)
+
+    result = precompute_ticker(ticker)
+
+    assert result["error"] is None
+    assert result["ratios_error"] == "upstream down"
+    assert load_precomputed_indicators(ticker, "1y") is not None
+
+def test_failed_ratios_write_is_reported(market, monkeypatch):
+    tickers = synthetic_tickers(2, seed=3)
+    monkeypatch.setattr(utils.precompute, "save_precomputed_ratios", fail)
+
+    summary = run_precompute(tickers, workers=1)
+
+    assert summary["succeeded"] == 2
+    assert summary["ratios_write_error"] == "upstream down"
+    assert "RATIOS NOT SAVED: upstream down" in format_report(summary)
+
+def test_precomputed_indicators_are_used_while_they_match_live_prices(market, monkeypatch):
+    import utils.technical_analysis
+    from utils.cache import clear_all_caches
+    from utils.technical_analysis import get_stock_indicators
+
+    ticker = synthetic_tickers(1, seed=3)[0]
+    precompute_ticker(ticker)
+    clear_all_caches()
+    live = utils.technical_analysis.get_stock_data(ticker, period="1y")
+    monkeypatch.setattr(utils.technical_analysis, "calculate_indicators", lambda df: "computed")
+
+    assert get_stock_indicators(ticker).index.equals(live.index)
+
+    # A new or revised bar makes the precomputed file stale
+    revised = live.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] += 1
+    monkeypatch.setattr(utils.technical_analysis, "get_stock_data", lambda *args, **kwargs: revised)
+    assert get_stock_indicators(ticker) == "computed"
+
+def test_warmup_fills_the_price_cache_when_indicators_are_precomputed(market, monkeypatch):
+    import utils.technical_analysis
+    from utils.cache import clear_all_caches
+    from utils.stock_data import get_stock_data
+    from utils.warmup import warm_ticker
+
+    ticker = synthetic_tickers(1, seed=3)[0]
+    precompute_ticker(ticker)
+    clear_all_caches()
+    monkeypatch.setattr(utils.technical_analysis, "calculate_indicators", fail)
+
+    assert warm_ticker(ticker, "1y")
+
+    assert get_stock_data.lookup(ticker, period="1y")[0]
+    assert utils.technical_analysis.get_precomputed_indicators.lookup(ticker, "1y")[0]
@@ -0,0 +1,57 @@
+import os
+import pytest
+
+# The background cache warm-up would run against the patched data outside the test
+os.environ.setdefault("WARMUP_ENABLED", "0")
+
+from streamlit.testing.v1 import AppTest
+from utils.synthetic_data import SyntheticMarket, use_synthetic_data
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+@pytest.fixture
+def app(tmp_path):
+    with use_synthetic_data(SyntheticMarket(seed=7), data_dir=str(tmp_path)):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        assert not at.exception
+        yield at
+
+def assert_one_run(at, interaction):
+    before = at.session_state.run_count
+    interaction()
+    assert not at.exception
+    assert at.session_state.run_count == before + 1
+
+def test_symbol_change_runs_once(app):
+    assert_one_run(app, lambda: app.sidebar.text_input[0].input("msft").run())
+    assert app.session_state.selected_stock == "MSFT"
+
+def test_period_change_runs_once(app):
+    assert_one_run(app, lambda: app.sidebar.selectbox[0].select("5y").run())
+    assert app.session_state.time_period == "5y"
+
+def test_page_change_runs_once(app):
+    assert_one_run(app, lambda: app.sidebar.radio[0].set_value("News").run())
+    assert app.session_state.tab == "News"
+
+def test_home_button_runs_once(app):
+    assert_one_run(app, lambda: app.button(key="home_analysis").click().run())
+    assert app.session_state.tab == "Stock Analysis"
+    assert app.sidebar.radio[0].value == "Stock Analysis"
+
+def test_diagnostics_buttons_run_once(app, monkeypatch):
+    import pages.diagnostics
+    import utils.instrumentation
+    monkeypatch.setattr(utils.instrumentation, "DIAGNOSTICS_ENABLED", True)
+    monkeypatch.setattr(pages.diagnostics, "DIAGNOSTICS_ENABLED", True)
+    app.query_params["page"] = "Diagnostics"
+    app.run()
+
+    assert_one_run(app, lambda: app.button[0].click().run())
+    assert_one_run(app, lambda: app.button[1].click().run())
+
+def test_diagnostics_page_is_off_by_default(app):
+    app.query_params["page"] = "Diagnostics"
+    app.run()
+    assert [title.value for title in app.title if "Diagnostics" in title.value] == []
@@ -0,0 +1,12 @@
+from benchmarks.bench_startup import get_shell_imports, measure
+
+def test_shell_imports_follow_app_py():
+    imports = get_shell_imports()
+    assert "streamlit" in imports
+    assert "utils.warmup" in imports
+    # Imported behind its env flags, so not part of a default cold start
+    assert "utils.metrics" not in imports
+
+def test_shell_loads_no_heavy_modules():
+    result = measure("shell", repeat=1)
+    assert result["heavy"] == []
@@ -0,0 +1,322 @@
+"""
+Memory-budgeted in-process cache for data frames and chart specs
+
+Replaces st.cache_data / st.cache_resource for the app's data and figure caches.
+Every entry is sized when it is stored, and all caches share one byte budget per
+process (CACHE_MEMORY_BUDGET_MB, default 512). When the budget is exceeded the
+least recently used entries are evicted, across all caches, until it fits again.
+
+DataFrames and Series are returned as shallow copies, which share the cached
+data but, with copy-on-write, copy it before any write, so a caller adding or
+changing columns never alters the cache. Other values are returned as stored,
+like st.cache_resource; callers must treat them as read-only.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from utils.instrumentation import INSTRUMENTATION_ENABLED, record_span
+
+CACHE_MEMORY_BUDGET_MB = float(os.environ.get("CACHE_MEMORY_BUDGET_MB", "512"))
+
+# Copy-on-write is always on from pandas 3; shallow copies of cached frames rely on it
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+def estimate_size(value, _seen=None):
+    """
+    Estimate the memory held by a cached value
+
+    Args:
+        value: Any cached value (DataFrames, arrays, dicts, lists, slotted records, scalars)
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+
+    # Shared containers are counted once
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    elif hasattr(type(value), "__slots__"):
+        # Slotted records (e.g. NewsItem) hold their fields outside getsizeof
+        size += sum(estimate_size(getattr(value, name, None), _seen) for name in type(value).__slots__)
+    return size
+
+def _hash_value(value):
+    """Stable digest of one argument value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes(), digest_size=16)
+        labels = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((value.shape, labels)).encode())
+        return digest.hexdigest()
+    if isinstance(value, np.ndarray):
+        return hashlib.blake2b(value.tobytes(), digest_size=16).hexdigest() + str(value.shape)
+    try:
+        return hashlib.blake2b(pickle.dumps(value), digest_size=16).hexdigest()
+    except Exception:
+        return repr(value)
+
+class MemoryBudget:
+    """
+    Byte budget shared by all budgeted caches, with a global LRU order
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.caches = {}
+        self._order = OrderedDict()
+        self._lock = threading.RLock()
+
+    def register(self, cache):
+        with self._lock:
+            self.caches[cache.name] = cache
+
+    def touch(self, cache, key):
+        """Mark an entry as most recently used"""
+        with self._lock:
+            self._order.move_to_end((cache.name, key))
+
+    def add(self, cache, key):
+        """Track a new entry and evict least recently used entries over the budget"""
+        with self._lock:
+            self._order[(cache.name, key)] = None
+            self._order.move_to_end((cache.name, key))
+            while self.used_bytes > self.max_bytes and len(self._order) > 1:
+                (name, old_key), _ = self._order.popitem(last=False)
+                self.caches[name]._evict(old_key)
+
+    def remove(self, cache, key):
+        with self._lock:
+            self._order.pop((cache.name, key), None)
+
+    @property
+    def used_bytes(self):
+        return sum(cache.bytes for cache in self.caches.values())
+
+    def stats(self):
+        """
+        Get the footprint of every cache and of the whole budget
+
+        Returns:
+            dict: Budget and used bytes, plus a list of per-cache statistics
+        """
+        with self._lock:
+            caches = [cache.stats() for cache in self.caches.values()]
+            return {
+                "budget_bytes": self.max_bytes,
+                "used_bytes": sum(c["bytes"] for c in caches),
+                "caches": sorted(caches, key=lambda c: c["bytes"], reverse=True)
+            }
+
+BUDGET = MemoryBudget(int(CACHE_MEMORY_BUDGET_MB * 1024 * 1024))
+
+class BudgetedCache:
+    """
+    Cache of one function's results, sized and evicted through the shared budget
+    """
+
+    def __init__(self, name, ttl=None, max_entries=None, budget=BUDGET):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # One lock for the budget and all its caches keeps eviction across caches deadlock-free
+        self._lock = budget._lock
+        budget.register(self)
+
+    def get(self, key):
+        """
+        Look up an entry
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss or expired entry
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > time.time()):
+                self.entries.move_to_end(key)
+                # Under the shared lock, so the entry cannot be evicted before it is touched
+                self.budget.touch(self, key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        size = estimate_size(value)
+        expires = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size, expires)
+            self.bytes += size
+            if self.max_entries is not None:
+                while len(self.entries) > self.max_entries:
+                    self._evict(next(iter(self.entries)))
+            self.budget.add(self, key)
+
+    def _remove(self, key):
+        with self._lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+        self.budget.remove(self, key)
+
+    def _evict(self, key):
+        with self._lock:
+            if key in self.entries:
+                self.evictions += 1
+                self._remove(key)
+
+    def clear(self):
+        """Drop every entry of this cache"""
+        with self._lock:
+            for key in list(self.entries):
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+def _detach(value):
+    """Shallow copy of a cached DataFrame or Series, so callers cannot alter the cached one"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+def show_error(message):
+    """
+    Build an on_error handler for memory_cache that shows the failure on the page
+
+    Args:
+        message (str): Text shown before the exception, e.g. "Error fetching stock data"
+
+    Returns:
+        callable: Handler showing "<message>: <exception>" with st.error
+    """
+    def handler(e):
+        import streamlit as st
+
+        st.error(f"{message}: {e}")
+    return handler
+
+def memory_cache(func=None, *, ttl=None, max_entries=None, on_error=None):
+    """
+    Cache a function's results within the process-wide memory budget
+
+    Drop-in replacement for st.cache_data / st.cache_resource: arguments are
+    hashed by value (DataFrames by content), parameters whose name starts with
+    an underscore are left out of the key, and the wrapped function gains
+    clear(), lookup(*args) and prime(value, *args) methods.
+
+    Exceptions are never cached. With on_error, a failing call reports the
+    exception through it and returns None; messages belong there rather than
+    in the cached function, since a cache hit does not show them again.
+
+    Args:
+        ttl (float, optional): Seconds before an entry expires
+        max_entries (int, optional): Maximum number of entries of this cache
+        on_error (callable, optional): Called with the exception of a failing call (see show_error)
+
+    Returns:
+        callable: The cached function
+    """
+    if func is None:
+        return functools.partial(memory_cache, ttl=ttl, max_entries=max_entries, on_error=on_error)
+
+    signature = inspect.signature(func)
+    cache = BudgetedCache(f"{func.__module__}.{func.__qualname__}", ttl=ttl, max_entries=max_entries)
+
+    def make_key(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple((name, _hash_value(value)) for name, value in bound.arguments.items() if not name.startswith("_"))
+
+    # Argument hashing is timed on its own: DataFrame arguments can make it costly
+    key_span = f"cache_key.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if INSTRUMENTATION_ENABLED:
+            start = time.perf_counter()
+            key = make_key(*args, **kwargs)
+            record_span(key_span, time.perf_counter() - start)
+        else:
+            key = make_key(*args, **kwargs)
+
+        hit, value = cache.get(key)
+        if hit:
+            return _detach(value)
+
+        try:
+            value = func(*args, **kwargs)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return None
+        cache.set(key, value)
+        return _detach(value)
+
+    def lookup(*args, **kwargs):
+        """Get the cached result for these arguments without calling the function, as (hit, value)"""
+        hit, value = cache.get(make_key(*args, **kwargs))
+        return hit, _detach(value)
+
+    def prime(value, *args, **kwargs):
+        """Store a result computed elsewhere (e.g. by a batched call) for these arguments"""
+        cache.set(make_key(*args, **kwargs), value)
+
+    wrapper.clear = cache.clear
+    wrapper.lookup = lookup
+    wrapper.prime = prime
+    wrapper.cache = cache
+    return wrapper
+
+def get_cache_stats():
+    """
+    Get the current memory footprint of every budgeted cache
+
+    Returns:
+        dict: budget_bytes, used_bytes and per-cache entries, bytes, hits, misses and evictions
+    """
+    return BUDGET.stats()
+
+def clear_all_caches():
+    """Drop every entry of every budgeted cache"""
+    for cache in list(BUDGET.caches.values()):
+        cache.clear()
@@ -0,0 +1,370 @@
+import os
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from utils.downsample import downsample_ohlc, downsample_lines
+from utils.cache import memory_cache
+from utils.instrumentation import timed
+
+# Line overlays switch to WebGL (Scattergl) once a chart shows this many bars
+WEBGL_POINT_THRESHOLD = int(os.environ.get("WEBGL_POINT_THRESHOLD", "1000"))
+
+# Height of the popular stocks sparkline strip in pixels
+SPARKLINE_HEIGHT = 130
+
+# Indicator groups of the technical chart, in drawing order
+INDICATOR_GROUPS = ["ma", "bb", "macd", "rsi", "stoch", "vol"]
+
+# Axes of each subplot row (price, volume, indicators)
+ROW_AXES = {
+    1: ("x", "y"),
+    2: ("x2", "y2"),
+    3: ("x3", "y3")
+}
+
+def get_data_version(df):
+    """
+    Get a cheap fingerprint of a price frame that changes whenever its bars change
+
+    Every bar is hashed with its date, since dividend and split
+    re-adjustments rewrite earlier bars but keep the date range, and a revised
+    high, low or volume changes the figure as much as a revised close.
+
+    Args:
+        df (pandas.DataFrame): Price data indexed by date
+
+    Returns:
+        str: Version string built from the length, date range and a hash of every row
+    """
+    if df is None or df.empty:
+        return "empty"
+    frame_hash = int(pd.util.hash_pandas_object(df, index=True).sum())
+    return f"{len(df)}:{df.index[0]}:{df.index[-1]}:{frame_hash:x}"
+
+def get_chart_theme():
+    """Name of the active Streamlit theme, part of every figure cache key"""
+    return st.get_option("theme.base") or "default"
+
+def use_webgl(point_count, threshold=None):
+    """
+    Decide whether line traces should be rendered with WebGL
+
+    Args:
+        point_count (int): Number of bars shown in the chart
+        threshold (int, optional): Override for WEBGL_POINT_THRESHOLD
+
+    Returns:
+        bool: True if Scattergl should be used for line overlays
+    """
+    threshold = WEBGL_POINT_THRESHOLD if threshold is None else threshold
+    return point_count >= threshold
+
+def get_line_trace(point_count, threshold=None):
+    """
+    Get the trace class for line overlays of a chart with point_count bars
+
+    Args:
+        point_count (int): Number of bars shown in the chart
+        threshold (int, optional): Override for WEBGL_POINT_THRESHOLD
+
+    Returns:
+        type: plotly.graph_objects.Scattergl above the threshold, Scatter otherwise
+    """
+    return go.Scattergl if use_webgl(point_count, threshold) else go.Scatter
+
+def _chart_dates(index):
+    """
+    Dates for the x axis as naive local timestamps
+
+    Timezone-aware indexes serialize to object arrays of Timestamps, which are
+    slow to copy whenever a cached spec is reassembled into a figure.
+    """
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return index
+
+def _on_row(trace, row):
+    """Serialize a trace and place it on a subplot row"""
+    xaxis, yaxis = ROW_AXES[row]
+    spec = trace.to_plotly_json()
+    spec["xaxis"] = xaxis
+    spec["yaxis"] = yaxis
+    return spec
+
+def _line(series, name, color, webgl=False, scale=1):
+    """Line trace for an indicator series (WebGL when requested)"""
+    trace = go.Scattergl if webgl else go.Scatter
+    return trace(x=_chart_dates(series.index), y=series * scale if scale != 1 else series, mode='lines', name=name, line=dict(color=color))
+
+def _reference_line(view, level, name, color):
+    """Dashed horizontal reference line across the visible range"""
+    return go.Scatter(
+        x=_chart_dates(view.index[[0, -1]]),
+        y=[level, level],
+        mode='lines',
+        name=name,
+        line=dict(color=color, dash='dash')
+    )
+
+def _build_group_traces(group, view, webgl=False):
+    """
+    Build the serialized traces of one indicator group
+
+    Dense series use Scattergl when webgl is set; the two-point reference lines
+    and the MACD histogram keep their SVG trace types.
+    """
+    if group == "ma":
+        lines = downsample_lines(view, ['SMA20', 'SMA50', 'SMA200', 'EMA20'])
+        return [
+            _on_row(_line(lines['SMA20'], 'SMA 20', 'rgba(255, 165, 0, 0.8)', webgl), 1),
+            _on_row(_line(lines['SMA50'], 'SMA 50', 'rgba(255, 0, 0, 0.8)', webgl), 1),
+            _on_row(_line(lines['SMA200'], 'SMA 200', 'rgba(0, 0, 255, 0.8)', webgl), 1),
+            _on_row(_line(lines['EMA20'], 'EMA 20', 'rgba(128, 0, 128, 0.8)', webgl), 1)
+        ]
+
+    if group == "bb":
+        lines = downsample_lines(view, ['BB_High', 'BB_Mid', 'BB_Low'])
+        return [
+            _on_row(_line(lines['BB_High'], 'BB Upper', 'rgba(0, 128, 0, 0.5)', webgl), 1),
+            _on_row(_line(lines['BB_Mid'], 'BB Middle', 'rgba(0, 128, 0, 0.8)', webgl), 1),
+            _on_row(_line(lines['BB_Low'], 'BB Lower', 'rgba(0, 128, 0, 0.5)', webgl), 1)
+        ]
+
+    if group == "macd":
+        lines = downsample_lines(view, ['MACD', 'MACD_Signal', 'MACD_Hist'])
+        return [
+            _on_row(_line(lines['MACD'], 'MACD', 'rgba(0, 0, 255, 0.8)', webgl), 3),
+            _on_row(_line(lines['MACD_Signal'], 'Signal', 'rgba(255, 0, 0, 0.8)', webgl), 3),
+            _on_row(go.Bar(
+                x=_chart_dates(lines['MACD_Hist'].index),
+                y=lines['MACD_Hist'],
+                name='Histogram',
+                marker_color='rgba(0, 255, 0, 0.5)'
+            ), 3)
+        ]
+
+    if group == "rsi":
+        lines = downsample_lines(view, ['RSI'])
+        return [
+            _on_row(_line(lines['RSI'], 'RSI', 'rgba(255, 0, 0, 0.8)', webgl), 3),
+            _on_row(_reference_line(view, 70, 'Overbought', 'rgba(255, 0, 0, 0.5)'), 3),
+            _on_row(_reference_line(view, 30, 'Oversold', 'rgba(0, 255, 0, 0.5)'), 3)
+        ]
+
+    if group == "stoch":
+        lines = downsample_lines(view, ['Stoch_K', 'Stoch_D'])
+        return [
+            _on_row(_line(lines['Stoch_K'], '%K', 'rgba(0, 0, 255, 0.8)', webgl), 3),
+            _on_row(_line(lines['Stoch_D'], '%D', 'rgba(255, 0, 0, 0.8)', webgl), 3),
+            _on_row(_reference_line(view, 80, 'Overbought', 'rgba(255, 0, 0, 0.5)'), 3),
+            _on_row(_reference_line(view, 20, 'Oversold', 'rgba(0, 255, 0, 0.5)'), 3)
+        ]
+
+    if group == "vol":
+        # On Balance Volume normalized over the visible range
+        obv_range = view['OBV'].max() - view['OBV'].min()
+        normalized = view.assign(OBV_Norm=(view['OBV'] - view['OBV'].min()) / obv_range * 100 if obv_range else 0.0)
+        lines = downsample_lines(normalized, ['OBV_Norm', 'CMF'])
+        return [
+            _on_row(_line(lines['OBV_Norm'], 'OBV (norm)', 'rgba(128, 0, 128, 0.8)', webgl), 3),
+            _on_row(_line(lines['CMF'], 'CMF (%)', 'rgba(0, 128, 128, 0.8)', webgl, scale=100), 3)
+        ]
+
+    raise ValueError(f"Unknown indicator group: {group}")
+
+@memory_cache(max_entries=32)
+def _get_base_spec(figure_key, title, _view):
+    """
+    Serialized layout plus price and volume traces of the technical chart
+
+    The view is excluded from hashing; figure_key identifies it.
+    """
+    candles = downsample_ohlc(_view)
+    dates = _chart_dates(candles.index)
+
+    fig = make_subplots(rows=3, cols=1,
+                        shared_xaxes=True,
+                        vertical_spacing=0.05,
+                        row_heights=[0.6, 0.2, 0.2],
+                        subplot_titles=("Price", "Volume", "Indicators"))
+
+    fig.update_layout(
+        height=800,
+        title=title,
+        xaxis_rangeslider_visible=False,
+        hovermode="x unified",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    traces = [
+        _on_row(go.Candlestick(
+            x=dates,
+            open=candles['Open'],
+            high=candles['High'],
+            low=candles['Low'],
+            close=candles['Close'],
+            name='Price'
+        ), 1),
+        _on_row(go.Bar(
+            x=dates,
+            y=candles['Volume'],
+            name='Volume',
+            marker_color='rgba(0, 0, 255, 0.5)'
+        ), 2)
+    ]
+
+    return {"data": traces, "layout": fig.layout.to_plotly_json()}
+
+@memory_cache(max_entries=192)
+def _get_group_traces(figure_key, group, webgl, _view):
+    """
+    Serialized traces of one indicator group, cached independently of the others
+
+    The view is excluded from hashing; figure_key identifies it.
+    """
+    return _build_group_traces(group, _view, webgl)
+
+def _sentiment_trace(sentiment, view):
+    """
+    Daily news sentiment bars for the visible range, on a secondary price axis
+
+    Returns:
+        dict: Serialized trace (None if no article falls in the range)
+    """
+    dates = _chart_dates(view.index)
+    daily = sentiment[(sentiment.index >= dates[0].normalize()) & (sentiment.index <= dates[-1])]
+    if daily.empty:
+        return None
+
+    spec = go.Bar(
+        x=daily.index,
+        y=daily['Sentiment'],
+        customdata=daily['Articles'],
+        name='News Sentiment',
+        marker_color=['rgba(0, 160, 0, 0.35)' if score >= 0 else 'rgba(220, 0, 0, 0.35)' for score in daily['Sentiment']],
+        hovertemplate='%{y:.2f} (%{customdata} articles)'
+    ).to_plotly_json()
+    spec["xaxis"] = "x"
+    spec["yaxis"] = "y4"
+    return spec
+
+@timed("figure")
+def build_technical_chart(ticker, period, timeframe, view, indicators, webgl=None, sentiment=None):
+    """
+    Build the technical analysis figure from cached, serialized parts
+
+    The layout with the price and volume traces, and every indicator group, are
+    cached separately under (ticker, period, timeframe, data version, theme).
+    Toggling an indicator only builds that group's traces once; an unchanged
+    chart is reassembled from the cache without re-validating any trace.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+        timeframe (str): Bar size label
+        view (pandas.DataFrame): Visible prices with indicators
+        indicators (list): Selected indicator groups (see INDICATOR_GROUPS)
+        webgl (bool, optional): Force WebGL line traces on or off; by default they
+            are used when the view has at least WEBGL_POINT_THRESHOLD bars
+        sentiment (pandas.DataFrame, optional): Daily news sentiment (see
+            utils.news_store.get_daily_sentiment), overlaid on the price panel
+
+    Returns:
+        plotly.graph_objects.Figure: The assembled figure
+    """
+    if webgl is None:
+        webgl = use_webgl(len(view))
+
+    figure_key = (ticker, period, timeframe, get_data_version(view), get_chart_theme())
+    title = f"{ticker} Technical Analysis - {period} ({timeframe})"
+
+    base = _get_base_spec(figure_key, title, view)
+
+    # Traces are drawn in group order: price overlays, then the indicator panel
+    price_traces, panel_traces = [], []
+    for group in INDICATOR_GROUPS:
+        if group in indicators:
+            for trace in _get_group_traces(figure_key, group, webgl, view):
+                (price_traces if trace["yaxis"] == "y" else panel_traces).append(trace)
+
+    data = [base["data"][0]] + price_traces + [base["data"][1]] + panel_traces
+    layout = base["layout"]
+
+    sentiment_trace = _sentiment_trace(sentiment, view) if sentiment is not None and not sentiment.empty else None
+    if sentiment_trace is not None:
+        data.insert(1, sentiment_trace)
+        # The cached layout is shared; add the sentiment axis to a copy
+        layout = dict(layout, yaxis4=dict(
+            overlaying="y", side="right", range=[-1, 1], showgrid=False, zeroline=False, title="Sentiment"
+        ))
+
+    # The specs are already validated; skip plotly's per-trace validation
+    return go.Figure({"data": data, "layout": layout}, _validate=False)
+
+def get_price_change(df):
+    """
+    Get the last close and its change versus the previous bar
+
+    Args:
+        df (pandas.DataFrame): Price data with a Close column
+
+    Returns:
+        tuple: (last price, change in percent)
+    """
+    last_price = df['Close'].iloc[-1]
+    prev_price = df['Close'].iloc[-2] if len(df) > 1 else last_price
+    price_change_pct = ((last_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
+    return last_price, price_change_pct
+
+@memory_cache(max_entries=8)
+def _get_sparkline_spec(strip_key, _prices):
+    """
+    Serialized sparkline strip, one subplot per ticker
+
+    The prices are excluded from hashing; strip_key holds every ticker's data version.
+    """
+    tickers = list(_prices.keys())
+    fig = make_subplots(rows=1, cols=len(tickers), subplot_titles=tickers, horizontal_spacing=0.04)
+
+    for col, ticker in enumerate(tickers, start=1):
+        df = _prices[ticker]
+        if df is None or df.empty:
+            continue
+        _, price_change_pct = get_price_change(df)
+        fig.add_trace(go.Scatter(
+            x=_chart_dates(df.index),
+            y=df['Close'],
+            mode='lines',
+            name=ticker,
+            line=dict(color="green" if price_change_pct >= 0 else "red")
+        ), row=1, col=col)
+
+    fig.update_layout(height=SPARKLINE_HEIGHT, margin=dict(l=0, r=0, t=30, b=0), showlegend=False)
+    fig.update_xaxes(showticklabels=False)
+    fig.update_yaxes(showticklabels=False)
+
+    return fig.to_plotly_json()
+
+@timed("figure")
+def build_sparkline_strip(prices):
+    """
+    Build one figure with a sparkline per ticker
+
+    The serialized figure is cached until a ticker gets new bars (or the theme
+    changes), so an unchanged strip is not rebuilt on reruns.
+
+    Args:
+        prices (dict): Mapping of ticker symbol to price data (None if unavailable)
+
+    Returns:
+        plotly.graph_objects.Figure: Figure with one subplot per ticker
+    """
+    strip_key = (tuple((ticker, get_data_version(df)) for ticker, df in prices.items()), get_chart_theme())
+    return go.Figure(_get_sparkline_spec(strip_key, prices), _validate=False)
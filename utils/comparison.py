@@ -0,0 +1,158 @@
+import pandas as pd
+import numpy as np
+import streamlit as st
+from utils.stock_data import get_stock_data_batch
+from utils.cache import memory_cache
+from utils.instrumentation import timed
+
+@memory_cache(ttl=3600)  # Cache data for 1 hour
+@timed("load")
+def get_price_matrix(tickers, period="1y"):
+    """
+    Get closing prices for several stocks aligned on a common date index
+
+    Args:
+        tickers (tuple): Stock ticker symbols
+        period (str): Data period (e.g., '1mo', '1y', '10y', 'max')
+
+    Returns:
+        pandas.DataFrame: One column of closing prices per ticker, indexed by date
+        (None if no ticker returned data)
+    """
+    stock_data = get_stock_data_batch(tickers, period=period)
+
+    closes = {}
+    for ticker, data in stock_data.items():
+        if data is None or data.empty:
+            continue
+        close = data['Close']
+        # Different exchanges report different timezones, so align on the calendar date
+        if close.index.tz is not None:
+            close = close.tz_localize(None)
+        # set_axis returns a new Series; the cached frame's column must not be relabelled in place
+        close = close.set_axis(close.index.normalize())
+        closes[ticker] = close[~close.index.duplicated(keep='last')]
+
+    if not closes:
+        return None
+
+    # Carry prices over holidays that only some exchanges observe, then keep the common range
+    prices = pd.DataFrame(closes).sort_index().ffill().dropna()
+    if prices.empty:
+        return None
+
+    return prices
+
+def normalize_prices(prices, base_date=None):
+    """
+    Rebase prices so that every series starts at 100 on the base date
+
+    Args:
+        prices (pandas.DataFrame): Aligned closing prices
+        base_date (datetime-like, optional): Base date. If None, the first date is used.
+
+    Returns:
+        pandas.DataFrame: Normalized prices from the base date onward
+    """
+    if base_date is not None:
+        prices = prices.loc[prices.index >= pd.Timestamp(base_date)]
+
+    if prices.empty:
+        return prices
+
+    return prices.div(prices.iloc[0]) * 100
+
+def calculate_relative_performance(prices, benchmark, base_date=None):
+    """
+    Calculate the performance of each stock relative to a benchmark
+
+    Args:
+        prices (pandas.DataFrame): Aligned closing prices
+        benchmark (str): Column used as the benchmark
+        base_date (datetime-like, optional): Base date for the comparison
+
+    Returns:
+        pandas.DataFrame: Out/under-performance versus the benchmark in percent
+    """
+    normalized = normalize_prices(prices, base_date)
+    return (normalized.div(normalized[benchmark], axis=0) - 1) * 100
+
+def _rolling_sum(values, window):
+    """Rolling sum along the first axis of a 2-D array using cumulative sums"""
+    cumulative = np.cumsum(values, axis=0)
+    cumulative = np.vstack([np.zeros((1, values.shape[1])), cumulative])
+    return cumulative[window:] - cumulative[:-window]
+
+def calculate_rolling_statistics(prices, benchmark, window=60):
+    """
+    Calculate rolling beta and rolling correlation of every stock against a benchmark
+
+    All tickers are handled at once as matrix operations over the daily returns.
+
+    Args:
+        prices (pandas.DataFrame): Aligned closing prices
+        benchmark (str): Column used as the benchmark
+        window (int): Rolling window length in trading days
+
+    Returns:
+        tuple: (rolling beta, rolling correlation) DataFrames, or (None, None) if
+        there is not enough data for a single window
+    """
+    returns = prices.pct_change().iloc[1:]
+    if len(returns) < window or window < 2:
+        return None, None
+
+    x = returns.to_numpy(dtype=float)
+    b = returns[benchmark].to_numpy(dtype=float)[:, None]
+
+    sum_x = _rolling_sum(x, window)
+    sum_b = _rolling_sum(b, window)
+    sum_xb = _rolling_sum(x * b, window)
+    sum_xx = _rolling_sum(x * x, window)
+    sum_bb = _rolling_sum(b * b, window)
+
+    cov_xb = (sum_xb - sum_x * sum_b / window) / (window - 1)
+    var_x = (sum_xx - sum_x ** 2 / window) / (window - 1)
+    var_b = (sum_bb - sum_b ** 2 / window) / (window - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov_xb / var_b
+        correlation = cov_xb / np.sqrt(var_x * var_b)
+
+    index = returns.index[window - 1:]
+    beta = pd.DataFrame(beta, index=index, columns=returns.columns)
+    correlation = pd.DataFrame(np.clip(correlation, -1, 1), index=index, columns=returns.columns)
+
+    return beta, correlation
+
+def get_comparison_summary(prices, benchmark):
+    """
+    Summarize return, volatility, beta and correlation for each stock
+
+    Args:
+        prices (pandas.DataFrame): Aligned closing prices
+        benchmark (str): Column used as the benchmark
+
+    Returns:
+        pandas.DataFrame: One row of summary statistics per ticker
+    """
+    returns = prices.pct_change().iloc[1:]
+    x = returns.to_numpy(dtype=float)
+
+    covariance = np.cov(x, rowvar=False, ddof=1)
+    covariance = np.atleast_2d(covariance)
+    benchmark_idx = returns.columns.get_loc(benchmark)
+    variances = np.diag(covariance)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = covariance[:, benchmark_idx] / variances[benchmark_idx]
+        correlation = covariance[:, benchmark_idx] / np.sqrt(variances * variances[benchmark_idx])
+
+    summary = pd.DataFrame({
+        "Total Return (%)": (prices.iloc[-1] / prices.iloc[0] - 1).to_numpy() * 100,
+        "Annualized Volatility (%)": np.sqrt(variances * 252) * 100,
+        f"Beta vs {benchmark}": beta,
+        f"Correlation vs {benchmark}": correlation
+    }, index=returns.columns)
+
+    return summary.round(2)
@@ -0,0 +1,119 @@
+import os
+import pandas as pd
+import numpy as np
+
+# Approximate drawing width of a full-width chart; no more points than this are sent
+CHART_WIDTH_PX = int(os.environ.get("CHART_WIDTH_PX", "1200"))
+
+# Candles need a few pixels each to stay readable
+PIXELS_PER_CANDLE = 3
+
+def lttb(x, y, threshold):
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm
+
+    Keeps the visual shape of a line (peaks and troughs) while reducing it to
+    roughly one point per pixel.
+
+    Args:
+        x (numpy.ndarray): Monotonic x values as floats
+        y (numpy.ndarray): y values without NaNs
+        threshold (int): Number of points to keep
+
+    Returns:
+        numpy.ndarray: Indices of the selected points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # Average of the next bucket is the third vertex of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+def downsample_line(series, max_points=CHART_WIDTH_PX):
+    """
+    Reduce a line series to at most max_points points with LTTB
+
+    Args:
+        series (pandas.Series): Values indexed by date
+        max_points (int): Maximum number of points to keep
+
+    Returns:
+        pandas.Series: Downsampled series (NaNs dropped)
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+
+    x = series.index.asi8.astype(float) if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series), dtype=float)
+    selected = lttb(x, series.to_numpy(dtype=float), max_points)
+    return series.iloc[selected]
+
+def downsample_lines(df, columns, max_points=CHART_WIDTH_PX):
+    """
+    Downsample several line columns of a DataFrame independently
+
+    Args:
+        df (pandas.DataFrame): Data indexed by date
+        columns (list): Columns to downsample (missing columns are skipped)
+        max_points (int): Maximum number of points per column
+
+    Returns:
+        dict: Mapping of column name to downsampled pandas.Series
+    """
+    return {column: downsample_line(df[column], max_points) for column in columns if column in df.columns}
+
+def downsample_ohlc(df, max_points=CHART_WIDTH_PX // PIXELS_PER_CANDLE):
+    """
+    Merge consecutive OHLCV bars into at most max_points equal-sized buckets
+
+    Each bucket keeps the first open, highest high, lowest low, last close and
+    total volume, so candles still show the full price range.
+
+    Args:
+        df (pandas.DataFrame): OHLCV data indexed by date
+        max_points (int): Maximum number of bars to keep
+
+    Returns:
+        pandas.DataFrame: Bucketed bars labelled by the first date of each bucket
+    """
+    n = len(df)
+    if n <= max_points or max_points < 1:
+        return df
+
+    starts = np.unique(np.linspace(0, n, max_points + 1).astype(np.int64)[:-1])
+    ends = np.append(starts[1:], n) - 1
+
+    bucketed = pd.DataFrame(index=df.index[starts])
+    if 'Open' in df.columns:
+        bucketed['Open'] = df['Open'].to_numpy()[starts]
+    if 'High' in df.columns:
+        bucketed['High'] = np.maximum.reduceat(df['High'].to_numpy(dtype=float), starts)
+    if 'Low' in df.columns:
+        bucketed['Low'] = np.minimum.reduceat(df['Low'].to_numpy(dtype=float), starts)
+    if 'Close' in df.columns:
+        bucketed['Close'] = df['Close'].to_numpy()[ends]
+    if 'Volume' in df.columns:
+        bucketed['Volume'] = np.add.reduceat(df['Volume'].to_numpy(dtype=float), starts)
+
+    return bucketed
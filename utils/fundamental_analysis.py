@@ -1,91 +1,142 @@
-import yfinance as yf
 import pandas as pd
-import streamlit as st
 import numpy as np
+from utils.precomputed_store import load_precomputed_ratios
+from utils.cache import memory_cache, show_error
+from utils.instrumentation import timed
 
-@st.cache_data(ttl=86400)  # Cache data for 1 day
 def get_financial_ratios(ticker):
     """
     Get financial ratios and metrics for fundamental analysis
     
+    Formats the cached raw ratios on each call (cheap), so a failed fetch,
+    which is not cached, is retried and reported on the next call.
+    
     Args:
         ticker (str): Stock ticker symbol
     
     Returns:
-        dict: Dictionary of financial ratios and metrics
+        dict: Dictionary of financial ratios and metrics, formatted for display
     """
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+    ratios = get_raw_financial_ratios(ticker)
+    if ratios is None:
+        return None
+    
+    return format_financial_ratios(ratios)
+
+@memory_cache(ttl=86400, on_error=show_error("Error fetching financial ratios"))  # Cache data for 1 day
+@timed("load")
+def get_raw_financial_ratios(ticker):
+    """
+    Get unformatted financial ratios and metrics for a stock
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        dict: Dictionary of numeric financial ratios (NaN where unavailable)
+    """
+    # Prefer results written by the bulk precompute job
+    ratios = load_precomputed_ratios(ticker)
+    if ratios is not None:
+        return ratios
+    
+    return fetch_financial_ratios(ticker)
+
+@timed("fetch")
+def fetch_financial_ratios(ticker):
+    """
+    Download unformatted financial ratios and metrics for a stock from yfinance
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        dict: Dictionary of numeric financial ratios (NaN where unavailable)
+    """
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    info = stock.info
+    
+    # Extract key metrics
+    ratios = {
+        # Earnings Metrics
+        "EPS": info.get("trailingEPS", np.nan),
+        "Forward EPS": info.get("forwardEPS", np.nan),
+        "Revenue": info.get("totalRevenue", np.nan),
+        "Revenue Per Share": info.get("revenuePerShare", np.nan),
+        "Net Profit Margin": info.get("profitMargins", np.nan),
         
-        # Extract key metrics
-        ratios = {
-            # Earnings Metrics
-            "EPS": info.get("trailingEPS", np.nan),
-            "Forward EPS": info.get("forwardEPS", np.nan),
-            "Revenue": info.get("totalRevenue", np.nan),
-            "Revenue Per Share": info.get("revenuePerShare", np.nan),
-            "Net Profit Margin": info.get("profitMargins", np.nan),
-            
-            # Valuation Ratios
-            "PE Ratio": info.get("trailingPE", np.nan),
-            "Forward PE": info.get("forwardPE", np.nan),
-            "PEG Ratio": info.get("pegRatio", np.nan),
-            "Price to Book": info.get("priceToBook", np.nan),
-            "Price to Sales": info.get("priceToSalesTrailing12Months", np.nan),
-            "Enterprise Value/EBITDA": info.get("enterpriseToEbitda", np.nan),
-            
-            # Profitability Ratios
-            "Return on Equity": info.get("returnOnEquity", np.nan),
-            "Return on Assets": info.get("returnOnAssets", np.nan),
-            "Operating Margin": info.get("operatingMargins", np.nan),
-            "EBITDA Margin": info.get("ebitdaMargins", np.nan),
-            
-            # Liquidity & Financial Health
-            "Debt to Equity": info.get("debtToEquity", np.nan),
-            "Current Ratio": info.get("currentRatio", np.nan),
-            "Quick Ratio": info.get("quickRatio", np.nan),
-            
-            # Efficiency Metrics
-            "Asset Turnover": np.nan,  # Not directly available in yfinance
-            
-            # Dividend Metrics
-            "Dividend Yield": info.get("dividendYield", np.nan),
-            "Dividend Rate": info.get("dividendRate", np.nan),
-            "Payout Ratio": info.get("payoutRatio", np.nan),
-            
-            # Growth Metrics
-            "Earnings Growth": info.get("earningsGrowth", np.nan),
-            "Revenue Growth": info.get("revenueGrowth", np.nan),
-            
-            # Share Statistics
-            "Market Cap": info.get("marketCap", np.nan),
-            "Shares Outstanding": info.get("sharesOutstanding", np.nan),
-            "52 Week High": info.get("fiftyTwoWeekHigh", np.nan),
-            "52 Week Low": info.get("fiftyTwoWeekLow", np.nan)
-        }
+        # Valuation Ratios
+        "PE Ratio": info.get("trailingPE", np.nan),
+        "Forward PE": info.get("forwardPE", np.nan),
+        "PEG Ratio": info.get("pegRatio", np.nan),
+        "Price to Book": info.get("priceToBook", np.nan),
+        "Price to Sales": info.get("priceToSalesTrailing12Months", np.nan),
+        "Enterprise Value/EBITDA": info.get("enterpriseToEbitda", np.nan),
         
-        # Format financial numbers
-        for key, value in ratios.items():
-            if key in ["Revenue", "Market Cap", "Shares Outstanding"]:
-                if not pd.isna(value):
-                    if value >= 1e9:
-                        ratios[key] = f"${value/1e9:.2f}B"
-                    elif value >= 1e6:
-                        ratios[key] = f"${value/1e6:.2f}M"
-                    elif value >= 1e3:
-                        ratios[key] = f"${value/1e3:.2f}K"
-            elif key in ["Dividend Yield", "Net Profit Margin", "Operating Margin", "EBITDA Margin", 
-                       "Return on Equity", "Return on Assets", "Earnings Growth", "Revenue Growth", "Payout Ratio"]:
-                if not pd.isna(value):
-                    ratios[key] = f"{value:.2%}"
-            elif not pd.isna(value):
-                ratios[key] = f"{value:.2f}"
-                
-        return ratios
-    except Exception as e:
-        st.error(f"Error fetching financial ratios: {e}")
-        return None
+        # Profitability Ratios
+        "Return on Equity": info.get("returnOnEquity", np.nan),
+        "Return on Assets": info.get("returnOnAssets", np.nan),
+        "Operating Margin": info.get("operatingMargins", np.nan),
+        "EBITDA Margin": info.get("ebitdaMargins", np.nan),
+        
+        # Liquidity & Financial Health
+        "Debt to Equity": info.get("debtToEquity", np.nan),
+        "Current Ratio": info.get("currentRatio", np.nan),
+        "Quick Ratio": info.get("quickRatio", np.nan),
+        
+        # Efficiency Metrics
+        "Asset Turnover": np.nan,  # Not directly available in yfinance
+        
+        # Dividend Metrics
+        "Dividend Yield": info.get("dividendYield", np.nan),
+        "Dividend Rate": info.get("dividendRate", np.nan),
+        "Payout Ratio": info.get("payoutRatio", np.nan),
+        
+        # Growth Metrics
+        "Earnings Growth": info.get("earningsGrowth", np.nan),
+        "Revenue Growth": info.get("revenueGrowth", np.nan),
+        
+        # Share Statistics
+        "Market Cap": info.get("marketCap", np.nan),
+        "Shares Outstanding": info.get("sharesOutstanding", np.nan),
+        "52 Week High": info.get("fiftyTwoWeekHigh", np.nan),
+        "52 Week Low": info.get("fiftyTwoWeekLow", np.nan)
+    }
+    
+    return ratios
+
+def format_financial_ratios(ratios):
+    """
+    Format numeric financial ratios for display
+    
+    Args:
+        ratios (dict): Dictionary of numeric financial ratios
+    
+    Returns:
+        dict: Dictionary of formatted financial ratios
+    """
+    ratios = dict(ratios)
+    
+    # Format financial numbers
+    for key, value in ratios.items():
+        if key in ["Revenue", "Market Cap", "Shares Outstanding"]:
+            if not pd.isna(value):
+                if value >= 1e9:
+                    ratios[key] = f"${value/1e9:.2f}B"
+                elif value >= 1e6:
+                    ratios[key] = f"${value/1e6:.2f}M"
+                elif value >= 1e3:
+                    ratios[key] = f"${value/1e3:.2f}K"
+        elif key in ["Dividend Yield", "Net Profit Margin", "Operating Margin", "EBITDA Margin", 
+                   "Return on Equity", "Return on Assets", "Earnings Growth", "Revenue Growth", "Payout Ratio"]:
+            if not pd.isna(value):
+                ratios[key] = f"{value:.2%}"
+        elif not pd.isna(value):
+            ratios[key] = f"{value:.2f}"
+            
+    return ratios
 
 def get_ratio_description(ratio):
     """
@@ -1,7 +1,8 @@
 import pandas as pd
 import streamlit as st
-from datetime import datetime, timedelta
 import random
+import time
+from utils.news_item import NewsItem
 
 def get_sample_news(ticker, limit=10):
     """
@@ -13,7 +14,7 @@ def get_sample_news(ticker, limit=10):
         limit (int): Maximum number of news items to return
     
     Returns:
-        list: List of sample news items
+        list: Sample NewsItem records, newest first
     """
     # Company names for common tickers
     companies = {
@@ -67,13 +68,12 @@ def get_sample_news(ticker, limit=10):
     
     # Generate sample news items
     sample_news = []
-    now = datetime.now()
+    now = int(time.time())
     
     for i in range(min(limit, len(headlines))):
         # Random time in the past 3 days
         random_hours = random.randint(1, 72)
-        publish_time = now - timedelta(hours=random_hours)
-        formatted_time = publish_time.strftime('%Y-%m-%d %H:%M:%S')
+        publish_time = now - random_hours * 3600
         
         # Format headline with company name
         title = headlines[i].format(company=company_name)
@@ -81,14 +81,15 @@ def get_sample_news(ticker, limit=10):
         # Create summary based on title
         summary = f"This article discusses {title.lower()} and provides insights into the company's performance, market position, and future outlook. Investors seeking information about {company_name} will find valuable analysis in this report."
         
-        news_item = {
-            'title': title,
-            'publisher': random.choice(publishers),
-            'link': '#',
-            'published': formatted_time,
-            'summary': summary
-        }
+        news_item = NewsItem(
+            title=title,
+            publisher=random.choice(publishers),
+            link='#',
+            published_ts=publish_time,
+            summary=summary
+        )
         
         sample_news.append(news_item)
     
+    sample_news.sort(key=lambda item: item.published_ts, reverse=True)
     return sample_news
\ No newline at end of file
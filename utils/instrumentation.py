@@ -0,0 +1,224 @@
+"""
+Lightweight timing spans for the app's hot paths
+
+Upstream fetches, cached loaders, indicator computation, figure construction,
+cache key hashing and page runs record their wall time into named spans; the
+hidden Diagnostics page reads the per-span percentiles. "fetch" spans are kept
+to the leaf functions that make the network call, so one upstream request is
+counted once; the cached loaders around them ("load", e.g. get_stock_data) time
+a whole cache miss, including store I/O and the nested fetches. Each span keeps a bounded ring of its most
+recent samples, so memory stays constant however long the process runs.
+Configured through environment variables:
+
+    INSTRUMENTATION_ENABLED   set to 0 to disable the spans (default 1)
+    INSTRUMENTATION_SAMPLES   recent samples kept per span (default 1024)
+    DIAGNOSTICS_ENABLED       set to 1 to serve the Diagnostics page at ?page=Diagnostics (default 0)
+
+Spans also count their calls into fixed latency buckets and track the calls
+currently in flight, for the Prometheus exporter in utils/metrics.py.
+
+When disabled, timed() returns the function unchanged and span() returns a
+shared no-op context, so instrumented code runs as if it were not instrumented.
+"""
+import bisect
+import contextlib
+import functools
+import math
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+INSTRUMENTATION_ENABLED = os.environ.get("INSTRUMENTATION_ENABLED", "1").lower() not in ("0", "false", "no")
+INSTRUMENTATION_SAMPLES = int(os.environ.get("INSTRUMENTATION_SAMPLES", "1024"))
+# The page can clear process-wide caches, so it is opt-in per deployment
+DIAGNOSTICS_ENABLED = os.environ.get("DIAGNOSTICS_ENABLED", "0").lower() in ("1", "true", "yes")
+
+# Histogram bucket upper bounds in seconds, from cache-speed calls to slow upstream fetches
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NO_SPAN = contextlib.nullcontext()
+
+class SpanStats:
+    """
+    Running totals and recent samples of one span
+    """
+
+    __slots__ = ("name", "count", "errors", "total", "max", "samples", "buckets", "in_flight")
+
+    def __init__(self, name, samples=INSTRUMENTATION_SAMPLES):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=samples)
+        # Per-bucket counts, with a last bucket for calls slower than every bound
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.in_flight = 0
+
+    def record(self, seconds, error=False):
+        self.buckets[bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def stats(self):
+        p50, p95, p99 = _percentiles([s * 1000 for s in self.samples], (50, 95, 99))
+        return {
+            "name": self.name,
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "p99_ms": round(p99, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "total_ms": round(self.total * 1000, 3)
+        }
+
+    def histogram(self):
+        cumulative, running = [], 0
+        for bound, count in zip(HISTOGRAM_BUCKETS + (float("inf"),), self.buckets):
+            running += count
+            cumulative.append((bound, running))
+        return {
+            "name": self.name,
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": self.total,
+            "errors": self.errors,
+            "in_flight": self.in_flight
+        }
+
+def _percentiles(samples, percents):
+    """Linearly interpolated percentiles (1-99) of the samples, NaN when there are none"""
+    if len(samples) < 2:
+        return [samples[0] if samples else math.nan] * len(percents)
+    # "inclusive" interpolates between the closest ranks, like numpy's default percentile
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return [cuts[p - 1] for p in percents]
+
+_spans = {}
+_lock = threading.Lock()
+
+def record_span(name, seconds, error=False):
+    """
+    Record one timing sample of a span
+
+    Args:
+        name (str): Span name, e.g. "fetch.get_stock_data"
+        seconds (float): Wall time of the call
+        error (bool): Whether the call raised
+    """
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = SpanStats(name)
+        stats.record(seconds, error)
+
+def _begin_span(name):
+    """Count a call of a span as in flight until _end_span"""
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = SpanStats(name)
+        stats.in_flight += 1
+        return stats
+
+def _end_span(stats, seconds, error=False):
+    with _lock:
+        stats.in_flight -= 1
+        stats.record(seconds, error)
+
+class _Span:
+    """Context manager timing one span"""
+
+    __slots__ = ("name", "stats", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.stats = _begin_span(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Streamlit's st.stop() / st.rerun() unwind with BaseExceptions, which are not errors
+        _end_span(self.stats, time.perf_counter() - self.start, exc_type is not None and issubclass(exc_type, Exception))
+        return False
+
+def span(name):
+    """
+    Time a block of code as a named span
+
+    Args:
+        name (str): Span name, e.g. "page.Home"
+
+    Returns:
+        context manager: Records the block's wall time on exit
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return _NO_SPAN
+    return _Span(name)
+
+def timed(kind):
+    """
+    Time every call of a function as the span "<kind>.<function name>"
+
+    Place it below @memory_cache to time only the calls that miss the cache.
+
+    Args:
+        kind (str): Span category, e.g. "fetch", "load", "compute" or "figure"
+
+    Returns:
+        callable: Decorator, which returns the function unchanged when instrumentation is disabled
+    """
+    def decorator(func):
+        if not INSTRUMENTATION_ENABLED:
+            return func
+        name = f"{kind}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = _begin_span(name)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                _end_span(stats, time.perf_counter() - start, isinstance(e, Exception))
+                raise
+            _end_span(stats, time.perf_counter() - start)
+            return result
+
+        return wrapper
+    return decorator
+
+def get_span_stats():
+    """
+    Get the call counts and latency percentiles of every span
+
+    Returns:
+        list: Per-span dicts (name, count, errors, p50/p95/p99/max/total in ms), slowest total first
+    """
+    with _lock:
+        stats = [s.stats() for s in _spans.values()]
+    return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
+
+def get_span_histograms():
+    """
+    Get the cumulative latency histogram and in-flight count of every span
+
+    Returns:
+        list: Per-span dicts (name, buckets as (upper bound, cumulative count), count, sum, errors, in_flight)
+    """
+    with _lock:
+        return [s.histogram() for s in sorted(_spans.values(), key=lambda s: s.name)]
+
+def reset_spans():
+    """Drop every recorded span"""
+    with _lock:
+        _spans.clear()
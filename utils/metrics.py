@@ -0,0 +1,256 @@
+"""
+Prometheus text-format exporter for the app's spans and cache statistics
+
+Exports, per server process:
+
+    stock_app_upstream_fetch_seconds   histogram of upstream calls by leaf fetch function
+    stock_app_upstream_fetch_errors_total
+    stock_app_upstream_in_flight       fetches currently running, by function
+    stock_app_page_run_seconds         histogram of page script runs by page
+    stock_app_span_seconds             histogram of the other spans (load, compute, figure, cache_key)
+    stock_app_cache_{hits,misses,evictions}_total, stock_app_cache_{entries,bytes} by cache
+    stock_app_cache_{budget,used}_bytes
+
+Served over HTTP from a daemon thread and/or written periodically to a
+textfile (for node_exporter's textfile collector). Configured through
+environment variables:
+
+    METRICS_PORT               serve GET /metrics on this port (default: off)
+    METRICS_ADDRESS            bind address of the endpoint (default 0.0.0.0)
+    METRICS_TEXTFILE           write the metrics to this file (default: off)
+    METRICS_TEXTFILE_INTERVAL  seconds between textfile writes (default 15)
+
+Upstream metrics are labelled by the function making the network call:
+download_history (get_stock_data's bars), get_stock_info, get_company_overview,
+fetch_financial_ratios (get_financial_ratios) and get_news_from_* (the sources
+of get_stock_news). The end-to-end cache-miss time of those loaders is in
+stock_app_span_seconds{span="load.<name>"}.
+
+Latency and in-flight metrics come from utils.instrumentation and are absent
+when INSTRUMENTATION_ENABLED=0. Try it locally against synthetic data with:
+
+    python -m utils.metrics                # print the metrics after a synthetic workload
+    python -m utils.metrics --port 9108    # ...then serve them: curl localhost:9108/metrics
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import streamlit as st
+from utils.instrumentation import get_span_histograms
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+METRICS_ADDRESS = os.environ.get("METRICS_ADDRESS", "0.0.0.0")
+METRICS_TEXTFILE = os.environ.get("METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_INTERVAL = float(os.environ.get("METRICS_TEXTFILE_INTERVAL", "15"))
+
+PREFIX = "stock_app"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+THREAD_NAME = "metrics-exporter"
+
+logger = logging.getLogger(__name__)
+
+def _escape(value):
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _header(lines, name, kind, help_text):
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+def _histogram(lines, name, label, series):
+    for value, hist in series:
+        for bound, count in hist["buckets"]:
+            lines.append(f"{PREFIX}_{name}_bucket{_labels(**{label: value, 'le': _number(bound)})} {count}")
+        lines.append(f"{PREFIX}_{name}_sum{_labels(**{label: value})} {_number(hist['sum'])}")
+        lines.append(f"{PREFIX}_{name}_count{_labels(**{label: value})} {hist['count']}")
+
+def render_metrics():
+    """
+    Render the current spans and cache statistics in the Prometheus text format
+
+    Returns:
+        str: Exposition text, one sample per line
+    """
+    # Span names are "<kind>.<name>"; fetch and page spans get their own metrics
+    fetches, pages, others = [], [], []
+    for hist in get_span_histograms():
+        kind, _, name = hist["name"].partition(".")
+        if kind == "fetch":
+            fetches.append((name, hist))
+        elif kind == "page":
+            pages.append((name, hist))
+        else:
+            others.append((hist["name"], hist))
+    lines = []
+
+    _header(lines, "upstream_fetch_seconds", "histogram", "Latency of upstream data requests, by fetch function.")
+    _histogram(lines, "upstream_fetch_seconds", "function", fetches)
+
+    _header(lines, "upstream_fetch_errors_total", "counter", "Upstream data requests that raised, by fetch function.")
+    for name, hist in fetches:
+        lines.append(f"{PREFIX}_upstream_fetch_errors_total{_labels(function=name)} {hist['errors']}")
+
+    _header(lines, "upstream_in_flight", "gauge", "Upstream data requests currently running, by fetch function.")
+    for name, hist in fetches:
+        lines.append(f"{PREFIX}_upstream_in_flight{_labels(function=name)} {hist['in_flight']}")
+
+    _header(lines, "page_run_seconds", "histogram", "Duration of page script runs, by page.")
+    _histogram(lines, "page_run_seconds", "page", pages)
+
+    _header(lines, "span_seconds", "histogram", "Duration of other timed spans (cached loaders, computation, figures, cache keys).")
+    _histogram(lines, "span_seconds", "span", others)
+
+    # utils.cache pulls in pandas; importing it here keeps this module cheap to load
+    from utils.cache import get_cache_stats
+
+    cache_stats = get_cache_stats()
+    for field, kind, help_text in [
+        ("hits", "counter", "Cache lookups served from memory."),
+        ("misses", "counter", "Cache lookups that called the function."),
+        ("evictions", "counter", "Entries evicted over the memory budget or entry limit."),
+        ("entries", "gauge", "Entries currently cached."),
+        ("bytes", "gauge", "Estimated bytes currently cached.")
+    ]:
+        name = f"cache_{field}_total" if kind == "counter" else f"cache_{field}"
+        _header(lines, name, kind, help_text)
+        for cache in cache_stats["caches"]:
+            lines.append(f"{PREFIX}_{name}{_labels(cache=cache['name'])} {cache[field]}")
+
+    _header(lines, "cache_budget_bytes", "gauge", "Memory budget shared by all caches.")
+    lines.append(f"{PREFIX}_cache_budget_bytes {cache_stats['budget_bytes']}")
+    _header(lines, "cache_used_bytes", "gauge", "Estimated bytes used by all caches.")
+    lines.append(f"{PREFIX}_cache_used_bytes {cache_stats['used_bytes']}")
+
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the metrics on GET /metrics"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the server log
+        pass
+
+def serve_metrics(port=METRICS_PORT, address=METRICS_ADDRESS):
+    """
+    Serve the metrics over HTTP from a daemon thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        address (str): Bind address
+
+    Returns:
+        ThreadingHTTPServer: The running server; its server_address holds the bound port
+    """
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=THREAD_NAME, daemon=True).start()
+    return server
+
+def write_textfile(path=METRICS_TEXTFILE):
+    """
+    Write the metrics to a file atomically, so collectors never read a partial file
+
+    Args:
+        path (str): Output file path
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+
+def _write_textfile_forever(path, interval):
+    while True:
+        try:
+            write_textfile(path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
+        time.sleep(interval)
+
+@st.cache_resource
+def start_metrics_exporter():
+    """
+    Start the configured metrics endpoint and textfile writer once per server process
+
+    Returns:
+        ThreadingHTTPServer: The HTTP server (None if METRICS_PORT is unset or the port is taken)
+    """
+    if METRICS_TEXTFILE:
+        threading.Thread(
+            target=_write_textfile_forever,
+            args=(METRICS_TEXTFILE, METRICS_TEXTFILE_INTERVAL),
+            name=f"{THREAD_NAME}-textfile",
+            daemon=True
+        ).start()
+
+    if not METRICS_PORT:
+        return None
+    try:
+        return serve_metrics(METRICS_PORT, METRICS_ADDRESS)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on port %s: %s", METRICS_PORT, e)
+        return None
+
+def run_synthetic_workload(tickers=5):
+    """
+    Call the instrumented fetchers for a few synthetic tickers (no network)
+
+    Args:
+        tickers (int): Number of synthetic tickers
+    """
+    import tempfile
+    from utils.fundamental_analysis import get_financial_ratios
+    from utils.news import get_stock_news
+    from utils.stock_data import get_stock_data, get_stock_info
+    from utils.synthetic_data import SyntheticMarket, synthetic_tickers, use_synthetic_data
+    from utils.technical_analysis import get_stock_indicators
+
+    with tempfile.TemporaryDirectory() as tmp, use_synthetic_data(SyntheticMarket(), data_dir=tmp):
+        for ticker in synthetic_tickers(tickers):
+            get_stock_indicators(ticker)
+            get_stock_data(ticker, period="5d")
+            get_stock_info(ticker)
+            get_financial_ratios(ticker)
+            get_stock_news(ticker)
+
+def main():
+    parser = argparse.ArgumentParser(description="Print or serve the app metrics after a synthetic workload.")
+    parser.add_argument("--tickers", type=int, default=5, help="Synthetic tickers to fetch")
+    parser.add_argument("--port", type=int, help="Keep serving GET /metrics on this port")
+    args = parser.parse_args()
+
+    run_synthetic_workload(args.tickers)
+    print(render_metrics(), end="")
+
+    if args.port is not None:
+        server = serve_metrics(args.port, "127.0.0.1")
+        print(f"\nServing http://127.0.0.1:{server.server_address[1]}/metrics (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
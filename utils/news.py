@@ -1,133 +1,303 @@
-import yfinance as yf
-import pandas as pd
-import streamlit as st
-from datetime import datetime, timedelta
-from yahooquery import Ticker
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import datetime
 from utils.generate_sample_news import get_sample_news
+from utils.cache import memory_cache
+from utils.instrumentation import timed
+from utils.news_item import NewsItem
+from utils.news_store import connect, ingest_news, get_news_page
 
-@st.cache_data(ttl=3600)  # Cache data for 1 hour
+# Sources queried for every ticker, in merge priority order (e.g. NEWS_SOURCES=yfinance)
+NEWS_SOURCES = [s.strip() for s in os.environ.get("NEWS_SOURCES", "yahooquery,yfinance").split(",") if s.strip()]
+
+# Sources are queried at the same time. A source that has not answered within
+# its timeout is ignored (NEWS_SOURCE_TIMEOUTS overrides it per source, e.g.
+# "yfinance=6"), and the merged result is returned no later than the deadline
+NEWS_SOURCE_TIMEOUT = float(os.environ.get("NEWS_SOURCE_TIMEOUT", "4"))
+NEWS_SOURCE_TIMEOUTS = {
+    name.strip(): float(seconds)
+    for name, _, seconds in (s.partition("=") for s in os.environ.get("NEWS_SOURCE_TIMEOUTS", "").split(","))
+    if seconds.strip()
+}
+NEWS_DEADLINE = float(os.environ.get("NEWS_DEADLINE", "6"))
+
+# Shared pool, so a source that overruns its timeout never delays the response
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="news-source")
+
+logger = logging.getLogger(__name__)
+
+@memory_cache(ttl=3600)  # Cache data for 1 hour
+@timed("load")
 def get_stock_news(ticker, limit=10):
     """
     Get news related to a specific stock
     
+    All configured sources are queried concurrently. Articles from the sources
+    that answer within their timeout are added to the local news store, which
+    then serves the newest articles (including ones no source returns anymore).
+    Sample news (items without a source) is only used if every source misses
+    and nothing is stored; callers tell the user, since a cache hit cannot.
+    
     Args:
         ticker (str): Stock ticker symbol
         limit (int): Maximum number of news items to return
     
     Returns:
-        list: List of news items
+        list: NewsItem records, newest first
     """
+    formatted_news = fetch_news_concurrently(ticker, limit)
+    
     try:
-        # First try with yahooquery
-        formatted_news = get_news_from_yahooquery(ticker, limit)
-        
-        # If yahooquery fails or returns empty, try yfinance as backup
-        if not formatted_news:
-            formatted_news = get_news_from_yfinance(ticker, limit)
-            
-        # If both API methods fail, use sample news as a last resort
-        if not formatted_news:
-            st.warning("Unable to fetch real-time news. Showing sample headlines.")
-            formatted_news = get_sample_news(ticker, limit)
-            
-        return formatted_news
-    except Exception as e:
-        st.error(f"Error fetching news: {e}")
-        # Even if all methods fail, provide sample news
-        return get_sample_news(ticker, limit)
+        conn = connect()
+        try:
+            for source in dict.fromkeys(item.source for item in formatted_news):
+                ingest_news(ticker, source, [item for item in formatted_news if item.source == source], conn=conn)
+            stored_news = get_news_page(ticker, limit, conn=conn)
+        finally:
+            conn.close()
+        if stored_news:
+            formatted_news = stored_news
+    except sqlite3.Error as e:
+        # The fetched articles are still returned, just not stored
+        logger.warning("News store unavailable: %s", e)
+    
+    # If every source failed and nothing is stored, use sample news as a last resort
+    if not formatted_news:
+        formatted_news = get_sample_news(ticker, limit)
+    
+    return formatted_news
 
-def get_news_from_yahooquery(ticker, limit=10):
-    """Get news using yahooquery"""
-    try:
-        ticker_obj = Ticker(ticker)
-        news = ticker_obj.news(limit)
-        
-        # Format the news data
-        formatted_news = []
+def get_stock_news_many(tickers, limit=10):
+    """
+    Get news for a whole watchlist with one batched request
+    
+    Tickers whose news is already cached are served from get_stock_news's
+    cache. The rest are fetched together through one yahooquery request,
+    stored, and primed into get_stock_news's cache, so their News pages need no
+    further request. Tickers the batch returns nothing for are left to
+    get_stock_news.
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        limit (int): Maximum number of news items per ticker
+    
+    Returns:
+        list: Merged NewsItem records, newest first, each with the tickers it was found for
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    feeds, missing = {}, []
+    for ticker in tickers:
+        hit, items = get_stock_news.lookup(ticker, limit)
+        if hit:
+            feeds[ticker] = items
+        else:
+            missing.append(ticker)
+    
+    if missing:
+        try:
+            timeout = min(NEWS_SOURCE_TIMEOUTS.get("yahooquery", NEWS_SOURCE_TIMEOUT), NEWS_DEADLINE)
+            fetched = _executor.submit(get_news_from_yahooquery_many, missing, limit).result(timeout=timeout)
+        except Exception:
+            fetched = {}
         
-        if isinstance(news, list):
-            for item in news[:limit]:
-                # Convert timestamp to datetime
-                if 'providerPublishTime' in item:
-                    publish_time = datetime.fromtimestamp(item['providerPublishTime'])
-                    formatted_time = publish_time.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    formatted_time = "Unknown"
-                    
-                news_item = {
-                    'title': item.get('title', 'No title'),
-                    'publisher': item.get('publisher', 'Unknown'),
-                    'link': item.get('link', '#'),
-                    'published': formatted_time,
-                    'summary': item.get('summary', 'No summary available')
-                }
-                formatted_news.append(news_item)
+        try:
+            conn = connect()
+            try:
+                for ticker, items in fetched.items():
+                    ingest_news(ticker, "yahooquery", items, conn=conn)
+                stored = {ticker: get_news_page(ticker, limit, conn=conn) for ticker in fetched}
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            stored = {}
         
-        return formatted_news
-    except Exception as e:
-        st.warning(f"YahooQuery error (trying backup): {e}")
-        return []
+        for ticker, items in fetched.items():
+            items = stored.get(ticker) or [replace(item, source="yahooquery") for item in items]
+            get_stock_news.prime(items, ticker, limit)
+            feeds[ticker] = items
+    
+    # An article posted under several tickers appears once
+    merged, tickers_by_key = {}, {}
+    for ticker, items in feeds.items():
+        for item in items:
+            merged.setdefault(item.key, item)
+            tickers_by_key.setdefault(item.key, []).append(ticker)
+    
+    # Unknown dates are 0 and go last
+    merged = [replace(item, tickers=tuple(tickers_by_key[key])) for key, item in merged.items()]
+    return sorted(merged, key=lambda item: item.published_ts, reverse=True)
 
-def get_news_from_yfinance(ticker, limit=10):
-    """Get news using yfinance"""
-    try:
-        stock = yf.Ticker(ticker)
-        news = stock.news
+def fetch_news_concurrently(ticker, limit=10, sources=None, timeout=None, deadline=None):
+    """
+    Query several news sources at once and merge what arrives in time
+    
+    All sources start together. Answers are collected in the order they
+    complete; a source is given up on when its timeout or the overall deadline
+    passes, whichever comes first, so the call never takes longer than the
+    deadline. Waiting stops early once the sources that already answered
+    provide at least limit distinct articles. Articles reported by several
+    sources keep the version of the source listed first.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        limit (int): Maximum number of news items to return
+        sources (list, optional): Source names (see NEWS_SOURCE_FUNCTIONS) in priority order, defaults to NEWS_SOURCES
+        timeout (float, optional): Per-source timeout in seconds, defaults to NEWS_SOURCE_TIMEOUTS / NEWS_SOURCE_TIMEOUT
+        deadline (float, optional): Overall deadline in seconds, defaults to NEWS_DEADLINE
+    
+    Returns:
+        list: Merged NewsItem records, newest first (empty if every source missed)
+    """
+    sources = [name for name in (sources or NEWS_SOURCES) if name in NEWS_SOURCE_FUNCTIONS]
+    deadline = NEWS_DEADLINE if deadline is None else deadline
+    
+    start = time.monotonic()
+    futures, cutoffs = {}, {}
+    for name in sources:
+        source_timeout = NEWS_SOURCE_TIMEOUTS.get(name, NEWS_SOURCE_TIMEOUT) if timeout is None else timeout
+        future = _executor.submit(NEWS_SOURCE_FUNCTIONS[name], ticker, limit)
+        futures[future] = name
+        cutoffs[future] = start + min(source_timeout, deadline)
+    
+    answers, seen, pending = {}, set(), set(futures)
+    while pending and len(seen) < limit:
+        now = time.monotonic()
+        # Sources past their cutoff are ignored; they finish in the background
+        pending = {future for future in pending if cutoffs[future] > now}
+        if not pending:
+            break
         
-        # Format the news data
-        formatted_news = []
-        for item in news[:limit]:
-            # Convert timestamp to datetime
-            if 'providerPublishTime' in item:
-                publish_time = datetime.fromtimestamp(item['providerPublishTime'])
-                formatted_time = publish_time.strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                formatted_time = "Unknown"
-                
-            news_item = {
-                'title': item.get('title', 'No title'),
-                'publisher': item.get('publisher', 'Unknown'),
-                'link': item.get('link', '#'),
-                'published': formatted_time,
-                'summary': item.get('summary', 'No summary available')
-            }
-            formatted_news.append(news_item)
-            
-        return formatted_news
-    except Exception as e:
-        st.warning(f"YFinance error: {e}")
+        done, pending = wait(pending, timeout=min(cutoffs[f] for f in pending) - now, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                answers[futures[future]] = future.result()
+            except Exception:
+                # Failed; the other sources may still deliver
+                continue
+            seen.update(item.key for item in answers[futures[future]])
+    
+    merged, seen = [], set()
+    for name in sources:
+        for item in answers.get(name, []):
+            if item.key not in seen:
+                seen.add(item.key)
+                merged.append(replace(item, source=name))
+    
+    # Unknown dates are 0 and go last
+    merged.sort(key=lambda item: item.published_ts, reverse=True)
+    return merged[:limit]
+
+def _format_news_item(item):
+    """
+    Convert a raw Yahoo news item into a NewsItem
+    
+    Handles both the flat format (providerPublishTime, publisher, link) and the
+    newer format that nests the article under 'content'.
+    """
+    content = item.get('content')
+    if isinstance(content, dict):
+        try:
+            published = int(datetime.fromisoformat(content.get('pubDate').replace('Z', '+00:00')).timestamp())
+        except (AttributeError, ValueError):
+            published = 0
+        return NewsItem(
+            title=content.get('title') or 'No title',
+            publisher=(content.get('provider') or {}).get('displayName', 'Unknown'),
+            link=(content.get('canonicalUrl') or content.get('clickThroughUrl') or {}).get('url') or '#',
+            published_ts=published,
+            summary=content.get('summary') or 'No summary available'
+        )
+    
+    return NewsItem(
+        title=item.get('title', 'No title'),
+        publisher=item.get('publisher', 'Unknown'),
+        link=item.get('link', '#'),
+        published_ts=int(item.get('providerPublishTime') or 0),
+        summary=item.get('summary', 'No summary available')
+    )
+
+@timed("fetch")
+def get_news_from_yahooquery(ticker, limit=10):
+    """
+    Get news using yahooquery
+    
+    Raises on failure; fetch_news_concurrently treats that as a miss.
+    """
+    from yahooquery import Ticker
+    
+    ticker_obj = Ticker(ticker)
+    news = ticker_obj.news(limit)
+    
+    if not isinstance(news, list):
         return []
+    
+    return [_format_news_item(item) for item in news[:limit]]
 
-def format_relative_time(timestamp_str):
+def _related_tickers(item, tickers):
     """
-    Format a timestamp string into a relative time (e.g., "2 hours ago")
+    Find which of the requested tickers a raw news item belongs to
     
-    Args:
-        timestamp_str (str): Timestamp string in format '%Y-%m-%d %H:%M:%S'
+    Uses the tickers Yahoo tags the article with, or else mentions of the
+    symbol in the title and summary.
+    """
+    content = item.get('content') if isinstance(item.get('content'), dict) else item
+    tagged = {str(t).upper() for t in item.get('relatedTickers') or item.get('tickers') or []}
+    tagged |= {str(t.get('symbol', '')).upper() for t in (content.get('finance') or {}).get('stockTickers') or []}
+    related = [t for t in tickers if t in tagged]
+    if related:
+        return related
+    
+    text = f"{content.get('title') or ''} {content.get('summary') or ''}"
+    return [t for t in tickers if re.search(rf"\b{re.escape(t)}\b", text)]
+
+@timed("fetch")
+def get_news_from_yahooquery_many(tickers, limit=10):
+    """
+    Get news for several tickers using one yahooquery request
+    
+    yahooquery returns the articles of all symbols as one list, so each
+    article is attributed to its tickers afterwards. Raises on failure.
     
     Returns:
-        str: Relative time string
+        dict: Mapping of ticker to news items (tickers without news are left out)
     """
-    try:
-        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-        now = datetime.now()
-        diff = now - timestamp
-        
-        if diff.days > 365:
-            years = diff.days // 365
-            return f"{years} year{'s' if years > 1 else ''} ago"
-        elif diff.days > 30:
-            months = diff.days // 30
-            return f"{months} month{'s' if months > 1 else ''} ago"
-        elif diff.days > 0:
-            return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
-        elif diff.seconds >= 3600:
-            hours = diff.seconds // 3600
-            return f"{hours} hour{'s' if hours > 1 else ''} ago"
-        elif diff.seconds >= 60:
-            minutes = diff.seconds // 60
-            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-        else:
-            return "just now"
-    except:
-        return timestamp_str
+    from yahooquery import Ticker
+    
+    news = Ticker(tickers).news(limit * len(tickers))
+    if not isinstance(news, list):
+        return {}
+    
+    by_ticker = {}
+    for item in news:
+        formatted = None
+        for ticker in _related_tickers(item, tickers):
+            items = by_ticker.setdefault(ticker, [])
+            if len(items) < limit:
+                formatted = formatted or _format_news_item(item)
+                items.append(formatted)
+    return by_ticker
+
+@timed("fetch")
+def get_news_from_yfinance(ticker, limit=10):
+    """
+    Get news using yfinance
+    
+    Raises on failure; fetch_news_concurrently treats that as a miss.
+    """
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    news = stock.news or []
+    
+    return [_format_news_item(item) for item in news[:limit]]
+
+# News source functions by name, each taking (ticker, limit)
+NEWS_SOURCE_FUNCTIONS = {
+    "yahooquery": get_news_from_yahooquery,
+    "yfinance": get_news_from_yfinance
+}
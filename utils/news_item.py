@@ -0,0 +1,81 @@
+"""
+Typed news records and relative-time formatting for news feeds
+"""
+import sys
+import time
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass(slots=True)
+class NewsItem:
+    """
+    One news article
+
+    published_ts is in epoch seconds, with 0 for an unknown date (so it sorts
+    last in newest-first order). Publisher and source names repeat across
+    thousands of articles and are interned. sentiment is the stored score
+    (-1 to 1) of articles read back from the news store.
+    """
+    title: str
+    publisher: str
+    link: str
+    published_ts: int
+    summary: str
+    source: str = None
+    tickers: tuple = ()
+    sentiment: float = None
+
+    def __post_init__(self):
+        self.publisher = sys.intern(self.publisher or 'Unknown')
+        if self.source is not None:
+            self.source = sys.intern(self.source)
+
+    @property
+    def key(self):
+        """Identity used to merge duplicates across sources: the link, or the title without one"""
+        return self.link if self.link != '#' else self.title
+
+    @property
+    def has_link(self):
+        """Whether the article links to a real page (sample news does not)"""
+        return self.link != '#'
+
+# Relative-time units, largest first: (name, seconds per unit, minimum age in seconds)
+_UNITS = [
+    ("year", 365 * 86400, 366 * 86400),
+    ("month", 30 * 86400, 31 * 86400),
+    ("day", 86400, 86400),
+    ("hour", 3600, 3600),
+    ("minute", 60, 60)
+]
+
+def format_relative_times(items, now=None):
+    """
+    Format the publish times of a news list as relative times (e.g. "2 hours ago")
+
+    All ages are computed in one vectorized pass; only the final strings are
+    built per item.
+
+    Args:
+        items (list): NewsItem records
+        now (float, optional): Reference time in epoch seconds, defaults to now
+
+    Returns:
+        list: One string per item ("Unknown date" for items without a date)
+    """
+    if not items:
+        return []
+
+    published = np.fromiter((item.published_ts for item in items), dtype=np.int64, count=len(items))
+    age = np.maximum((time.time() if now is None else now) - published, 0)
+
+    conditions = [age >= minimum for _, _, minimum in _UNITS]
+    counts = np.select(conditions, [age // size for _, size, _ in _UNITS], 0).astype(np.int64)
+    units = np.select(conditions, [name for name, _, _ in _UNITS], "")
+
+    return [
+        "Unknown date" if ts <= 0 else
+        "just now" if not unit else
+        f"{count} {unit}{'s' if count > 1 else ''} ago"
+        for ts, count, unit in zip(published.tolist(), counts.tolist(), units.tolist())
+    ]
@@ -0,0 +1,458 @@
+import hashlib
+import re
+import sqlite3
+import time
+from urllib.parse import urlsplit, urlunsplit
+import pandas as pd
+from utils.news_item import NewsItem
+from utils.sentiment import score_article
+from utils.storage import get_data_path
+
+# Table layout version, kept in PRAGMA user_version; new stores get the schema on connect
+SCHEMA_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Words too common to be worth a posting list
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the
+their this to was were will with after over into than up about new says s
+""".split())
+
+# Publish times are epoch seconds; 0 marks an unknown date and sorts last.
+# Postings carry the article's stored publish time (not the time a later source
+# reported), so every index of one article sorts and joins on the same key.
+# Sentiment is scored once when an article is stored (see utils.sentiment).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    doc INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    publisher TEXT,
+    link TEXT,
+    published_ts INTEGER NOT NULL DEFAULT 0,
+    summary TEXT,
+    source TEXT,
+    ingested_ts INTEGER NOT NULL,
+    sentiment REAL
+);
+CREATE INDEX IF NOT EXISTS articles_by_time ON articles (published_ts DESC);
+CREATE INDEX IF NOT EXISTS articles_by_publisher ON articles (publisher COLLATE NOCASE, published_ts DESC);
+CREATE TABLE IF NOT EXISTS postings (
+    ticker TEXT NOT NULL,
+    published_ts INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (ticker, published_ts, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vocabulary (
+    term_id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    doc_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS term_postings (
+    term_id INTEGER NOT NULL,
+    published_ts INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (term_id, published_ts, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS watermarks (
+    ticker TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published_ts INTEGER,
+    checked_ts INTEGER NOT NULL,
+    PRIMARY KEY (ticker, source)
+);
+"""
+
+def _db_path():
+    """Path of the local news database"""
+    return get_data_path("news.db")
+
+def connect(path=None):
+    """
+    Open the news database, creating the schema as needed
+
+    Args:
+        path (str, optional): Database file, defaults to data/news.db
+
+    Returns:
+        sqlite3.Connection: Connection with rows accessible by column name
+    """
+    conn = sqlite3.connect(path or _db_path(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _create_schema(conn)
+    return conn
+
+def _create_schema(conn):
+    """Create the schema of a new store"""
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def article_id(item):
+    """
+    Canonical ID of a news article, shared by every ticker it is posted under
+
+    The link without query string or fragment identifies an article; items
+    without a link fall back to the normalized title.
+
+    Args:
+        item (NewsItem): News article
+
+    Returns:
+        str: Hex digest
+    """
+    if item.has_link:
+        parts = urlsplit(item.link.strip())
+        key = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+    else:
+        key = " ".join(item.title.lower().split())
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def tokenize(text):
+    """
+    Split text into distinct lower-case index terms
+
+    Args:
+        text (str): Title or summary text
+
+    Returns:
+        set: Terms without stop words and single characters
+    """
+    return {t for t in TOKEN_PATTERN.findall((text or "").lower()) if len(t) > 1 and t not in STOP_WORDS}
+
+def _term_ids(conn, terms, create=False):
+    """
+    Look up vocabulary IDs of terms
+
+    Args:
+        conn (sqlite3.Connection): Open connection
+        terms (iterable): Index terms
+        create (bool): Add missing terms and count one more document for each
+
+    Returns:
+        dict: Mapping of term to (term_id, doc_count) for known terms
+    """
+    terms = list(terms)
+    if not terms:
+        return {}
+    if create:
+        conn.executemany(
+            "INSERT INTO vocabulary (term, doc_count) VALUES (?, 1) "
+            "ON CONFLICT (term) DO UPDATE SET doc_count = doc_count + 1",
+            [(term,) for term in terms]
+        )
+    placeholders = ", ".join("?" * len(terms))
+    rows = conn.execute(
+        f"SELECT term, term_id, doc_count FROM vocabulary WHERE term IN ({placeholders})", terms
+    ).fetchall()
+    return {row['term']: (row['term_id'], row['doc_count']) for row in rows}
+
+def _store_article(conn, item, item_id, source, now):
+    """
+    Insert an article and its term postings (no-op if it is already stored)
+
+    Returns:
+        tuple: (document number, stored publish time) of the article
+    """
+    # Most ingests repeat stored articles; look them up before scoring anything
+    row = conn.execute("SELECT doc, published_ts FROM articles WHERE id = ?", (item_id,)).fetchone()
+    if row is not None:
+        return row['doc'], row['published_ts']
+
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO articles (id, title, publisher, link, published_ts, summary, source, ingested_ts, sentiment) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (item_id, item.title or 'No title', item.publisher, item.link or '#', item.published_ts,
+         item.summary or '', source, now, score_article(item.title, item.summary))
+    )
+    if not cursor.rowcount:
+        # Stored by another connection since the lookup
+        row = conn.execute("SELECT doc, published_ts FROM articles WHERE id = ?", (item_id,)).fetchone()
+        return row['doc'], row['published_ts']
+
+    doc = cursor.lastrowid
+    terms = tokenize(item.title) | tokenize(item.summary)
+    conn.executemany(
+        "INSERT OR IGNORE INTO term_postings (term_id, published_ts, doc) VALUES (?, ?, ?)",
+        [(term_id, item.published_ts, doc) for term_id, _ in _term_ids(conn, terms, create=True).values()]
+    )
+    return doc, item.published_ts
+
+def _to_item(row):
+    """Convert an articles row into a NewsItem"""
+    return NewsItem(row['title'], row['publisher'], row['link'], row['published_ts'] or 0, row['summary'], row['source'],
+                    sentiment=row['sentiment'])
+
+def get_watermark(conn, ticker, source):
+    """
+    Get the newest publish time already ingested for a ticker from a source
+
+    Returns:
+        int: Epoch seconds (None if nothing was ingested yet)
+    """
+    row = conn.execute(
+        "SELECT published_ts FROM watermarks WHERE ticker = ? AND source = ?", (ticker, source)
+    ).fetchone()
+    return row['published_ts'] if row else None
+
+def ingest_news(ticker, source, items, conn=None):
+    """
+    Store the new articles of one source for a ticker
+
+    Items older than the source's high-water mark for this ticker are skipped.
+    Articles already stored (e.g. under another ticker) are only posted to this
+    ticker, not stored or indexed again.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        source (str): Source name (e.g. 'yahooquery')
+        items (list): NewsItem records from that source
+        conn (sqlite3.Connection, optional): Open connection
+
+    Returns:
+        int: Number of articles that were new to the store
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    ticker = ticker.upper()
+    now = int(time.time())
+
+    try:
+        with conn:
+            watermark = get_watermark(conn, ticker, source)
+            newest = watermark
+            added = 0
+
+            for item in items:
+                published = item.published_ts
+                if watermark is not None and published and published < watermark:
+                    continue
+
+                stored_before = conn.total_changes
+                doc, stored_published = _store_article(conn, item, article_id(item), source, now)
+                added += conn.total_changes > stored_before
+                conn.execute(
+                    "INSERT OR IGNORE INTO postings (ticker, published_ts, doc) VALUES (?, ?, ?)",
+                    (ticker, stored_published, doc)
+                )
+                if published and (newest is None or published > newest):
+                    newest = published
+
+            conn.execute(
+                "INSERT INTO watermarks (ticker, source, published_ts, checked_ts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (ticker, source) DO UPDATE SET published_ts = excluded.published_ts, checked_ts = excluded.checked_ts",
+                (ticker, source, newest, now)
+            )
+        return added
+    finally:
+        if own_conn:
+            conn.close()
+
+def get_news_page(ticker, limit=10, offset=0, conn=None):
+    """
+    Get stored news for a ticker, newest first
+
+    Args:
+        ticker (str): Stock ticker symbol
+        limit (int): Page size
+        offset (int): Number of newer articles to skip
+        conn (sqlite3.Connection, optional): Open connection
+
+    Returns:
+        list: NewsItem records, newest first
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        rows = conn.execute(
+            "SELECT a.* FROM postings p JOIN articles a ON a.doc = p.doc "
+            "WHERE p.ticker = ? ORDER BY p.published_ts DESC, p.doc DESC LIMIT ? OFFSET ?",
+            (ticker.upper(), limit, offset)
+        ).fetchall()
+        return [_to_item(row) for row in rows]
+    finally:
+        if own_conn:
+            conn.close()
+
+def count_news(ticker, conn=None):
+    """
+    Count the stored articles of a ticker
+
+    Returns:
+        int: Number of articles posted under the ticker
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM postings WHERE ticker = ?", (ticker.upper(),)).fetchone()[0]
+    finally:
+        if own_conn:
+            conn.close()
+
+def get_daily_sentiment(ticker, start=None, conn=None):
+    """
+    Get the daily average news sentiment of a ticker
+
+    Aggregated from the scores stored with each article; articles without a
+    publish date are left out.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        start (datetime, optional): Earliest publish time
+        conn (sqlite3.Connection, optional): Open connection
+
+    Returns:
+        pandas.DataFrame: 'Sentiment' (mean score) and 'Articles' per local
+            calendar day, indexed by date (empty if nothing is stored)
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        rows = conn.execute(
+            "SELECT date(p.published_ts, 'unixepoch', 'localtime') AS day, AVG(a.sentiment) AS sentiment, COUNT(*) AS articles "
+            "FROM postings p JOIN articles a ON a.doc = p.doc "
+            "WHERE p.ticker = ? AND p.published_ts >= ? AND a.sentiment IS NOT NULL "
+            "GROUP BY day ORDER BY day",
+            (ticker.upper(), max(int(start.timestamp()), 1) if start is not None else 1)
+        ).fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+
+    return pd.DataFrame(
+        {"Sentiment": [row['sentiment'] for row in rows], "Articles": [row['articles'] for row in rows]},
+        index=pd.DatetimeIndex([row['day'] for row in rows], name="Date")
+    )
+
+def search_news(query=None, tickers=None, publisher=None, start=None, end=None, limit=20, conn=None):
+    """
+    Search stored news through the inverted index
+
+    Every keyword of the query must appear in the title or summary. All filters
+    are optional and combined with AND. Keyword searches walk the posting list
+    of the rarest keyword newest-first and probe the other keywords and filters
+    per document, so they stop as soon as limit matches are found.
+
+    Args:
+        query (str, optional): Keywords
+        tickers (list, optional): Only articles posted under one of these tickers
+        publisher (str, optional): Publisher name (case-insensitive)
+        start (datetime, optional): Earliest publish time
+        end (datetime, optional): Latest publish time
+        limit (int): Maximum number of results
+        conn (sqlite3.Connection, optional): Open connection
+
+    Returns:
+        list: Matching NewsItem records, newest first
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        terms = tokenize(query) if query else set()
+        if query and not terms:
+            return []
+
+        term_ids = _term_ids(conn, terms)
+        if len(term_ids) < len(terms):
+            # A keyword that was never indexed cannot match
+            return []
+
+        # Drive the scan from the rarest keyword, or else the most selective filter
+        if term_ids:
+            ordered = sorted(term_ids.values(), key=lambda t: t[1])
+            source_sql = "SELECT published_ts, doc FROM term_postings WHERE term_id = ?"
+            params = [ordered[0][0]]
+            others = [term_id for term_id, _ in ordered[1:]]
+        elif tickers:
+            placeholders = ", ".join("?" * len(tickers))
+            params = [t.upper() for t in tickers]
+            if len(tickers) == 1:
+                source_sql = "SELECT published_ts, doc FROM postings WHERE ticker = ?"
+            else:
+                # An article posted under several of the tickers has a posting for each
+                source_sql = f"SELECT DISTINCT published_ts, doc FROM postings WHERE ticker IN ({placeholders})"
+            tickers, others = None, []
+        elif publisher:
+            source_sql = "SELECT published_ts, doc FROM articles WHERE publisher = ? COLLATE NOCASE"
+            params = [publisher]
+            publisher, others = None, []
+        else:
+            source_sql = "SELECT published_ts, doc FROM articles WHERE 1"
+            params, others = [], []
+
+        if start is not None:
+            source_sql += " AND published_ts >= ?"
+            params.append(int(start.timestamp()))
+        if end is not None:
+            source_sql += " AND published_ts <= ?"
+            params.append(int(end.timestamp()))
+
+        conditions = []
+        for term_id in others:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM term_postings t WHERE t.term_id = ? AND t.published_ts = s.published_ts AND t.doc = s.doc)"
+            )
+            params.append(term_id)
+        if tickers:
+            placeholders = ", ".join("?" * len(tickers))
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM postings p WHERE p.ticker IN ({placeholders}) AND p.published_ts = s.published_ts AND p.doc = s.doc)"
+            )
+            params += [t.upper() for t in tickers]
+        if publisher:
+            conditions.append("a.publisher = ? COLLATE NOCASE")
+            params.append(publisher)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = conn.execute(
+            f"SELECT a.* FROM ({source_sql}) s JOIN articles a ON a.doc = s.doc {where} "
+            f"ORDER BY s.published_ts DESC, s.doc DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        return [_to_item(row) for row in rows]
+    finally:
+        if own_conn:
+            conn.close()
+
+def get_publishers(conn=None):
+    """
+    Get the publishers of stored articles
+
+    Returns:
+        list: Publisher names, most frequent first
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        rows = conn.execute(
+            "SELECT publisher FROM articles WHERE publisher NOT IN ('', 'Unknown') GROUP BY publisher ORDER BY COUNT(*) DESC"
+        ).fetchall()
+        return [row['publisher'] for row in rows]
+    finally:
+        if own_conn:
+            conn.close()
+
+def get_index_stats(conn=None):
+    """
+    Get the size of the news store and its inverted index
+
+    Returns:
+        dict: Article, ticker posting, term and term posting counts
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        count = lambda table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {
+            "articles": count("articles"),
+            "ticker_postings": count("postings"),
+            "terms": count("vocabulary"),
+            "term_postings": count("term_postings")
+        }
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,432 @@
+import json
+import os
+from statistics import NormalDist
+import pandas as pd
+import numpy as np
+from utils.storage import get_data_path
+from utils.stock_data import fetch_batch
+from utils.comparison import get_price_matrix
+from utils.fundamental_analysis import get_raw_financial_ratios
+
+WATCHLIST_FILE = "watchlist.json"
+
+DEFAULT_WATCHLIST = {
+    "AAPL": 0.25,
+    "MSFT": 0.25,
+    "GOOGL": 0.25,
+    "AMZN": 0.25
+}
+
+# Fundamentals aggregated across positions (weighted by position size)
+WEIGHTED_FUNDAMENTALS = [
+    "PE Ratio", "Forward PE", "PEG Ratio", "Price to Book", "Price to Sales",
+    "Dividend Yield", "Return on Equity", "Net Profit Margin", "Debt to Equity",
+    "Revenue Growth", "Earnings Growth"
+]
+
+TRADING_DAYS = 252
+
+def load_watchlist():
+    """
+    Load the persisted watchlist
+
+    Returns:
+        dict: Mapping of ticker symbol to portfolio weight
+    """
+    path = get_data_path(WATCHLIST_FILE)
+    if not os.path.exists(path):
+        return dict(DEFAULT_WATCHLIST)
+
+    try:
+        with open(path) as f:
+            watchlist = json.load(f)
+        return {str(ticker).upper(): float(weight) for ticker, weight in watchlist.items()}
+    except (OSError, ValueError):
+        return dict(DEFAULT_WATCHLIST)
+
+def save_watchlist(watchlist):
+    """
+    Persist the watchlist
+
+    Args:
+        watchlist (dict): Mapping of ticker symbol to portfolio weight
+    """
+    path = get_data_path(WATCHLIST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(watchlist, f, indent=2)
+    os.replace(tmp_path, path)
+
+def normalize_weights(watchlist):
+    """
+    Scale weights so they sum to one
+
+    Args:
+        watchlist (dict): Mapping of ticker symbol to raw weight
+
+    Returns:
+        dict: Mapping of ticker symbol to normalized weight
+    """
+    total = sum(max(weight, 0) for weight in watchlist.values())
+    if total <= 0:
+        return {ticker: 1 / len(watchlist) for ticker in watchlist} if watchlist else {}
+    return {ticker: max(weight, 0) / total for ticker, weight in watchlist.items()}
+
+def get_portfolio_prices(tickers, period="1y"):
+    """
+    Get aligned closing prices for every position of a portfolio
+
+    Args:
+        tickers (list): Stock ticker symbols
+        period (str): Data period
+
+    Returns:
+        pandas.DataFrame: Aligned closing prices (None if unavailable)
+    """
+    return get_price_matrix(tuple(tickers), period=period)
+
+def get_portfolio_fundamentals(tickers):
+    """
+    Get numeric fundamentals for every position of a portfolio
+
+    Args:
+        tickers (list): Stock ticker symbols
+
+    Returns:
+        pandas.DataFrame: One row per ticker, one column per ratio
+    """
+    ratios = fetch_batch(get_raw_financial_ratios, tickers)
+    rows = {ticker: {key: values.get(key, np.nan) for key in WEIGHTED_FUNDAMENTALS}
+            for ticker, values in ratios.items() if values is not None}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=WEIGHTED_FUNDAMENTALS, dtype=float)
+
+def calculate_weighted_fundamentals(fundamentals, weights):
+    """
+    Calculate position-weighted fundamentals for a portfolio
+
+    Missing values are skipped and the remaining weights re-scaled per ratio.
+
+    Args:
+        fundamentals (pandas.DataFrame): Numeric ratios, one row per ticker
+        weights (dict): Mapping of ticker symbol to weight
+
+    Returns:
+        pandas.Series: Weighted value of each ratio
+    """
+    if fundamentals.empty:
+        return pd.Series(np.nan, index=WEIGHTED_FUNDAMENTALS)
+
+    values = fundamentals.to_numpy(dtype=float)
+    w = np.array([weights.get(ticker, 0.0) for ticker in fundamentals.index])[:, None]
+    available = ~np.isnan(values)
+
+    weighted_sum = (np.where(available, values, 0.0) * w).sum(axis=0)
+    weight_sum = (available * w).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(weight_sum > 0, weighted_sum / weight_sum, np.nan)
+
+    return pd.Series(result, index=fundamentals.columns)
+
+class PortfolioRiskModel:
+    """
+    Risk metrics for a weighted portfolio that update incrementally
+
+    The model keeps running sums of the daily return matrix (sum vector and
+    cross-product matrix), the covariance-weight product and the portfolio
+    return series. Appending a day of prices costs O(N^2), dropping the
+    oldest day (a rolling window moving forward) O(N^2 + T), changing one
+    weight O(N + T), and adding or removing one position O(N * T), instead
+    of recomputing everything from the full price history. The known prices
+    are kept to detect rewritten history (e.g. dividend and split
+    re-adjustments).
+    """
+
+    def __init__(self, prices, weights):
+        """
+        Args:
+            prices (pandas.DataFrame): Aligned closing prices, one column per ticker
+            weights (dict): Mapping of ticker symbol to normalized weight
+        """
+        self._rebuild(prices, weights)
+
+    def _rebuild(self, prices, weights):
+        """Compute all running statistics from scratch"""
+        returns = prices.pct_change().iloc[1:]
+        self.tickers = list(prices.columns)
+        self.dates = prices.index
+        self.prices = prices.to_numpy(dtype=float, copy=True)
+        self.returns = returns.to_numpy(dtype=float, copy=True)
+        self.weights = np.array([weights.get(ticker, 0.0) for ticker in self.tickers])
+
+        self.n = len(self.returns)
+        self.sum = self.returns.sum(axis=0)
+        self.cross = self.returns.T @ self.returns
+        self._refresh_portfolio()
+
+    def _refresh_portfolio(self):
+        """Recompute the weight-dependent quantities"""
+        self.cov_weights = self.covariance @ self.weights
+        self.portfolio_returns = self.returns @ self.weights
+        self._refresh_drawdown()
+
+    def _refresh_drawdown(self):
+        """Recompute the drawdown state from the portfolio return series"""
+        values = np.cumprod(1 + self.portfolio_returns)
+        if len(values) == 0:
+            self.value, self.peak, self.max_drawdown = 1.0, 1.0, 0.0
+            return
+        peaks = np.maximum.accumulate(np.maximum(values, 1.0))
+        self.value = values[-1]
+        self.peak = peaks[-1]
+        self.max_drawdown = float(min((values / peaks - 1).min(), 0.0))
+
+    @property
+    def covariance(self):
+        """Sample covariance matrix of daily returns"""
+        if self.n < 2:
+            return np.zeros((len(self.tickers), len(self.tickers)))
+        return (self.cross - np.outer(self.sum, self.sum) / self.n) / (self.n - 1)
+
+    def update(self, prices, weights):
+        """
+        Bring the model in line with new prices and weights
+
+        Only the parts that changed are recomputed: removed and added positions,
+        days dropped from the start of a rolling window, a revised last day
+        (e.g. an intraday refresh), newly appended days and changed weights.
+        Anything else (a different or re-adjusted history, e.g. after a change
+        of period or a dividend) triggers a full rebuild.
+
+        Args:
+            prices (pandas.DataFrame): Aligned closing prices, one column per ticker
+            weights (dict): Mapping of ticker symbol to normalized weight
+        """
+        # Known days that are no longer at the start of the prices (rolling window)
+        dropped = self.dates.get_indexer(prices.index[:1])[0] if len(prices) else -1
+        known_dates = len(self.dates) - dropped
+        if (dropped < 0 or (dropped and known_dates < 2) or len(prices) < known_dates
+                or not prices.index[:known_dates].equals(self.dates[dropped:])
+                or not set(self.tickers) & set(prices.columns)):
+            self._rebuild(prices, weights)
+            return
+
+        for ticker in [t for t in self.tickers if t not in prices.columns]:
+            self.remove_position(ticker)
+
+        known = prices[self.tickers].iloc[:known_dates].to_numpy(dtype=float)
+        if not np.array_equal(known[:-1], self.prices[dropped:-1], equal_nan=True):
+            self._rebuild(prices, weights)
+            return
+        if dropped:
+            self.drop_first_days(dropped)
+        if not np.array_equal(known[-1], self.prices[-1], equal_nan=True):
+            if known_dates < 2:
+                self._rebuild(prices, weights)
+                return
+            self.replace_last_prices(known[-1], known[-2])
+
+        for ticker in [t for t in prices.columns if t not in self.tickers]:
+            self.add_position(ticker, prices[ticker].iloc[:known_dates], weights.get(ticker, 0.0))
+
+        new_rows = prices.iloc[known_dates:]
+        for date, row in new_rows[self.tickers].iterrows():
+            self.append_prices(date, row.to_numpy(dtype=float))
+
+        for ticker in self.tickers:
+            weight = weights.get(ticker, 0.0)
+            if weight != self.weights[self.tickers.index(ticker)]:
+                self.set_weight(ticker, weight)
+
+    def append_prices(self, date, prices):
+        """
+        Add one day of closing prices
+
+        Args:
+            date (datetime-like): Date of the new prices
+            prices (numpy.ndarray): Closing prices in the model's ticker order
+        """
+        r = prices / self.prices[-1] - 1
+        self.prices = np.vstack([self.prices, prices])
+        self.dates = self.dates.append(pd.Index([date]))
+        self.returns = np.vstack([self.returns, r])
+
+        self.n += 1
+        self.sum += r
+        self.cross += np.outer(r, r)
+        self.cov_weights = self.covariance @ self.weights
+
+        portfolio_return = r @ self.weights
+        self.portfolio_returns = np.append(self.portfolio_returns, portfolio_return)
+        self.value *= 1 + portfolio_return
+        self.peak = max(self.peak, self.value)
+        self.max_drawdown = min(self.max_drawdown, self.value / self.peak - 1)
+
+    def drop_first_days(self, count):
+        """
+        Remove the oldest days of prices, e.g. when a rolling window moves forward
+
+        Their returns are subtracted from the running sums. The drawdown is
+        recomputed, since its running peak may have been set on a dropped day.
+
+        Args:
+            count (int): Number of days to drop (at least one day must remain)
+        """
+        dropped = self.returns[:count]
+        self.prices = self.prices[count:]
+        self.dates = self.dates[count:]
+        self.returns = self.returns[count:]
+
+        self.n -= len(dropped)
+        self.sum -= dropped.sum(axis=0)
+        self.cross -= dropped.T @ dropped
+        self.cov_weights = self.covariance @ self.weights
+        self.portfolio_returns = self.portfolio_returns[count:]
+        self._refresh_drawdown()
+
+    def replace_last_prices(self, prices, previous_prices):
+        """
+        Revise the closing prices of the last known day
+
+        The last day's returns are taken out of the running sums and the
+        revised ones added back.
+
+        Args:
+            prices (numpy.ndarray): Revised closing prices in the model's ticker order
+            previous_prices (numpy.ndarray): Closing prices of the day before, same order
+        """
+        old = self.returns[-1].copy()
+        r = prices / previous_prices - 1
+        self.prices[-1] = prices
+        self.returns[-1] = r
+
+        self.sum += r - old
+        self.cross += np.outer(r, r) - np.outer(old, old)
+        self.cov_weights = self.covariance @ self.weights
+        self.portfolio_returns[-1] = r @ self.weights
+        self._refresh_drawdown()
+
+    def set_weight(self, ticker, weight):
+        """
+        Change the weight of one position
+
+        Args:
+            ticker (str): Stock ticker symbol
+            weight (float): New weight
+        """
+        i = self.tickers.index(ticker)
+        delta = weight - self.weights[i]
+        if delta == 0:
+            return
+
+        self.weights[i] = weight
+        self.cov_weights += delta * self.covariance[:, i]
+        self.portfolio_returns += delta * self.returns[:, i]
+        self._refresh_drawdown()
+
+    def add_position(self, ticker, prices, weight=0.0):
+        """
+        Add a position whose prices are aligned with the model's dates
+
+        Args:
+            ticker (str): Stock ticker symbol
+            prices (pandas.Series): Closing prices on the model's dates
+            weight (float): Weight of the new position
+        """
+        values = prices.to_numpy(dtype=float)
+        r = values[1:] / values[:-1] - 1
+
+        self.tickers.append(ticker)
+        self.prices = np.column_stack([self.prices, values])
+        cross_col = self.returns.T @ r
+        self.returns = np.column_stack([self.returns, r])
+        self.sum = np.append(self.sum, r.sum())
+        self.cross = np.block([
+            [self.cross, cross_col[:, None]],
+            [cross_col[None, :], np.array([[r @ r]])]
+        ])
+        self.weights = np.append(self.weights, 0.0)
+        self.cov_weights = self.covariance @ self.weights
+        self.set_weight(ticker, weight)
+
+    def remove_position(self, ticker):
+        """
+        Remove a position from the model
+
+        Args:
+            ticker (str): Stock ticker symbol
+        """
+        self.set_weight(ticker, 0.0)
+        i = self.tickers.index(ticker)
+
+        self.tickers.pop(i)
+        self.prices = np.delete(self.prices, i, axis=1)
+        self.returns = np.delete(self.returns, i, axis=1)
+        self.sum = np.delete(self.sum, i)
+        self.cross = np.delete(np.delete(self.cross, i, axis=0), i, axis=1)
+        self.weights = np.delete(self.weights, i)
+        self.cov_weights = np.delete(self.cov_weights, i)
+
+    def get_metrics(self, confidence=0.95):
+        """
+        Get the current portfolio risk metrics
+
+        Args:
+            confidence (float): Confidence level for Value at Risk
+
+        Returns:
+            dict: Volatility, Value at Risk and drawdown figures
+        """
+        variance = max(float(self.weights @ self.cov_weights), 0.0)
+        daily_vol = np.sqrt(variance)
+        mean_return = float(self.sum @ self.weights / self.n) if self.n else 0.0
+        z = NormalDist().inv_cdf(confidence)
+
+        historical_var = np.nan
+        if self.n:
+            historical_var = -float(np.quantile(self.portfolio_returns, 1 - confidence))
+
+        return {
+            "Annualized Return": mean_return * TRADING_DAYS,
+            "Annualized Volatility": daily_vol * np.sqrt(TRADING_DAYS),
+            "Daily VaR (Historical)": historical_var,
+            "Daily VaR (Parametric)": z * daily_vol - mean_return,
+            "Max Drawdown": self.max_drawdown,
+            "Current Drawdown": self.value / self.peak - 1
+        }
+
+    def get_risk_contributions(self):
+        """
+        Get each position's share of total portfolio variance
+
+        Returns:
+            pandas.Series: Fraction of variance contributed by each ticker
+        """
+        variance = float(self.weights @ self.cov_weights)
+        if variance <= 0:
+            return pd.Series(0.0, index=self.tickers)
+        return pd.Series(self.weights * self.cov_weights / variance, index=self.tickers)
+
+    def get_covariance(self, annualized=True):
+        """
+        Get the covariance matrix of daily returns
+
+        Args:
+            annualized (bool): Scale to annual figures
+
+        Returns:
+            pandas.DataFrame: Covariance matrix labelled by ticker
+        """
+        covariance = self.covariance * (TRADING_DAYS if annualized else 1)
+        return pd.DataFrame(covariance, index=self.tickers, columns=self.tickers)
+
+    def get_drawdown_series(self):
+        """
+        Get the drawdown of the portfolio over time
+
+        Returns:
+            pandas.Series: Drawdown from the running peak for each date
+        """
+        values = np.cumprod(1 + self.portfolio_returns)
+        peaks = np.maximum.accumulate(np.maximum(values, 1.0))
+        return pd.Series(values / peaks - 1, index=self.dates[1:])
@@ -0,0 +1,177 @@
+"""
+Headless bulk precompute job for price history, technical indicators and ratios
+
+Runs outside Streamlit over a list of tickers with a process pool and writes
+the results to the local columnar store read by the UI. Schedule it with cron
+or any job runner, e.g.:
+
+    python -m utils.precompute --period 1y --workers 8
+    python -m utils.precompute --tickers AAPL MSFT NVDA --period 5y
+    python -m utils.precompute --tickers-file universe.txt
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.stock_data import get_stock_data, get_available_tickers
+from utils.technical_analysis import calculate_indicators
+from utils.fundamental_analysis import fetch_financial_ratios
+from utils.precomputed_store import save_precomputed_indicators, save_precomputed_ratios
+
+STAGES = ["fetch", "indicators", "ratios", "write"]
+
+def precompute_ticker(ticker, period="1y"):
+    """
+    Compute and store indicators for one ticker and fetch its ratios
+
+    The indicators are written before the ratios are fetched, so a failed
+    ratios download does not discard them; it is reported as ratios_error.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+
+    Returns:
+        dict: Ticker, raw ratios, per-stage timings in seconds, error message of
+            the indicators (if any) and error message of the ratios (if any)
+    """
+    timings = dict.fromkeys(STAGES, 0.0)
+    result = {"ticker": ticker, "ratios": None, "timings": timings, "error": None, "ratios_error": None}
+
+    try:
+        start = time.perf_counter()
+        stock_data = get_stock_data(ticker, period=period)
+        timings["fetch"] = time.perf_counter() - start
+        if stock_data is None or stock_data.empty:
+            result["error"] = "no price data"
+            return result
+
+        start = time.perf_counter()
+        data = calculate_indicators(stock_data)
+        timings["indicators"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_precomputed_indicators(ticker, period, data)
+        timings["write"] = time.perf_counter() - start
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    try:
+        start = time.perf_counter()
+        result["ratios"] = fetch_financial_ratios(ticker)
+        timings["ratios"] = time.perf_counter() - start
+    except Exception as e:
+        result["ratios_error"] = str(e)
+
+    return result
+
+def run_precompute(tickers, period="1y", workers=None):
+    """
+    Precompute indicators and ratios for many tickers in parallel
+
+    Args:
+        tickers (list): Stock ticker symbols
+        period (str): Data period
+        workers (int, optional): Number of worker processes (defaults to CPU count)
+
+    Returns:
+        dict: Summary with wall time, per-stage totals, failed tickers, tickers
+            whose ratios failed and the error of the ratios table write (if any)
+    """
+    workers = workers or os.cpu_count() or 1
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+
+    stage_totals = dict.fromkeys(STAGES, 0.0)
+    ratios = {}
+    failed = {}
+    ratio_failures = {}
+    ratios_write_error = None
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(precompute_ticker, ticker, period) for ticker in tickers]
+        for future in as_completed(futures):
+            result = future.result()
+            for stage, seconds in result["timings"].items():
+                stage_totals[stage] += seconds
+            if result["ratios"] is not None:
+                ratios[result["ticker"]] = result["ratios"]
+            if result["error"]:
+                failed[result["ticker"]] = result["error"]
+            if result["ratios_error"]:
+                ratio_failures[result["ticker"]] = result["ratios_error"]
+
+    # One bad table must not lose the summary of everything computed above
+    start = time.perf_counter()
+    if ratios:
+        try:
+            save_precomputed_ratios(ratios)
+        except Exception as e:
+            ratios_write_error = str(e)
+    stage_totals["write"] += time.perf_counter() - start
+
+    return {
+        "tickers": len(tickers),
+        "succeeded": len(tickers) - len(failed),
+        "workers": workers,
+        "wall_seconds": time.perf_counter() - wall_start,
+        "stage_seconds": stage_totals,
+        "failed": failed,
+        "ratio_failures": ratio_failures,
+        "ratios_write_error": ratios_write_error
+    }
+
+def format_report(summary):
+    """
+    Format a precompute summary as a plain-text throughput report
+
+    Args:
+        summary (dict): Output of run_precompute
+
+    Returns:
+        str: Report with per-stage and overall tickers/sec
+    """
+    workers = summary["workers"]
+    count = summary["tickers"]
+    lines = [
+        f"Precomputed {summary['succeeded']}/{count} tickers with {workers} workers "
+        f"in {summary['wall_seconds']:.2f}s ({count / summary['wall_seconds']:.2f} tickers/sec)",
+        "",
+        f"{'stage':<12}{'busy s':>10}{'tickers/sec':>14}"
+    ]
+
+    for stage, seconds in summary["stage_seconds"].items():
+        # Stage throughput across all workers, assuming they run the stage in parallel
+        rate = count * workers / seconds if seconds > 0 else float("inf")
+        lines.append(f"{stage:<12}{seconds:>10.2f}{rate:>14.2f}")
+
+    for ticker, error in sorted(summary["failed"].items()):
+        lines.append(f"FAILED {ticker}: {error}")
+    for ticker, error in sorted(summary["ratio_failures"].items()):
+        lines.append(f"RATIOS FAILED {ticker}: {error}")
+    if summary["ratios_write_error"]:
+        lines.append(f"RATIOS NOT SAVED: {summary['ratios_write_error']}")
+
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute indicators and financial ratios for a ticker universe")
+    parser.add_argument("--tickers", nargs="+", help="Ticker symbols (defaults to the popular tickers list)")
+    parser.add_argument("--tickers-file", help="File with one ticker symbol per line")
+    parser.add_argument("--period", default="1y", help="Data period (default: 1y)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    tickers = list(args.tickers or [])
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not tickers:
+        tickers = get_available_tickers()
+
+    summary = run_precompute(tickers, period=args.period, workers=args.workers)
+    print(format_report(summary))
+
+if __name__ == "__main__":
+    main()
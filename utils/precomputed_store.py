@@ -0,0 +1,103 @@
+import os
+import time
+import pandas as pd
+from utils.storage import get_data_path
+
+# Precomputed results older than this are ignored and computed live instead
+MAX_AGE_SECONDS = float(os.environ.get("PRECOMPUTE_MAX_AGE_HOURS", "24")) * 3600
+
+def _indicators_path(ticker, period):
+    """Path of the precomputed indicator frame for a ticker and period"""
+    return get_data_path("precomputed", period, "indicators", f"{ticker.upper()}.parquet")
+
+def _ratios_path():
+    """Path of the precomputed financial ratios table"""
+    return get_data_path("precomputed", "ratios.parquet")
+
+def _is_fresh(path, max_age):
+    """Check that a file exists and is younger than max_age seconds"""
+    try:
+        return time.time() - os.path.getmtime(path) <= max_age
+    except OSError:
+        return False
+
+def save_precomputed_indicators(ticker, period, data):
+    """
+    Store a DataFrame of prices with technical indicators
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period the indicators were computed over
+        data (pandas.DataFrame): Output of calculate_indicators
+    """
+    path = _indicators_path(ticker, period)
+    data.to_parquet(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+def load_precomputed_indicators(ticker, period, max_age=MAX_AGE_SECONDS):
+    """
+    Load precomputed technical indicators if a fresh copy exists
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+        max_age (float): Maximum age in seconds
+
+    Returns:
+        pandas.DataFrame: Prices with indicators (None if missing or stale)
+    """
+    path = _indicators_path(ticker, period)
+    if not _is_fresh(path, max_age):
+        return None
+
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+def save_precomputed_ratios(ratios):
+    """
+    Store raw financial ratios for many tickers in one columnar table
+
+    Existing rows for other tickers are kept.
+
+    Args:
+        ratios (dict): Mapping of ticker symbol to a dict of numeric ratios
+    """
+    path = _ratios_path()
+    table = pd.DataFrame.from_dict(ratios, orient="index")
+    if os.path.exists(path):
+        try:
+            existing = pd.read_parquet(path)
+            table = pd.concat([existing.drop(index=table.index, errors="ignore"), table])
+        except (OSError, ValueError):
+            pass
+
+    table.to_parquet(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+def load_precomputed_ratios(ticker, max_age=MAX_AGE_SECONDS):
+    """
+    Load precomputed raw financial ratios if a fresh copy exists
+
+    Args:
+        ticker (str): Stock ticker symbol
+        max_age (float): Maximum age in seconds
+
+    Returns:
+        dict: Numeric financial ratios (None if missing or stale)
+    """
+    path = _ratios_path()
+    if not _is_fresh(path, max_age):
+        return None
+
+    try:
+        table = pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+    ticker = ticker.upper()
+    if ticker not in table.index:
+        return None
+
+    return table.loc[ticker].to_dict()
@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+import pandas as pd
+import numpy as np
+from utils.storage import get_data_path
+from utils.instrumentation import timed
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Relative tolerance when checking locally re-adjusted prices against a fresh download
+ADJUSTMENT_TOLERANCE = 1e-3
+
+# Longest gap between the requested start date and the first stored bar (weekends, holidays)
+START_TOLERANCE = pd.Timedelta(days=7)
+
+def _store_paths(ticker):
+    """Paths of the stored price history and its metadata for a ticker"""
+    base = get_data_path("prices", ticker.upper())
+    return base + ".parquet", base + ".json"
+
+def load_history(ticker):
+    """
+    Load the stored daily price history of a stock
+
+    Args:
+        ticker (str): Stock ticker symbol
+
+    Returns:
+        tuple: (pandas.DataFrame, dict) with the history and its metadata, or (None, None)
+    """
+    data_path, meta_path = _store_paths(ticker)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None, None
+
+    try:
+        history = pd.read_parquet(data_path)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return history, meta
+    except (OSError, ValueError):
+        return None, None
+
+def save_history(ticker, history, meta):
+    """
+    Store the daily price history of a stock
+
+    Args:
+        ticker (str): Stock ticker symbol
+        history (pandas.DataFrame): Daily OHLCV data including the action columns
+        meta (dict): Metadata such as the covered period
+    """
+    data_path, meta_path = _store_paths(ticker)
+    # Unique temporary names so concurrent writers never clobber each other's files
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    history.to_parquet(data_path + suffix)
+    os.replace(data_path + suffix, data_path)
+    with open(meta_path + suffix, "w") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + suffix, meta_path)
+
+def _day_count(period):
+    """Number of trading days for day-count periods such as '5d' (None otherwise)"""
+    if period.endswith("d") and period[:-1].isdigit():
+        return int(period[:-1])
+    return None
+
+def get_period_start(period, now=None):
+    """
+    Get the first calendar date covered by a yfinance period
+
+    Args:
+        period (str): Data period (e.g., '1mo', '1y', 'ytd', 'max')
+        now (pandas.Timestamp, optional): Reference time, defaults to now
+
+    Returns:
+        pandas.Timestamp: Start date (None for 'max' and day-count periods)
+    """
+    now = pd.Timestamp.now() if now is None else now
+    if period == "max" or _day_count(period):
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    if period.endswith("mo"):
+        return (now - pd.DateOffset(months=int(period[:-2]))).normalize()
+    if period.endswith("y"):
+        return (now - pd.DateOffset(years=int(period[:-1]))).normalize()
+    return None
+
+def _covers(history, meta, period):
+    """Check whether stored history reaches back far enough for a period"""
+    if meta.get("period") == "max":
+        return True
+    if period == "max":
+        return False
+    if _day_count(period):
+        return len(history) >= _day_count(period)
+
+    start = get_period_start(period)
+    first = history.index[0].tz_localize(None) if history.index.tz is not None else history.index[0]
+    return first <= start + START_TOLERANCE
+
+def _slice_period(history, period):
+    """Cut stored history down to the requested period"""
+    if period == "max":
+        return history
+    if _day_count(period):
+        return history.iloc[-_day_count(period):]
+
+    start = get_period_start(period)
+    if history.index.tz is not None:
+        start = start.tz_localize(history.index.tz)
+    return history[history.index >= start]
+
+def find_new_actions(history, delta):
+    """
+    Find dividends and splits in a delta download that the stored history does not know about
+
+    Args:
+        history (pandas.DataFrame): Stored daily history
+        delta (pandas.DataFrame): Freshly downloaded bars overlapping the end of the history
+
+    Returns:
+        pandas.DataFrame: Rows of delta carrying new corporate actions
+    """
+    action_columns = [c for c in ['Dividends', 'Stock Splits'] if c in delta.columns]
+    if not action_columns:
+        return delta.iloc[0:0]
+
+    actions = delta[action_columns].fillna(0)
+    actions = actions[(actions != 0).any(axis=1)]
+    if actions.empty:
+        return actions
+
+    known = history.reindex(actions.index)[action_columns].fillna(0)
+    return actions[(actions != known).any(axis=1)]
+
+def apply_corporate_actions(history, delta, actions):
+    """
+    Re-adjust stored prices for new dividends and splits, in place
+
+    Only rows dated before each action are touched, mirroring the backward
+    adjustment yfinance applies to its own auto-adjusted history.
+
+    Args:
+        history (pandas.DataFrame): Stored daily history (modified in place)
+        delta (pandas.DataFrame): Freshly downloaded bars containing the actions
+        actions (pandas.DataFrame): New actions as returned by find_new_actions
+    """
+    if history['Volume'].dtype.kind != 'f':
+        history['Volume'] = history['Volume'].astype(float)
+
+    for date, action in actions.iterrows():
+        affected = history.index < date
+        if not affected.any():
+            continue
+
+        split = action.get('Stock Splits', 0)
+        if split and split > 0:
+            history.loc[affected, PRICE_COLUMNS] /= split
+            history.loc[affected, 'Volume'] *= split
+
+        dividend = action.get('Dividends', 0)
+        if dividend and dividend > 0:
+            # Adjustment factor uses the unadjusted close of the day before the ex-date
+            stored_before = history.loc[affected, 'Close']
+            delta_before = delta.loc[(delta.index < date) & (delta.index > stored_before.index[-1]), 'Close']
+            if delta_before.empty:
+                prev_close = stored_before.iloc[-1]
+            else:
+                # Downloaded bars before the ex-date already include this dividend's adjustment
+                prev_close = delta_before.iloc[-1] + dividend
+            if prev_close > dividend:
+                history.loc[affected, PRICE_COLUMNS] *= 1 - dividend / prev_close
+
+    history['Volume'] = history['Volume'].round()
+
+def _merge_delta(history, delta):
+    """
+    Append a delta download to stored history, re-adjusting for new corporate actions
+
+    Returns:
+        pandas.DataFrame: Updated history, or None if the stored prices no longer match
+        the upstream adjustment and a full download is required
+    """
+    overlap = delta.index[0]
+    if overlap not in history.index:
+        return None
+
+    actions = find_new_actions(history, delta)
+    if not actions.empty:
+        apply_corporate_actions(history, delta, actions)
+
+    # The first delta bar is also stored and complete; both must agree after adjustment
+    stored_close = history.at[overlap, 'Close']
+    fresh_close = delta.at[overlap, 'Close']
+    if not np.isclose(stored_close, fresh_close, rtol=ADJUSTMENT_TOLERANCE):
+        return None
+
+    merged = pd.concat([history[history.index < overlap], delta])
+    return merged[~merged.index.duplicated(keep='last')]
+
+@timed("fetch")
+def download_history(stock, **kwargs):
+    """
+    Download bars from yfinance, timed as the upstream price fetch
+
+    Args:
+        stock (yfinance.Ticker): Ticker object
+        **kwargs: Arguments of yfinance's Ticker.history
+
+    Returns:
+        pandas.DataFrame: Downloaded bars (empty if none)
+    """
+    return stock.history(**kwargs)
+
+@timed("load")
+def get_stored_history(ticker, period="1y"):
+    """
+    Get daily price history from the local store, downloading only new bars
+
+    Stored history is topped up with a small delta download that overlaps the
+    last complete stored bar. New dividends and splits in the delta are applied
+    to the stored range locally, so the history stays consistent with
+    yfinance's adjusted prices without re-downloading it.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period (e.g., '1mo', '1y', '10y', 'ytd', 'max')
+
+    Returns:
+        pandas.DataFrame: Daily OHLCV history for the period (None if unavailable)
+    """
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    history, meta = load_history(ticker)
+
+    merged = None
+    fetch_period = period
+    if history is not None and len(history) >= 2 and _covers(history, meta, period):
+        # On a mismatch the whole stored range is downloaded again
+        fetch_period = meta["period"]
+
+        # Overlap with the second-to-last bar; the last one may have been a partial day
+        delta = download_history(stock, start=history.index[-2].strftime('%Y-%m-%d'), interval="1d", actions=True)
+        if delta.empty:
+            merged = history
+        else:
+            merged = _merge_delta(history, delta)
+
+    if merged is None:
+        merged = download_history(stock, period=fetch_period, interval="1d", actions=True)
+        if merged.empty:
+            return None
+        meta = {"period": fetch_period}
+
+    try:
+        save_history(ticker, merged, meta)
+    except OSError:
+        pass
+
+    return _slice_period(merged, period)
@@ -0,0 +1,141 @@
+"""
+Offline lexicon-based sentiment scoring for financial news
+
+Scores come from a small finance lexicon (word valences from -3 to +3) with
+negation and intensifier handling; nothing is downloaded or called remotely.
+Articles are scored once, when they enter the news store.
+"""
+import math
+import re
+
+# Word valences, from -3 (very negative) to +3 (very positive)
+FINANCE_LEXICON = {
+    # Positive
+    "accelerate": 1, "accelerates": 1, "accelerating": 1, "advance": 1, "advances": 1,
+    "approval": 2, "approved": 2, "approves": 2, "beat": 2, "beats": 2, "boost": 2,
+    "boosted": 2, "boosts": 2, "breakthrough": 3, "bullish": 2, "buy": 1, "climb": 1,
+    "climbed": 1, "climbs": 1, "confident": 2, "dividend": 1, "exceed": 2, "exceeded": 2,
+    "exceeds": 2, "expand": 1, "expands": 1, "expansion": 1, "favorable": 2, "gain": 2,
+    "gained": 2, "gains": 2, "grew": 1, "grow": 1, "growth": 1, "grows": 1, "high": 1,
+    "higher": 1, "improve": 2, "improved": 2, "improvement": 2, "improves": 2,
+    "innovative": 2, "jump": 2, "jumped": 2, "jumps": 2, "momentum": 1, "opportunity": 1,
+    "opportunities": 1, "optimistic": 2, "outpace": 2, "outperform": 2, "outperformed": 2,
+    "outperforms": 2, "positive": 2, "profit": 1, "profitable": 2, "profits": 1,
+    "rally": 2, "rallied": 2, "rallies": 2, "rebound": 1, "rebounds": 1, "record": 2,
+    "recover": 1, "recovered": 1, "recovery": 1, "resilience": 2, "resilient": 2,
+    "rise": 1, "rises": 1, "rising": 1, "robust": 2, "soar": 3, "soared": 3, "soars": 3,
+    "solid": 1, "strength": 2, "strong": 2, "stronger": 2, "success": 2, "successful": 2,
+    "surge": 3, "surged": 3, "surges": 3, "top": 1, "tops": 1, "upbeat": 2,
+    "upgrade": 2, "upgraded": 2, "upgrades": 2, "upside": 1, "win": 2, "wins": 2,
+    # Negative
+    "bankrupt": -3, "bankruptcy": -3, "bearish": -2, "challenge": -1, "challenges": -1,
+    "collapse": -3, "collapsed": -3, "concern": -1, "concerns": -1, "crash": -3,
+    "crashed": -3, "cut": -1, "cuts": -1, "decline": -2, "declined": -2, "declines": -2,
+    "default": -3, "deficit": -2, "delay": -1, "delayed": -1, "delays": -1, "disappoint": -2,
+    "disappointed": -2, "disappointing": -2, "disappoints": -2, "downgrade": -2,
+    "downgraded": -2, "downgrades": -2, "downside": -1, "drop": -2, "dropped": -2,
+    "drops": -2, "fall": -2, "falling": -2, "falls": -2, "fear": -2, "fears": -2,
+    "fell": -2, "fined": -2, "fraud": -3, "headwind": -1, "headwinds": -1,
+    "investigation": -2, "lawsuit": -2, "layoff": -2, "layoffs": -2, "lose": -2,
+    "loses": -2, "loss": -2, "losses": -2, "low": -1, "lower": -1, "miss": -2,
+    "missed": -2, "misses": -2, "negative": -2, "plunge": -3, "plunged": -3,
+    "plunges": -3, "probe": -2, "recall": -2, "recession": -2, "risk": -1, "risks": -1,
+    "sell": -1, "selloff": -2, "slow": -1, "slowdown": -2, "slower": -1,
+    "slump": -2, "slumped": -2, "slumps": -2, "tumble": -2, "tumbled": -2, "tumbles": -2,
+    "uncertain": -1, "uncertainty": -1, "underperform": -2, "volatile": -1, "warn": -2,
+    "warning": -2, "warns": -2, "weak": -2, "weaker": -2, "weakness": -2, "worse": -2,
+    "worst": -3, "writedown": -2
+}
+
+# Words that flip the valence of the sentiment words following them
+NEGATIONS = frozenset("""
+not no never neither nor none without hardly barely lack lacks cannot
+""".split())
+
+# Words that strengthen the sentiment word following them
+INTENSIFIERS = {
+    "very": 1.3, "sharply": 1.5, "significantly": 1.4, "strongly": 1.4, "substantially": 1.4,
+    "steep": 1.4, "massive": 1.5, "huge": 1.5, "extremely": 1.5, "slightly": 0.6, "modest": 0.7,
+    "modestly": 0.7
+}
+
+# Tokens after a negation that are still negated
+NEGATION_SCOPE = 3
+
+# Negated valences are flipped and damped ("not strong" is milder than "weak")
+NEGATION_FACTOR = -0.75
+
+# Normalization constant: a raw valence x maps to x / sqrt(x^2 + NORMALIZATION_ALPHA)
+NORMALIZATION_ALPHA = 15
+
+# Titles carry more of an article's tone than summaries
+TITLE_WEIGHT = 2
+
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+def _raw_valence(text):
+    """Sum of the word valences of a text, with negation and intensifiers applied"""
+    total = 0.0
+    negated_until = -1
+    boost = 1.0
+
+    for position, word in enumerate(WORD_PATTERN.findall((text or "").lower())):
+        if word in NEGATIONS or word.endswith("n't"):
+            negated_until = position + NEGATION_SCOPE
+            continue
+        if word in INTENSIFIERS:
+            boost = INTENSIFIERS[word]
+            continue
+
+        valence = FINANCE_LEXICON.get(word)
+        if valence is not None:
+            if position <= negated_until:
+                valence *= NEGATION_FACTOR
+            total += valence * boost
+        boost = 1.0
+
+    return total
+
+def _normalize(raw):
+    """Map a raw valence to [-1, 1]"""
+    return raw / math.sqrt(raw * raw + NORMALIZATION_ALPHA)
+
+def score_text(text):
+    """
+    Score the sentiment of a text
+
+    Args:
+        text (str): Headline or summary
+
+    Returns:
+        float: Score from -1 (negative) to 1 (positive), 0 if neutral
+    """
+    return _normalize(_raw_valence(text))
+
+def score_article(title, summary=None):
+    """
+    Score the sentiment of a news article
+
+    The title is weighted TITLE_WEIGHT times as much as the summary.
+
+    Args:
+        title (str): Headline
+        summary (str, optional): Summary text
+
+    Returns:
+        float: Score from -1 (negative) to 1 (positive)
+    """
+    return _normalize(TITLE_WEIGHT * _raw_valence(title) + _raw_valence(summary))
+
+def get_sentiment_label(score, threshold=0.05):
+    """
+    Get a label for a sentiment score
+
+    Returns:
+        str: 'positive', 'negative' or 'neutral'
+    """
+    if score > threshold:
+        return "positive"
+    if score < -threshold:
+        return "negative"
+    return "neutral"
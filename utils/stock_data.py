@@ -1,8 +1,28 @@
-import yfinance as yf
 import pandas as pd
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.price_store import get_stored_history, download_history
+from utils.cache import memory_cache, show_error
+from utils.instrumentation import timed
 
-@st.cache_data(ttl=3600)  # Cache data for 1 hour
+# Higher timeframes derived locally from daily bars instead of a separate download.
+# Bars are labelled by the start of the bucket, the same way yfinance labels them.
+RESAMPLE_RULES = {
+    "1wk": "W-MON",
+    "1mo": "MS",
+    "3mo": "QS"
+}
+
+# Bar sizes offered in the UI, mapped to get_stock_data intervals
+TIMEFRAMES = {
+    "Daily": "1d",
+    "Weekly": "1wk",
+    "Monthly": "1mo",
+    "Quarterly": "3mo"
+}
+
+@memory_cache(ttl=3600, on_error=show_error("Error fetching stock data"))  # Cache data for 1 hour
+@timed("load")
 def get_stock_data(ticker, period="1y", interval="1d"):
     """
     Get stock historical data using yfinance
@@ -15,17 +35,114 @@ def get_stock_data(ticker, period="1y", interval="1d"):
     Returns:
         pandas.DataFrame: Historical stock data
     """
-    try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period, interval=interval)
-        if hist.empty:
+    if interval in RESAMPLE_RULES:
+        # Derive weekly/monthly/quarterly bars from the cached daily series
+        daily = get_stock_data(ticker, period=period, interval="1d")
+        if daily is None:
+            return None
+        return resample_ohlcv(daily, RESAMPLE_RULES[interval])
+    
+    if interval == "1d":
+        # Daily bars come from the local store, topped up with only the new bars
+        hist = get_stored_history(ticker, period=period)
+        if hist is None or hist.empty:
             return None
         return hist
-    except Exception as e:
-        st.error(f"Error fetching stock data: {e}")
+    
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    hist = download_history(stock, period=period, interval=interval)
+    if hist.empty:
         return None
+    return hist
+
+def resample_ohlcv(df, rule):
+    """
+    Aggregate OHLCV bars into a higher timeframe
+    
+    Args:
+        df (pandas.DataFrame): OHLCV data with a DatetimeIndex
+        rule (str): Pandas offset alias of the target bar size (e.g., 'W-MON', 'MS', 'QS')
+    
+    Returns:
+        pandas.DataFrame: Resampled OHLCV data
+    """
+    if df is None or df.empty:
+        return df
+    
+    aggregation = {
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    }
+    if 'Dividends' in df.columns:
+        aggregation['Dividends'] = 'sum'
+    aggregation = {column: how for column, how in aggregation.items() if column in df.columns}
+    
+    resampled = df.resample(rule, closed='left', label='left').agg(aggregation)
+    
+    if 'Stock Splits' in df.columns:
+        # Splits compound multiplicatively; yfinance uses 0 for "no split"
+        splits = df['Stock Splits'].replace(0, 1).resample(rule, closed='left', label='left').prod()
+        resampled['Stock Splits'] = splits.replace(1, 0)
+    
+    # Drop buckets without any trading (e.g. holiday-only weeks)
+    return resampled.dropna(subset=['Close'])
+
+def fetch_batch(fetch_func, tickers, max_workers=8, **kwargs):
+    """
+    Call a per-ticker fetch function for several tickers concurrently
+    
+    Args:
+        fetch_func (callable): Function taking a ticker symbol as first argument
+        tickers (list): Stock ticker symbols
+        max_workers (int): Maximum number of concurrent calls
+        **kwargs: Extra keyword arguments passed to fetch_func
+    
+    Returns:
+        dict: Mapping of ticker symbol to the result of fetch_func
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    
+    ctx = get_script_run_ctx()
+    
+    def fetch(ticker):
+        # Attach the script context so cache messages and errors reach the page
+        if ctx is not None:
+            add_script_run_ctx(ctx=ctx)
+        return fetch_func(ticker, **kwargs)
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        results = list(executor.map(fetch, tickers))
+    
+    return dict(zip(tickers, results))
 
-@st.cache_data(ttl=3600)  # Cache data for 1 hour
+def get_stock_data_batch(tickers, period="1y", interval="1d", max_workers=8):
+    """
+    Get historical data for several stock tickers in one batch
+    
+    Each ticker goes through get_stock_data, so tickers that were already
+    viewed are served from its cache and only the misses are downloaded,
+    concurrently.
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        period (str): Data period (see get_stock_data)
+        interval (str): Data interval (see get_stock_data)
+        max_workers (int): Maximum number of concurrent downloads
+    
+    Returns:
+        dict: Mapping of ticker symbol to its historical data (None if unavailable)
+    """
+    return fetch_batch(get_stock_data, tickers, max_workers=max_workers, period=period, interval=interval)
+
+@memory_cache(ttl=3600, on_error=show_error("Error fetching stock info"))  # Cache data for 1 hour
+@timed("fetch")
 def get_stock_info(ticker):
     """
     Get general information about a stock
@@ -36,15 +153,14 @@ def get_stock_info(ticker):
     Returns:
         dict: Stock information
     """
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        return info
-    except Exception as e:
-        st.error(f"Error fetching stock info: {e}")
-        return None
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    info = stock.info
+    return info
 
-@st.cache_data(ttl=86400)  # Cache data for 1 day
+@memory_cache(ttl=86400, on_error=show_error("Error fetching company overview"))  # Cache data for 1 day
+@timed("fetch")
 def get_company_overview(ticker):
     """
     Get company overview information
@@ -55,33 +171,31 @@ def get_company_overview(ticker):
     Returns:
         dict: Company overview information
     """
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        overview = {
-            "longName": info.get("longName", "N/A"),
-            "shortName": info.get("shortName", "N/A"),
-            "sector": info.get("sector", "N/A"),
-            "industry": info.get("industry", "N/A"),
-            "website": info.get("website", "N/A"),
-            "longBusinessSummary": info.get("longBusinessSummary", "N/A"),
-            "fullTimeEmployees": info.get("fullTimeEmployees", "N/A"),
-            "country": info.get("country", "N/A"),
-            "city": info.get("city", "N/A"),
-            "address": info.get("address1", "N/A"),
-            "logo_url": info.get("logo_url", None),
-            "exchange": info.get("exchange", "N/A"),
-            "marketCap": info.get("marketCap", "N/A"),
-            "currency": info.get("currency", "USD")
-        }
-        
-        return overview
-    except Exception as e:
-        st.error(f"Error fetching company overview: {e}")
-        return None
+    import yfinance as yf
+    
+    stock = yf.Ticker(ticker)
+    info = stock.info
+    
+    overview = {
+        "longName": info.get("longName", "N/A"),
+        "shortName": info.get("shortName", "N/A"),
+        "sector": info.get("sector", "N/A"),
+        "industry": info.get("industry", "N/A"),
+        "website": info.get("website", "N/A"),
+        "longBusinessSummary": info.get("longBusinessSummary", "N/A"),
+        "fullTimeEmployees": info.get("fullTimeEmployees", "N/A"),
+        "country": info.get("country", "N/A"),
+        "city": info.get("city", "N/A"),
+        "address": info.get("address1", "N/A"),
+        "logo_url": info.get("logo_url", None),
+        "exchange": info.get("exchange", "N/A"),
+        "marketCap": info.get("marketCap", "N/A"),
+        "currency": info.get("currency", "USD")
+    }
+    
+    return overview
 
-@st.cache_data(ttl=86400)  # Cache data for 1 day
+@memory_cache(ttl=86400)  # Cache data for 1 day
 def get_available_tickers():
     """
     Get a list of popular stock tickers as examples
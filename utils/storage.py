@@ -0,0 +1,21 @@
+import os
+
+# Local data directory for persisted app state (watchlists, stores, caches)
+DATA_DIR = os.environ.get(
+    "STOCK_APP_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+
+def get_data_path(*parts):
+    """
+    Get a path inside the local data directory, creating parent folders as needed
+
+    Args:
+        *parts (str): Path components relative to the data directory
+
+    Returns:
+        str: Absolute path of the file or folder
+    """
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
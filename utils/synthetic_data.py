@@ -0,0 +1,462 @@
+"""
+Seeded synthetic market data shaped like yfinance results
+
+Generates daily OHLCV history, .info snapshots and news for any number of
+synthetic tickers, reproducibly from a seed, for scale and load tests that
+must run offline. Prices follow a geometric Brownian motion with calm and
+volatile regimes, overnight gaps and earnings jumps. Splits, reverse splits
+and dividends are recorded in the action columns, and prices are adjusted for
+them the same way yfinance's default auto_adjust does.
+
+Example:
+
+    market = SyntheticMarket(seed=42)
+    tickers = synthetic_tickers(1000, seed=42)
+    df = market.history(tickers[0], period="10y")
+
+    with use_synthetic_data(market, data_dir=tmp):
+        page.show()  # every yfinance / yahooquery call is answered by the market
+"""
+import contextlib
+import zlib
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from utils import storage
+from utils.cache import clear_all_caches
+from utils.price_store import get_period_start
+from utils.stock_data import RESAMPLE_RULES, resample_ohlcv
+
+EXCHANGE_TZ = "America/New_York"
+
+# Last bar of every synthetic history unless another end date is given
+DEFAULT_END = "2025-12-31"
+
+TRADING_DAYS = 252
+
+# Bars between dividends and between earnings reports
+QUARTER_BARS = 63
+
+# Traded prices outside this range trigger a split or a reverse split
+SPLIT_THRESHOLD = 400
+REVERSE_SPLIT_THRESHOLD = 1
+
+# Longest synthetic listing history in years
+MAX_YEARS = 40
+
+SECTORS = {
+    "Technology": ["Software—Infrastructure", "Semiconductors", "Consumer Electronics"],
+    "Healthcare": ["Biotechnology", "Medical Devices", "Drug Manufacturers—General"],
+    "Financial Services": ["Banks—Diversified", "Asset Management", "Insurance—Diversified"],
+    "Consumer Cyclical": ["Internet Retail", "Auto Manufacturers", "Restaurants"],
+    "Energy": ["Oil & Gas Integrated", "Oil & Gas E&P"],
+    "Industrials": ["Aerospace & Defense", "Railroads", "Specialty Industrial Machinery"],
+    "Communication Services": ["Internet Content & Information", "Entertainment"],
+    "Utilities": ["Utilities—Regulated Electric"]
+}
+
+PUBLISHERS = ["Reuters", "Bloomberg", "MarketWatch", "CNBC", "Barron's", "Motley Fool", "Zacks", "Benzinga",
+              "Yahoo Finance", "Investor's Business Daily"]
+
+# News headline templates by tone
+HEADLINES = {
+    "positive": [
+        "{company} beats estimates as revenue growth accelerates",
+        "{company} shares surge after analyst upgrade",
+        "{company} raises dividend on record profit",
+        "{company} rallies as demand outpaces supply",
+        "Why {company} stock is a strong buy after earnings"
+    ],
+    "negative": [
+        "{company} misses estimates, shares tumble",
+        "{company} stock falls after downgrade",
+        "{company} cuts guidance amid weak demand",
+        "{company} faces lawsuit and regulatory probe",
+        "{company} announces layoffs as losses widen"
+    ],
+    "neutral": [
+        "{company} to report quarterly results next week",
+        "{company} names new chief financial officer",
+        "What to watch in {company} earnings",
+        "{company} holds annual shareholder meeting",
+        "{company} completes previously announced acquisition"
+    ]
+}
+
+_NAME_PARTS = (
+    ["Ab", "Cor", "Del", "Ev", "Fen", "Gal", "Hel", "Ion", "Jun", "Kel", "Lum", "Mer", "Nov", "Or", "Pax",
+     "Quin", "Ros", "Sol", "Tor", "Ul", "Ver", "Wex", "Xan", "Zen"],
+    ["a", "e", "i", "o", "ar", "en", "ix", "on", "us", "yn"],
+    ["tech", "gen", "corp", "dyne", "tron", "vista", "point", "line", "works", "bridge"],
+    ["Inc.", "Corporation", "Holdings, Inc.", "Group", "Technologies Inc.", "Co."]
+)
+
+def _rng(seed, *keys):
+    """Generator seeded by the market seed and stable hashes of the keys (independent of PYTHONHASHSEED)"""
+    return np.random.default_rng([seed] + [zlib.crc32(str(key).encode()) for key in keys])
+
+def synthetic_tickers(count, seed=0):
+    """
+    Get unique synthetic ticker symbols
+
+    Args:
+        count (int): Number of symbols (at most 26**4)
+        seed (int): Seed of the symbol set
+
+    Returns:
+        list: Symbols of three or four upper-case letters
+    """
+    codes = _rng(seed, "tickers").choice(26 ** 4, size=count, replace=False)
+    symbols = []
+    for code in codes.tolist():
+        letters = []
+        for _ in range(4):
+            code, digit = divmod(code, 26)
+            letters.append(chr(ord("A") + digit))
+        # Drop a leading 'A' for a mix of three- and four-letter symbols
+        symbol = "".join(reversed(letters))
+        symbols.append(symbol[1:] if symbol[0] == "A" else symbol)
+    return symbols
+
+class SyntheticMarket:
+    """
+    Deterministic source of synthetic prices, company info and news
+
+    Every ticker's data depends only on the seed, the ticker and the end date,
+    so any period of its history is a slice of the same path.
+    """
+
+    def __init__(self, seed=0, end=DEFAULT_END):
+        self.seed = seed
+        self.end = pd.Timestamp(end).normalize()
+        self._histories = {}
+        # Business-day calendar shared by all tickers; building it per ticker dominates generation
+        self._calendar = pd.bdate_range(end=self.end, periods=MAX_YEARS * TRADING_DAYS, tz=EXCHANGE_TZ, name="Date")
+
+    def _full_history(self, ticker):
+        """Complete daily history of a ticker (generated once per market)"""
+        ticker = ticker.upper()
+        if ticker not in self._histories:
+            self._histories[ticker] = self._generate_history(ticker)
+        return self._histories[ticker]
+
+    def _generate_history(self, ticker):
+        rng = _rng(self.seed, ticker, "history")
+        bars = int(rng.integers(3, MAX_YEARS + 1)) * TRADING_DAYS
+        index = self._calendar[-bars:]
+
+        # Volatility regimes: alternating calm and volatile stretches of geometric length
+        calm_vol = rng.uniform(0.12, 0.4)
+        volatile_vol = calm_vol * rng.uniform(1.5, 2.5)
+        durations = []
+        while sum(durations) < bars:
+            durations.append(int(rng.geometric(1 / 150)))
+            durations.append(int(rng.geometric(1 / 30)))
+        volatile = np.resize(np.repeat(np.tile([False, True], len(durations) // 2), durations), bars)
+        sigma = np.where(volatile, volatile_vol, calm_vol) / np.sqrt(TRADING_DAYS)
+
+        # Overnight gaps, with earnings jumps once a quarter, then the intraday move
+        drift = rng.normal(0.08, 0.06) / TRADING_DAYS
+        gaps = rng.normal(0, 0.35, bars) * sigma
+        earnings = np.arange(int(rng.integers(0, QUARTER_BARS)), bars, QUARTER_BARS)
+        gaps[earnings] += rng.normal(0, 4, len(earnings)) * sigma[earnings]
+        intraday = drift - 0.5 * sigma ** 2 + rng.normal(0, 0.9, bars) * sigma
+
+        # Unadjusted path in the first share count; splits are found on it below
+        start_price = rng.uniform(5, 150)
+        log_close = np.log(start_price) + np.cumsum(gaps + intraday)
+        log_open = log_close - intraday
+        close = np.exp(log_close)
+        open_ = np.exp(log_open)
+        wick = np.abs(rng.normal(0, 0.5, (2, bars))) * sigma
+        high = np.maximum(open_, close) * np.exp(wick[0])
+        low = np.minimum(open_, close) * np.exp(-wick[1])
+
+        # Splits when the traded price runs far up, reverse splits (ratio < 1) when it collapses
+        splits = np.zeros(bars)
+        factor = 1.0
+        position = 0
+        while position < bars:
+            traded = close[position:] / factor
+            outside = np.flatnonzero((traded > SPLIT_THRESHOLD) | (traded < REVERSE_SPLIT_THRESHOLD))
+            if not len(outside):
+                break
+            position += int(outside[0])
+            if close[position] / factor > SPLIT_THRESHOLD:
+                ratio = float(rng.choice([2, 3, 4, 5]))
+            else:
+                ratio = float(rng.choice([0.1, 0.2]))
+            splits[position] = ratio
+            factor *= ratio
+            position += QUARTER_BARS
+
+        # Prices in today's share count, as yfinance reports them
+        open_, high, low, close = (series / factor for series in (open_, high, low, close))
+
+        # Quarterly dividends for payers, back-adjusted into earlier prices
+        dividends = np.zeros(bars)
+        if rng.random() < 0.45:
+            quarterly_yield = rng.uniform(0.002, 0.012)
+            ex_dates = np.arange(int(rng.integers(1, QUARTER_BARS)), bars, QUARTER_BARS)
+            dividends[ex_dates] = close[ex_dates - 1] * quarterly_yield
+            per_bar = np.ones(bars)
+            per_bar[ex_dates] = 1 - quarterly_yield
+            # Prices before an ex-date are scaled by (1 - dividend / previous close)
+            adjustment = np.append(np.cumprod(per_bar[::-1])[::-1][1:], 1.0)
+            open_, high, low, close = (series * adjustment for series in (open_, high, low, close))
+
+        # Volume (in today's share count) rises in volatile regimes and on large moves
+        base_volume = np.exp(rng.uniform(np.log(2e5), np.log(5e7)))
+        surprise = np.abs(gaps + intraday) / sigma
+        volume = base_volume * np.exp(rng.normal(0, 0.3, bars)) * (1 + 0.4 * surprise) * np.where(volatile, 1.5, 1.0)
+
+        return pd.DataFrame({
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume.astype(np.int64),
+            "Dividends": dividends,
+            "Stock Splits": splits
+        }, index=index)
+
+    def history(self, ticker, period="1mo", interval="1d", start=None, end=None, actions=True):
+        """
+        Get price history like yfinance.Ticker.history
+
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Data period (e.g., '5d', '1mo', '1y', 'ytd', 'max'), ignored if start is given
+            interval (str): '1d' or a bar size derived from it ('1wk', '1mo', '3mo')
+            start (str, optional): First date (YYYY-MM-DD)
+            end (str, optional): Date after the last bar (YYYY-MM-DD)
+            actions (bool): Include the Dividends and Stock Splits columns
+
+        Returns:
+            pandas.DataFrame: OHLCV history indexed by exchange-local dates
+        """
+        history = self._full_history(ticker)
+
+        if start is not None:
+            history = history[history.index >= pd.Timestamp(start).tz_localize(EXCHANGE_TZ)]
+        elif period.endswith("d") and period[:-1].isdigit():
+            history = history.iloc[-int(period[:-1]):]
+        elif period != "max":
+            first = get_period_start(period, now=self.end)
+            if first is None:
+                raise ValueError(f"Unsupported period: {period}")
+            history = history[history.index >= first.tz_localize(EXCHANGE_TZ)]
+        if end is not None:
+            history = history[history.index < pd.Timestamp(end).tz_localize(EXCHANGE_TZ)]
+
+        if interval in RESAMPLE_RULES:
+            history = resample_ohlcv(history, RESAMPLE_RULES[interval])
+        elif interval != "1d":
+            raise ValueError(f"Unsupported interval: {interval}")
+
+        if not actions:
+            history = history.drop(columns=["Dividends", "Stock Splits"])
+        return history.copy()
+
+    def company_name(self, ticker):
+        """Synthetic company name of a ticker"""
+        rng = _rng(self.seed, ticker.upper(), "name")
+        first, middle, last, suffix = (str(rng.choice(part)) for part in _NAME_PARTS)
+        return f"{first}{middle}{last} {suffix}"
+
+    def info(self, ticker):
+        """
+        Get a company snapshot like yfinance.Ticker.info
+
+        Valuation and share statistics are consistent with the price history;
+        about one in ten optional metrics is left out, as with real listings.
+
+        Args:
+            ticker (str): Stock ticker symbol
+
+        Returns:
+            dict: Info fields keyed by their yfinance names
+        """
+        ticker = ticker.upper()
+        rng = _rng(self.seed, ticker, "info")
+        history = self._full_history(ticker)
+        last_year = history.iloc[-TRADING_DAYS:]
+        price = float(history["Close"].iloc[-1])
+
+        sector = str(rng.choice(list(SECTORS)))
+        name = self.company_name(ticker)
+        shares = float(np.exp(rng.uniform(np.log(5e7), np.log(1.5e10))))
+        margin = float(rng.uniform(-0.1, 0.35))
+        revenue = price * shares / rng.uniform(0.8, 12)
+        eps = revenue * margin / shares
+        equity = price * shares / rng.uniform(1, 15)
+        dividend_rate = float(history["Dividends"].iloc[-TRADING_DAYS:].sum())
+
+        info = {
+            "symbol": ticker,
+            "quoteType": "EQUITY",
+            "longName": name,
+            "shortName": name.split(" ")[0],
+            "sector": sector,
+            "industry": str(rng.choice(SECTORS[sector])),
+            "website": f"https://www.{name.split(' ')[0].lower()}.example.com",
+            "longBusinessSummary": (
+                f"{name} operates in the {sector.lower()} sector. The company designs, develops and sells "
+                f"products and services to customers worldwide and was founded in {int(rng.integers(1900, 2015))}."
+            ),
+            "fullTimeEmployees": int(rng.integers(50, 300000)),
+            "country": "United States",
+            "city": str(rng.choice(["New York", "San Jose", "Austin", "Boston", "Chicago", "Seattle", "Atlanta"])),
+            "address1": f"{int(rng.integers(1, 9999))} Market Street",
+            "exchange": str(rng.choice(["NMS", "NYQ"])),
+            "currency": "USD",
+            "currentPrice": price,
+            "marketCap": int(price * shares),
+            "sharesOutstanding": int(shares),
+            "fiftyTwoWeekHigh": float(last_year["High"].max()),
+            "fiftyTwoWeekLow": float(last_year["Low"].min()),
+            "averageVolume": int(history["Volume"].iloc[-QUARTER_BARS:].mean()),
+            "totalRevenue": int(revenue),
+            "revenuePerShare": revenue / shares,
+            "profitMargins": margin,
+            "operatingMargins": margin + rng.uniform(0, 0.1),
+            "ebitdaMargins": margin + rng.uniform(0.05, 0.2),
+            "trailingEPS": eps,
+            "forwardEPS": eps * rng.uniform(0.8, 1.3),
+            "trailingPE": price / eps if eps > 0 else None,
+            "forwardPE": price / (eps * 1.1) if eps > 0 else None,
+            "pegRatio": float(rng.uniform(0.5, 3.5)),
+            "priceToBook": price * shares / equity,
+            "priceToSalesTrailing12Months": price * shares / revenue,
+            "enterpriseToEbitda": float(rng.uniform(4, 40)),
+            "returnOnEquity": revenue * margin / equity,
+            "returnOnAssets": revenue * margin / equity * rng.uniform(0.2, 0.6),
+            "debtToEquity": float(rng.uniform(0, 250)),
+            "currentRatio": float(rng.uniform(0.6, 4)),
+            "quickRatio": float(rng.uniform(0.4, 3)),
+            "earningsGrowth": float(rng.normal(0.08, 0.2)),
+            "revenueGrowth": float(rng.normal(0.06, 0.12))
+        }
+
+        if dividend_rate > 0:
+            info["dividendRate"] = dividend_rate
+            info["dividendYield"] = dividend_rate / price
+            info["payoutRatio"] = dividend_rate / eps if eps > 0 else 0.0
+
+        optional = [key for key in info if key not in ("symbol", "quoteType", "longName", "shortName", "currency",
+                                                       "currentPrice", "marketCap", "sector", "industry")]
+        for key in optional:
+            if rng.random() < 0.1:
+                del info[key]
+        return {key: value for key, value in info.items() if value is not None}
+
+    def news(self, ticker, count=10):
+        """
+        Get news like yfinance.Ticker.news (articles nested under 'content')
+
+        The tone of each headline leans with the stock's move over the week
+        before the article.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            count (int): Number of articles
+
+        Returns:
+            list: Raw news items, newest first
+        """
+        ticker = ticker.upper()
+        rng = _rng(self.seed, ticker, "news")
+        history = self._full_history(ticker)
+        company = self.company_name(ticker).split(" ")[0]
+
+        items = []
+        published = (self.end + timedelta(hours=16)).tz_localize(EXCHANGE_TZ)
+        for i in range(count):
+            published -= timedelta(minutes=int(rng.integers(30, 3 * 24 * 60)))
+            closes = history["Close"][history.index <= published].iloc[-6:]
+            weekly_return = closes.iloc[-1] / closes.iloc[0] - 1 if len(closes) > 1 else 0.0
+            positive = 0.35 + float(np.clip(weekly_return * 5, -0.3, 0.3))
+            tone = str(rng.choice(["positive", "negative", "neutral"], p=[positive, 0.65 - positive, 0.35]))
+            title = str(rng.choice(HEADLINES[tone])).format(company=company)
+            slug = title.lower().replace(" ", "-").replace(",", "").replace("'", "")
+            items.append({
+                "id": f"{ticker.lower()}-{self.seed}-{i}",
+                "content": {
+                    "title": title,
+                    "summary": f"{title}. {company} ({ticker}) shares last closed at {closes.iloc[-1]:.2f}.",
+                    "pubDate": published.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "provider": {"displayName": str(rng.choice(PUBLISHERS))},
+                    "canonicalUrl": {"url": f"https://news.example.com/{ticker.lower()}/{slug}-{i}"},
+                    "finance": {"stockTickers": [{"symbol": ticker}]}
+                }
+            })
+        return items
+
+class SyntheticTicker:
+    """Stand-in for yfinance.Ticker backed by a SyntheticMarket"""
+
+    def __init__(self, ticker, market):
+        self.ticker = ticker.upper()
+        self.market = market
+
+    def history(self, period="1mo", interval="1d", start=None, end=None, actions=True, **kwargs):
+        return self.market.history(self.ticker, period=period, interval=interval, start=start, end=end, actions=actions)
+
+    @property
+    def info(self):
+        return self.market.info(self.ticker)
+
+    @property
+    def news(self):
+        return self.market.news(self.ticker)
+
+class SyntheticQueryTicker:
+    """Stand-in for yahooquery.Ticker (news only) backed by a SyntheticMarket"""
+
+    def __init__(self, symbols, market):
+        self.symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        self.market = market
+
+    def news(self, count=25, start=None):
+        per_symbol = max(count // len(self.symbols), 1)
+        items = [item for symbol in self.symbols for item in self.market.news(symbol, per_symbol)]
+        return sorted(items, key=lambda item: item["content"]["pubDate"], reverse=True)[:count]
+
+@contextlib.contextmanager
+def use_synthetic_data(market=None, data_dir=None):
+    """
+    Answer every yfinance and yahooquery call from a synthetic market
+
+    Budgeted caches are cleared on entry and exit so real and synthetic
+    results never mix. Pass a temporary data_dir to keep synthetic prices and
+    news out of the local stores.
+
+    Args:
+        market (SyntheticMarket, optional): Data source, defaults to SyntheticMarket()
+        data_dir (str, optional): Data directory used while active
+
+    Yields:
+        SyntheticMarket: The active market
+    """
+    import yfinance
+
+    market = market or SyntheticMarket()
+    patches = [(yfinance, "Ticker", lambda ticker, *args, **kwargs: SyntheticTicker(ticker, market))]
+    try:
+        import yahooquery
+        patches.append((yahooquery, "Ticker", lambda symbols, *args, **kwargs: SyntheticQueryTicker(symbols, market)))
+    except ImportError:
+        pass
+    if data_dir is not None:
+        patches.append((storage, "DATA_DIR", data_dir))
+
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    clear_all_caches()
+    try:
+        for module, name, replacement in patches:
+            setattr(module, name, replacement)
+        yield market
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+        clear_all_caches()
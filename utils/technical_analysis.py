@@ -1,13 +1,13 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-import ta
-from ta.trend import SMAIndicator, EMAIndicator, MACD
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.volatility import BollingerBands, AverageTrueRange
-from ta.volume import OnBalanceVolumeIndicator, ChaikinMoneyFlowIndicator
+from utils.stock_data import get_stock_data
+from utils.precomputed_store import load_precomputed_indicators
+from utils.cache import memory_cache
+from utils.instrumentation import timed
 
-@st.cache_data
+@memory_cache
+@timed("compute")
 def calculate_indicators(df):
     """
     Calculate technical indicators for a given DataFrame of stock prices
@@ -21,6 +21,11 @@ def calculate_indicators(df):
     if df is None or df.empty:
         return None
     
+    from ta.trend import SMAIndicator, EMAIndicator, MACD
+    from ta.momentum import RSIIndicator, StochasticOscillator
+    from ta.volatility import BollingerBands, AverageTrueRange
+    from ta.volume import OnBalanceVolumeIndicator, ChaikinMoneyFlowIndicator
+    
     # Create a copy to avoid modifying the original dataframe
     result_df = df.copy()
     
@@ -67,6 +72,48 @@ def calculate_indicators(df):
     
     return result_df
 
+@memory_cache(ttl=3600)  # Cache data for 1 hour, like the prices it is checked against
+@timed("load")
+def get_precomputed_indicators(ticker, period):
+    """
+    Read the daily indicators written by the bulk precompute job
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+    
+    Returns:
+        pandas.DataFrame: Prices with indicators (None if missing or stale)
+    """
+    return load_precomputed_indicators(ticker, period)
+
+def get_stock_indicators(ticker, period="1y", interval="1d"):
+    """
+    Get stock prices with technical indicators, preferring precomputed results
+    
+    Precomputed daily indicators are only used while their prices match the
+    live (cached) prices bar for bar; once a new bar arrives or a close is
+    revised, the indicators are computed from the live prices instead.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+        interval (str): Data interval
+    
+    Returns:
+        pandas.DataFrame: Prices with indicators (None if no data is available)
+    """
+    stock_data = get_stock_data(ticker, period=period, interval=interval)
+    if stock_data is None or stock_data.empty:
+        return None
+    
+    if interval == "1d":
+        data = get_precomputed_indicators(ticker, period)
+        if data is not None and data.reindex(columns=stock_data.columns).equals(stock_data):
+            return data
+    
+    return calculate_indicators(stock_data)
+
 def get_indicator_description(indicator):
     """
     Returns description for a technical indicator
@@ -0,0 +1,156 @@
+"""
+Background cache warm-up for a freshly started server process
+
+Prefetches price history, info snapshots and technical indicators for the
+default and popular tickers, so the first visitors of a new replica are served
+from warm caches. Configured through environment variables:
+
+    WARMUP_ENABLED   set to 0 to disable the warm-up (default 1)
+    WARMUP_TICKERS   comma-separated tickers (default: AAPL and the Home page's popular stocks)
+    WARMUP_PERIOD    data period to warm (default 1y, the sidebar default)
+    WARMUP_WORKERS   concurrent tickers (default 4)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1").lower() not in ("0", "false", "no")
+WARMUP_TICKERS = [t.strip().upper() for t in os.environ.get("WARMUP_TICKERS", "").split(",") if t.strip()]
+WARMUP_PERIOD = os.environ.get("WARMUP_PERIOD", "1y")
+WARMUP_WORKERS = int(os.environ.get("WARMUP_WORKERS", "4"))
+
+# Sidebar default plus the number of popular stocks shown on the Home page
+DEFAULT_TICKER = "AAPL"
+POPULAR_COUNT = 5
+
+THREAD_NAME = "cache-warmup"
+
+class _WarmupThreadFilter(logging.Filter):
+    """Drop Streamlit's 'missing ScriptRunContext' warnings raised by warm-up threads"""
+
+    def filter(self, record):
+        return not record.threadName.startswith(THREAD_NAME)
+
+# Warm-up threads run outside any session by design
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_WarmupThreadFilter())
+
+def get_warmup_tickers():
+    """
+    Get the tickers to warm, from WARMUP_TICKERS or the app defaults
+
+    Returns:
+        list: Stock ticker symbols
+    """
+    if WARMUP_TICKERS:
+        return WARMUP_TICKERS
+
+    from utils.stock_data import get_available_tickers
+
+    return list(dict.fromkeys([DEFAULT_TICKER] + get_available_tickers()[:POPULAR_COUNT]))
+
+def warm_ticker(ticker, period=WARMUP_PERIOD):
+    """
+    Fill the caches the Home and Stock Analysis pages read for one ticker
+
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Data period
+
+    Returns:
+        bool: True if price data was available
+    """
+    from utils.stock_data import get_stock_data, get_stock_info
+    from utils.technical_analysis import get_stock_indicators
+
+    # The price cache is always warmed; with a current precomputed file only the
+    # indicator computation is skipped
+    data = get_stock_data(ticker, period=period)
+    get_stock_indicators(ticker, period=period)
+    get_stock_info(ticker)
+    # Five-day bars of the popular stocks strip
+    get_stock_data(ticker, period="5d")
+    return data is not None and not data.empty
+
+class CacheWarmup:
+    """
+    Warm-up run in a daemon thread, with progress readable from any session
+    """
+
+    def __init__(self, period=WARMUP_PERIOD, workers=WARMUP_WORKERS):
+        self.period = period
+        self.workers = workers
+        self.tickers = []
+        self.done = 0
+        self.failed = []
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the warm-up thread (no-op if it is already running or finished)"""
+        if self._thread is None:
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.tickers = get_warmup_tickers()
+
+            def warm(ticker):
+                try:
+                    ok = warm_ticker(ticker, self.period)
+                except Exception:
+                    ok = False
+                with self._lock:
+                    self.done += 1
+                    if not ok:
+                        self.failed.append(ticker)
+                return ok
+
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix=THREAD_NAME) as executor:
+                list(executor.map(warm, self.tickers))
+        finally:
+            self.finished_at = time.time()
+
+    @property
+    def ready(self):
+        """True once every ticker was warmed (or failed)"""
+        return self.finished_at is not None
+
+    def status(self):
+        """
+        Get the warm-up progress
+
+        Returns:
+            dict: Ready flag, ticker counts, failed tickers and elapsed seconds
+        """
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "ready": self.ready,
+                "total": len(self.tickers),
+                "done": self.done,
+                "failed": list(self.failed),
+                "elapsed": round(end - self.started_at, 2) if self.started_at else 0.0
+            }
+
+@st.cache_resource
+def start_cache_warmup():
+    """
+    Start the cache warm-up once per server process
+
+    Streamlit has no server start hook, so this runs on the first script run of
+    a new process; every later session gets the same CacheWarmup.
+
+    Returns:
+        CacheWarmup: The running warm-up (None if WARMUP_ENABLED is off)
+    """
+    if not WARMUP_ENABLED:
+        return None
+    return CacheWarmup().start()